@@ -8,33 +8,74 @@ from ui.input_frame import InputFrame
 from ui.table_frame import TableFrame
 from ui.action_frame import ActionFrame
 from ui.history_frame import HistoryFrame
+from ui.progress_frame import ProgressFrame
+from ui.diagnostics_window import DiagnosticsWindow
+from ui.plate_window import PlateWindow
+from ui.feasibility_window import FeasibilityWindow
+from ui.import_window import ImportReportWindow
+from ui.inventory_window import InventoryWindow
 from ui.custom_widgets import ToolTip
+from models.cache import ResultCache
 from models.calculation import SiRNACalculation
+from models.inverse import round_up
+from models.schema import KEY_CF_UNIT, KEY_SAMPLES, KEY_STOCK_UNIT, KEY_VOLUME_MIX_UNIT
+from utils.batch_processing import BatchProcessor
+from utils.config_files import load_config_file, save_config_file
+from utils.config_import import ConfigImporter
+from utils.export import EXPORT_FILETYPES, TableExporter
 from utils.file_operations import FileOperations
+from utils.history_store import HistoryStore
+from utils.inventory import InventoryLedger
+from utils.jobs import JobExecutor
+from utils.timing import SpanTimer
 
 
 class SiRNAMixCalculator:
     """Classe principale de l'application SiRNA Mix Calculator."""
     
-    def __init__(self, root, logger):
+    # Fichier de l'historique persistant des calculs
+    HISTORY_DB_PATH = "sirna_history.db"
+    
+    # Journal de l'inventaire des stocks de siRNA
+    INVENTORY_LOG_PATH = "sirna_inventory.jsonl"
+    
+    # Cache des résultats: taille en mémoire et fichier du niveau disque (None pour le désactiver)
+    RESULT_CACHE_SIZE = 512
+    RESULT_CACHE_PATH = "sirna_cache.db"
+    
+    # Intervalle de relève des événements des tâches en arrière-plan (~60 images/s)
+    JOB_POLL_INTERVAL_MS = 16
+    
+    def __init__(self, root, logger, diagnostics=False):
         self.root = root
         self.logger = logger
+        
+        # Mesure des temps d'exécution (fenêtre Diagnostics), inactive par défaut
+        self.timer = SpanTimer(enabled=diagnostics)
+        self.diagnostics_window = None
         self.root.title("Calculateur de Mix siRNA")
-        self.root.geometry("800x780")
+        self.root.geometry("800x1070")
         self.root.minsize(600, 700)
         
         # Configuration de la grille principale
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(2, weight=1)  # Table obtient plus d'espace
         
-        # Initialisation du modèle de calcul
-        self.calculation_model = SiRNACalculation(logger)
+        # Initialisation du modèle de calcul, précédé du cache des résultats
+        self.result_cache = ResultCache(logger, max_size=self.RESULT_CACHE_SIZE,
+                                        disk_path=self.RESULT_CACHE_PATH)
+        self.calculation_model = SiRNACalculation(logger, cache=self.result_cache)
         
-        # Initialisation de l'historique
-        self.calculation_history = []
+        # Initialisation de l'historique persistant
+        self.history_store = HistoryStore(self.HISTORY_DB_PATH, logger, timer=self.timer)
+        
+        # Inventaire des stocks, débité à chaque calcul ajouté à l'historique
+        self.inventory = InventoryLedger(self.INVENTORY_LOG_PATH, logger)
+        self.inventory_window = None
         
         # Initialisation des utilitaires
         self.file_ops = FileOperations(self.root, logger)
+        self.job_executor = JobExecutor(logger)
         
         # Création des composants UI
         self.create_ui()
@@ -42,6 +83,15 @@ class SiRNAMixCalculator:
         # Initialisation des tooltips
         self.setup_tooltips()
         
+        # Affichage de l'historique des sessions précédentes
+        self.history_frame.update_history()
+        
+        # Fermeture propre (écriture de l'historique en attente)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Relève périodique des événements des tâches en arrière-plan
+        self.root.after(self.JOB_POLL_INTERVAL_MS, self.poll_jobs)
+        
         self.logger.info("Application initialisée avec succès")
     
     def create_ui(self):
@@ -61,52 +111,179 @@ class SiRNAMixCalculator:
         # Panneau d'historique (en bas)
         self.history_frame = HistoryFrame(self.root, self)
         self.history_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=10)
+        
+        # Progression des tâches en arrière-plan (tout en bas)
+        self.progress_frame = ProgressFrame(self.root, self)
+        self.progress_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=(0, 10))
     
     def setup_tooltips(self):
         """Configure les info-bulles pour les champs principaux."""
         tooltips = {
             self.input_frame.entry_cf_culture: "Concentration finale désirée pour le siRNA dans la culture (nM)",
             self.input_frame.entry_volume_culture: "Volume total du milieu de culture",
-            self.input_frame.combobox_unit: "Unité de volume (µL ou mL)",
+            self.input_frame.combobox_unit: "Unité de volume (nL, µL ou mL)",
+            self.input_frame.unit_comboboxes[KEY_CF_UNIT]: "Unité de la concentration finale (pM, nM ou µM)",
+            self.input_frame.unit_comboboxes[KEY_VOLUME_MIX_UNIT]: "Unité du volume du mix (nL, µL ou mL)",
+            self.input_frame.unit_comboboxes[KEY_STOCK_UNIT]: "Unité de la concentration du stock (pM, nM ou µM)",
+            self.table_frame.combobox_unit: "Unité d'affichage des volumes du tableau",
             self.input_frame.entry_mix_volume: "Volume total du mix siRNA à ajouter au milieu de culture",
             self.input_frame.entry_stock_conc: "Concentration du stock de siRNA (nM)",
             self.input_frame.entry_num_samples: "Nombre d'échantillons pour lesquels préparer le mix",
+            self.input_frame.combobox_solve: "Grandeur à déduire des autres champs (le champ correspondant est ignoré puis rempli)",
+            self.input_frame.entry_stock_volume: "Volume de stock de siRNA disponible (facultatif sauf pour le nombre d'échantillons)",
             self.action_frame.btn_calculate: "Effectuer le calcul avec les valeurs actuelles",
-            self.action_frame.btn_explain: "Afficher les explications détaillées du calcul"
+            self.action_frame.btn_explain: "Afficher les explications détaillées du calcul",
+            self.action_frame.btn_batch: "Calculer un fichier CSV de plans de mix en arrière-plan",
+            self.action_frame.btn_diagnostics: "Afficher les temps d'exécution des phases du calcul",
+            self.action_frame.btn_plate: "Calculer les master mix d'une plaque (plusieurs siRNA et concentrations)",
+            self.action_frame.btn_series: "Calculer une série de dilutions à partir de la Cf désirée (premier point)",
+            self.action_frame.btn_feasibility: "Afficher la région faisable sur une grille Cf / volume du mix / stock",
+            self.action_frame.btn_import_folder: "Calculer toutes les configurations JSON d'un dossier et les ajouter à l'historique",
+            self.action_frame.btn_inventory: "Lots de stock de siRNA: volumes restants et lot débité par chaque calcul"
         }
         
         for widget, text in tooltips.items():
             ToolTip(widget, text)
     
-    def perform_calculation(self):
-        """Effectue le calcul principal et met à jour l'interface."""
+    def perform_calculation(self, record=True):
+        """
+        Effectue le calcul principal et met à jour l'interface.
+        
+        Args:
+            record: si faux (calcul rechargé depuis l'historique ou un import), le calcul
+                n'est ni ajouté à l'historique ni débité de l'inventaire
+        """
+        timer = self.timer
         try:
-            # Récupération et validation des entrées
-            input_values = self.input_frame.get_validated_inputs()
+            with timer.span("perform_calculation"):
+                # Récupération et validation des entrées
+                with timer.span("get_validated_inputs"):
+                    input_values = self.input_frame.get_validated_inputs()
+                if isinstance(input_values, str):
+                    # Erreur de validation
+                    self.input_frame.update_error(input_values)
+                    return False
+                limits_error = self.apply_pipetting_limits()
+                if limits_error is not None:
+                    self.input_frame.update_error(limits_error)
+                    return False
+                
+                # Exécution du calcul
+                with timer.span("calculate_mix"):
+                    calculation_result = self.calculation_model.calculate_mix(input_values)
+                if not calculation_result['success']:
+                    self.input_frame.update_error(calculation_result['error'])
+                    return False
+                
+                # Dilutions intermédiaires si le stock n'est pas pipetable directement
+                mix_result = calculation_result['result']
+                with timer.span("solve_pipetting"):
+                    dilution_plan = self.calculation_model.solve_pipetting(mix_result)
+                
+                # Mise à jour de l'interface avec les résultats
+                with timer.span("update_concentration"):
+                    self.input_frame.update_concentration(mix_result.ci_mix)
+                    if dilution_plan.errors:
+                        self.input_frame.update_error("\n".join(dilution_plan.errors))
+                    else:
+                        self.input_frame.clear_error()
+                with timer.span("update_table"):
+                    self.table_frame.update_table(dilution_plan.mix_table_rows(mix_result))
+                
+                if record:
+                    # Volume de stock réellement prélevé (dilutions intermédiaires comprises)
+                    stock_volume = sum(dilution_plan.stock_totals.values()) or mix_result.v_sirna_total
+                    # Un plan non pipetable ou un lot insuffisant n'est pas débité
+                    debit = not dilution_plan.errors and not self.warn_inventory(stock_volume, mix_result.c_stock)
+                    
+                    # Ajout du calcul à l'historique
+                    with timer.span("add_to_history"):
+                        self.add_to_history(input_values, mix_result, stock_volume, debit=debit)
+            
+            self.logger.info("Calcul effectué avec succès")
+            return True
+            
+        except Exception as e:
+            self.logger.error("Erreur lors du calcul: %s", e, exc_info=True)
+            self.input_frame.update_error(f"Erreur inattendue: {str(e)}")
+            return False
+    
+    def apply_pipetting_limits(self):
+        """Transmet au modèle les limites de pipetage saisies; renvoie un message d'erreur ou None."""
+        limits = self.input_frame.get_pipetting_parameters()
+        if isinstance(limits, str):
+            return limits
+        self.calculation_model.set_pipetting_limits(**limits)
+        return None
+    
+    def perform_inverse_solve(self):
+        """Déduit le champ choisi des autres entrées, le remplit puis effectue le calcul."""
+        try:
+            parameters = self.input_frame.get_inverse_parameters()
+            if isinstance(parameters, str):
+                self.input_frame.update_error(parameters)
+                return False
+            target = parameters['target']
+            input_values = self.input_frame.get_validated_inputs(exclude=(target,))
             if isinstance(input_values, str):
-                # Erreur de validation
                 self.input_frame.update_error(input_values)
                 return False
+            limits_error = self.apply_pipetting_limits()
+            if limits_error is not None:
+                self.input_frame.update_error(limits_error)
+                return False
             
-            # Exécution du calcul
-            calculation_result = self.calculation_model.calculate_mix(input_values)
-            if not calculation_result['success']:
-                self.input_frame.update_error(calculation_result['error'])
+            with self.timer.span("solve_inverse"):
+                solution = self.calculation_model.solve_inverse(target, input_values, parameters['stock_volume'])
+            if not solution['success']:
+                self.input_frame.update_error(solution['error'])
                 return False
             
-            # Mise à jour de l'interface avec les résultats
-            self.input_frame.update_concentration(calculation_result['ci_mix'])
-            self.input_frame.clear_error()
-            self.table_frame.update_table(calculation_result['data'])
+            # Les bornes minimales sont arrondies par excès pour rester faisables
+            value = solution['value']
+            text = str(value) if target == KEY_SAMPLES else f"{round_up(value):g}"
+            self.input_frame.set_input_values({target: text})
+            return self.perform_calculation()
             
-            # Ajout du calcul à l'historique
-            self.add_to_history(input_values, calculation_result)
+        except Exception as e:
+            self.logger.error("Erreur lors du calcul inverse: %s", e, exc_info=True)
+            self.input_frame.update_error(f"Erreur inattendue: {str(e)}")
+            return False
+    
+    def perform_series_calculation(self):
+        """Calcule une série de dilutions et l'affiche dans le tableau en une seule mise à jour."""
+        try:
+            input_values = self.input_frame.get_validated_inputs()
+            if isinstance(input_values, str):
+                self.input_frame.update_error(input_values)
+                return False
+            series_parameters = self.input_frame.get_series_parameters()
+            if isinstance(series_parameters, str):
+                self.input_frame.update_error(series_parameters)
+                return False
+            limits_error = self.apply_pipetting_limits()
+            if limits_error is not None:
+                self.input_frame.update_error(limits_error)
+                return False
             
-            self.logger.info("Calcul effectué avec succès")
+            with self.timer.span("calculate_series"):
+                series_result = self.calculation_model.calculate_series(input_values, **series_parameters)
+            if not series_result['success']:
+                self.input_frame.update_error(series_result['error'])
+                return False
+            
+            with self.timer.span("update_table"):
+                self.table_frame.update_table(series_result['rows'])
+            if series_result['errors']:
+                self.input_frame.update_error("\n".join(series_result['errors']))
+            else:
+                self.input_frame.clear_error()
+            
+            self.logger.info("Série de dilutions calculée: %d point(s)", series_parameters['n_points'])
             return True
             
         except Exception as e:
-            self.logger.error(f"Erreur lors du calcul: {str(e)}", exc_info=True)
+            self.logger.error("Erreur lors du calcul de la série: %s", e, exc_info=True)
             self.input_frame.update_error(f"Erreur inattendue: {str(e)}")
             return False
     
@@ -119,6 +296,10 @@ class SiRNAMixCalculator:
                 # Erreur de validation
                 self.input_frame.update_error(input_values)
                 return
+            limits_error = self.apply_pipetting_limits()
+            if limits_error is not None:
+                self.input_frame.update_error(limits_error)
+                return
             
             # Génération de l'explication
             explanation = self.calculation_model.generate_explanation(input_values)
@@ -127,7 +308,7 @@ class SiRNAMixCalculator:
             self._show_explanation_window(explanation)
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de la génération de l'explication: {str(e)}", exc_info=True)
+            self.logger.error("Erreur lors de la génération de l'explication: %s", e, exc_info=True)
             messagebox.showerror("Erreur", f"Impossible de générer l'explication: {str(e)}")
     
     def _show_explanation_window(self, explanation):
@@ -159,20 +340,63 @@ class SiRNAMixCalculator:
         btn_close = ttk.Button(explanation_window, text="Fermer", command=explanation_window.destroy)
         btn_close.grid(row=1, column=0, pady=10)
     
-    def add_to_history(self, inputs, result):
-        """Ajoute un calcul à l'historique."""
+    def add_to_history(self, inputs, result, stock_volume=None, debit=True):
+        """
+        Ajoute un calcul (entrées et MixResult) à l'historique et, si debit est vrai,
+        débite son volume de stock (v_sirna_total par défaut) du lot actif de l'inventaire.
+        """
         timestamp = self.calculation_model.get_timestamp()
         history_entry = {
             'timestamp': timestamp,
             'inputs': inputs,
             'result': result
         }
-        self.calculation_history.append(history_entry)
+        self.history_store.add(history_entry)
+        
+        # Ajouter la nouvelle entrée en tête de l'affichage
+        self.history_frame.prepend_entry(history_entry)
+        
+        lot_id = self.inventory.active_lot
+        if debit and lot_id is not None:
+            remaining = self.inventory.debit(lot_id, result.v_sirna_total if stock_volume is None else stock_volume,
+                                             reference=history_entry['id'])
+            self.logger.info("Lot %s débité, %.2f µL restants", lot_id, remaining)
+            if self.inventory_window is not None and self.inventory_window.winfo_exists():
+                self.inventory_window.refresh()
+        
+        self.logger.info("Calcul ajouté à l'historique: %s", timestamp)
+    
+    def warn_inventory(self, stock_volume, c_stock):
+        """
+        Avertit si le lot actif ne suffit pas au prélèvement (ou n'a pas la même concentration).
         
-        # Mettre à jour l'affichage de l'historique
-        self.history_frame.update_history(self.calculation_history)
+        Returns:
+            Liste des avertissements (vide si le lot peut être débité ou s'il n'y a pas de lot actif)
+        """
+        lot_id = self.inventory.active_lot
+        if lot_id is None:
+            return []
+        warnings = self.inventory.check_debit(lot_id, stock_volume, c_stock)
+        if warnings:
+            self.logger.warning("Inventaire: %s", " ".join(warnings))
+            messagebox.showwarning("Inventaire des stocks",
+                                   "\n".join(warnings) + "\n\nLe lot actif n'a pas été débité.")
+        return warnings
+    
+    def add_entries_to_history(self, entries):
+        """Ajoute un ensemble de calculs (couples entrées, MixResult) à l'historique en une fois."""
+        timestamp = self.calculation_model.get_timestamp()
+        for inputs, result in entries:
+            self.history_store.add({
+                'timestamp': timestamp,
+                'inputs': inputs,
+                'result': result
+            })
+        self.history_store.flush()
         
-        self.logger.info(f"Calcul ajouté à l'historique: {timestamp}")
+        # Une seule mise à jour de l'affichage pour tout le lot
+        self.history_frame.update_history()
+        self.logger.info("%d calcul(s) ajouté(s) à l'historique", len(entries))
     
     def load_from_history(self, history_item):
         """Charge les valeurs d'un calcul historique dans l'interface."""
@@ -180,10 +404,10 @@ class SiRNAMixCalculator:
             inputs = history_item['inputs']
             self.input_frame.set_input_values(inputs)
             
-            # Recalculer pour mettre à jour l'affichage
-            self.perform_calculation()
+            # Recalculer pour mettre à jour l'affichage, sans nouvelle entrée ni débit
+            self.perform_calculation(record=False)
             
-            self.logger.info(f"Valeurs chargées depuis l'historique: {history_item['timestamp']}")
+            self.logger.info("Valeurs chargées depuis l'historique: %s", history_item['timestamp'])
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement depuis l'historique: {str(e)}", exc_info=True)
             messagebox.showerror("Erreur", f"Impossible de charger les données: {str(e)}")
@@ -199,11 +423,11 @@ class SiRNAMixCalculator:
             if not file_path:
                 return
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(inputs, f, indent=4)
+            with self.timer.span("save_config_file"):
+                save_config_file(file_path, inputs)
             
             messagebox.showinfo("Succès", f"Configuration sauvegardée dans {file_path}")
-            self.logger.info(f"Configuration sauvegardée dans {file_path}")
+            self.logger.info("Configuration sauvegardée dans %s", file_path)
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde de la configuration: {str(e)}", exc_info=True)
@@ -218,16 +442,159 @@ class SiRNAMixCalculator:
             if not file_path:
                 return
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                inputs = json.load(f)
+            with self.timer.span("load_config_file"):
+                inputs = load_config_file(file_path)
             
             self.input_frame.set_input_values(inputs)
             messagebox.showinfo("Succès", f"Configuration chargée depuis {file_path}")
-            self.logger.info(f"Configuration chargée depuis {file_path}")
+            self.logger.info("Configuration chargée depuis %s", file_path)
             
         except json.JSONDecodeError:
             self.logger.error(f"Format de fichier JSON invalide: {file_path}", exc_info=True)
             messagebox.showerror("Erreur", "Le fichier n'est pas un fichier JSON valide.")
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement de la configuration: {str(e)}", exc_info=True)
-            messagebox.showerror("Erreur", f"Impossible de charger la configuration: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("Erreur", f"Impossible de charger la configuration: {str(e)}")
+    
+    def poll_jobs(self):
+        """Traite les événements des tâches en arrière-plan puis se reprogramme."""
+        try:
+            self.job_executor.poll()
+        except Exception as e:
+            self.logger.error(f"Erreur lors du traitement des tâches: {str(e)}", exc_info=True)
+        self.root.after(self.JOB_POLL_INTERVAL_MS, self.poll_jobs)
+    
+    def submit_job(self, name, func, *args, on_done=None):
+        """
+        Lance une tâche en arrière-plan suivie par le panneau de progression.
+        
+        func(job, *args) s'exécute hors du thread Tk et ne doit pas toucher à l'interface;
+        on_done(résultat) est appelé dans le thread Tk une fois la tâche terminée.
+        """
+        def done(job, result):
+            self.progress_frame.finish_job(job, f"{job.name}: terminé")
+            if on_done is not None:
+                on_done(result)
+        
+        def error(job, exception):
+            self.progress_frame.finish_job(job, f"{job.name}: échec")
+            messagebox.showerror("Erreur", f"{job.name} a échoué: {str(exception)}")
+        
+        def cancelled(job):
+            self.progress_frame.finish_job(job, f"{job.name}: annulé")
+        
+        job = self.job_executor.submit(name, func, *args, on_done=done, on_error=error,
+                                       on_progress=self.progress_frame.update_progress,
+                                       on_cancelled=cancelled)
+        self.progress_frame.start_job(job)
+        return job
+    
+    def import_config_directory(self):
+        """Importe et calcule en arrière-plan toutes les configurations JSON d'un dossier."""
+        directory = self.file_ops.get_directory_path("Dossier de configurations à importer")
+        if not directory:
+            return
+        
+        def work(job):
+            # Modèle sans cache: le cache (et sa base SQLite) appartient au thread Tk
+            importer = ConfigImporter(SiRNACalculation(self.logger), self.logger)
+            with self.timer.span("import_configs"):
+                return importer.run(directory, progress=job.report_progress)
+        
+        def done(report):
+            if not report['total']:
+                messagebox.showinfo("Import de configurations", f"Aucun fichier JSON dans {directory}")
+                return
+            self.add_entries_to_history([(inputs, result) for _, inputs, result in report['results']])
+            ImportReportWindow(self.root, self, directory, report)
+        
+        self.submit_job("Import de configurations", work, on_done=done)
+    
+    def run_batch_file(self):
+        """Calcule un fichier CSV de plans de mix en arrière-plan."""
+        input_path = self.file_ops.get_open_file_path("Fichier CSV à calculer",
+                                                      filetypes=[("Fichier CSV", "*.csv"),
+                                                                 ("Tous les fichiers", "*.*")])
+        if not input_path:
+            return
+        output_path = self.file_ops.get_save_file_path("Fichier CSV des résultats",
+                                                       filetypes=[("Fichier CSV", "*.csv"),
+                                                                  ("Tous les fichiers", "*.*")])
+        if not output_path:
+            return
+        reject_path = BatchProcessor.default_reject_path(output_path)
+        
+        def work(job):
+            # Modèle sans cache: le cache (et sa base SQLite) appartient au thread Tk
+            processor = BatchProcessor(SiRNACalculation(self.logger), self.logger)
+            with self.timer.span("batch_file"):
+                return processor.run(input_path, output_path, reject_path, progress=job.report_progress)
+        
+        def done(stats):
+            messagebox.showinfo("Calcul par lots terminé",
+                                f"{stats['ok']} ligne(s) calculée(s) dans {output_path}\n"
+                                f"{stats['rejected']} ligne(s) rejetée(s) dans {reject_path}")
+        
+        self.submit_job("Calcul par lots", work, on_done=done)
+    
+    def export_table(self, title, header, rows, total=None):
+        """
+        Exporte un tableau en arrière-plan vers le fichier choisi (CSV, TSV, XLSX ou ODS).
+        
+        rows est un itérable parcouru hors du thread Tk, par paquets: il ne doit pas
+        toucher à l'interface. total (facultatif) sert à l'affichage de la progression.
+        """
+        output_path = self.file_ops.get_save_file_path(f"Exporter - {title}", filetypes=EXPORT_FILETYPES,
+                                                       defaultextension=".csv")
+        if not output_path:
+            return
+        
+        def work(job):
+            with self.timer.span("export_table"):
+                return TableExporter(self.logger).run(output_path, header, rows, total=total,
+                                                      progress=job.report_progress)
+        
+        def done(stats):
+            messagebox.showinfo("Export terminé", f"{stats['rows']} ligne(s) exportée(s) dans {output_path}")
+        
+        self.submit_job(f"Export - {title}", work, on_done=done)
+    
+    def export_history(self):
+        """Exporte tout l'historique des calculs."""
+        # count() écrit les entrées en attente: le générateur lit la base avec sa propre connexion
+        total = self.history_store.count()
+        self.export_table("Historique des calculs", self.history_store.EXPORT_HEADER,
+                          self.history_store.export_rows(), total=total)
+    
+    def show_diagnostics(self):
+        """Ouvre (ou ramène au premier plan) la fenêtre des temps d'exécution."""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self.root, self)
+    
+    def show_inventory(self):
+        """Ouvre (ou ramène au premier plan) l'inventaire des stocks."""
+        if self.inventory_window is not None and self.inventory_window.winfo_exists():
+            self.inventory_window.lift()
+            return
+        self.inventory_window = InventoryWindow(self.root, self)
+    
+    def show_plate_planner(self):
+        """Ouvre la fenêtre de planification d'une plaque."""
+        PlateWindow(self.root, self)
+    
+    def show_feasibility_map(self):
+        """Ouvre la carte de faisabilité."""
+        FeasibilityWindow(self.root, self)
+    
+    def on_close(self):
+        """Arrête les tâches, ferme l'historique et le cache puis la fenêtre principale."""
+        try:
+            self.job_executor.shutdown()
+            self.history_store.close()
+            self.inventory.close()
+            self.result_cache.close()
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la fermeture de l'historique: {str(e)}", exc_info=True)
+        self.root.destroy()
\ No newline at end of file
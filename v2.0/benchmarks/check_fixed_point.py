@@ -0,0 +1,167 @@
+# benchmarks/check_fixed_point.py - Parité du mode entier (pL, pM) avec le moteur flottant
+"""
+Compare models.fixed_point.calculate_mix_fixed à models.batch.calculate_mix_batch sur
+des entrées aléatoires reproductibles, représentables exactement à la résolution du
+mode entier (Cf au pM, volumes au pL).
+
+Vérifie pour chaque ligne:
+    - ci_mix et les volumes par échantillon à 0.5 unité près (un seul arrondi);
+    - la même faisabilité, hors des lignes où Ci et le stock diffèrent de moins
+      de l'erreur relative des flottants;
+    - des totaux égaux au volume par échantillon multiplié par le nombre d'échantillons;
+    - des totaux sans débordement int64 pour des lignes non faisables à très faible stock.
+Affiche la dérive des sommes flottantes sur l'ensemble des lignes et compare les
+temps des deux moteurs, quantification comprise: calculate_mix_fixed ne doit pas être
+plus lent que calculate_mix_batch de plus de SPEED_MARGIN. Les deux moteurs sont
+mesurés à tour de rôle sur plusieurs séries; seule la meilleure série compte, pour
+qu'une perturbation passagère de la machine ne fasse pas échouer la vérification.
+
+Usage (depuis le dossier v2.0):
+    python benchmarks/check_fixed_point.py [--rows 1000000] [--seed 0]
+
+Le script se termine avec le code 1 si une ligne sort des tolérances ou si le mode
+entier est plus lent que le moteur flottant au-delà de la marge.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from models.batch import calculate_mix_batch  # noqa: E402
+from models.fixed_point import (PICOLITERS_PER_MICROLITER, PICOMOLAR_PER_NANOMOLAR,  # noqa: E402
+                                calculate_mix_fixed, mix_kernel)
+
+# Écart maximal toléré après l'arrondi unique du mode entier (en unités entières)
+ROUNDING_TOLERANCE = 0.5 + 1e-6
+
+# Erreur relative en dessous de laquelle la faisabilité flottante n'est pas fiable
+FEASIBILITY_EPSILON = 1e-12
+
+# Ralentissement toléré du mode entier par rapport au moteur flottant (bruit de mesure)
+SPEED_MARGIN = 0.10
+
+# Nombre de séries de mesures; la meilleure série est retenue
+SPEED_ROUNDS = 7
+
+
+def make_columns(rows, seed):
+    """Génère des colonnes exactement représentables au pM et au pL."""
+    rng = np.random.default_rng(seed)
+    return {
+        'cf': rng.integers(1, 100000, rows) / PICOMOLAR_PER_NANOMOLAR,
+        'v_milieu': rng.choice([100.0, 500.0, 1000.0, 2000.0, 5000.0], rows),
+        'v_mix': rng.integers(10, 5000, rows) / 10,
+        'c_stock': rng.choice([100.0, 1000.0, 5000.0, 20000.0, 100000.0], rows),
+        'n_samples': rng.integers(1, 1537, rows),
+    }
+
+
+def best_times(funcs, repeat=15):
+    """
+    Renvoie le meilleur temps d'exécution de chaque fonction (secondes).
+
+    Les fonctions sont exécutées à tour de rôle: une perturbation passagère de la
+    machine pèse sur toutes les mesures plutôt que sur une seule.
+    """
+    for func in funcs:
+        func()
+    best = [None] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return best
+
+
+def check(columns):
+    """Compare les deux moteurs ligne à ligne; renvoie la liste des échecs."""
+    args = (columns['cf'], columns['v_milieu'], columns['v_mix'], columns['c_stock'], columns['n_samples'])
+    floats = calculate_mix_batch(*args)
+    fixed = calculate_mix_fixed(*args)
+    failures = []
+
+    scales = {'ci_mix': PICOMOLAR_PER_NANOMOLAR, 'v_sirna': PICOLITERS_PER_MICROLITER,
+              'v_buffer': PICOLITERS_PER_MICROLITER, 'v_mix': PICOLITERS_PER_MICROLITER}
+    for name, scale in scales.items():
+        deviation = np.abs(fixed[name] - floats[name] * scale)
+        worst = float(deviation.max())
+        print(f"{name:<16} écart max: {worst:.6f} (tolérance {ROUNDING_TOLERANCE:g})")
+        if worst > ROUNDING_TOLERANCE:
+            failures.append(f"{name}: {int((deviation > ROUNDING_TOLERANCE).sum())} ligne(s) hors tolérance")
+
+    ci_exact = columns['cf'] * columns['v_milieu'] / columns['v_mix']
+    ambiguous = np.abs(ci_exact - columns['c_stock']) <= FEASIBILITY_EPSILON * columns['c_stock']
+    mismatched = (fixed['feasible'] != floats['feasible']) & ~ambiguous
+    print(f"faisabilité      {int(mismatched.sum())} désaccord(s), {int(ambiguous.sum())} ligne(s) à la limite")
+    if mismatched.any():
+        failures.append(f"faisabilité: {int(mismatched.sum())} désaccord(s)")
+
+    for name in ('v_sirna', 'v_buffer', 'v_mix'):
+        if not np.array_equal(fixed[f"{name}_total"], fixed[name] * columns['n_samples']):
+            failures.append(f"{name}_total: totaux entiers inexacts")
+
+    # Dérive des sommes: totaux entiers exacts contre somme des totaux flottants
+    exact = int(fixed['v_sirna_total'].sum())
+    drift = float(floats['v_sirna_total'].sum()) * PICOLITERS_PER_MICROLITER - exact
+    print(f"somme v_sirna_total: {exact} pL exacts, dérive des flottants: {drift:+.3f} pL "
+          f"(dont arrondis par échantillon)")
+    return failures
+
+
+def check_overflow():
+    """
+    Vérifie qu'une ligne non faisable dont le total dépasserait int64 ne déborde pas
+    et ne fausse pas les totaux des lignes faisables de son bloc.
+    """
+    cf = np.array([10 ** 6, 10 ** 4], dtype=np.int64)
+    v_milieu = np.array([10 ** 12, 10 ** 9], dtype=np.int64)
+    v_mix = np.array([10 ** 8, 10 ** 8], dtype=np.int64)
+    c_stock = np.array([1, 10 ** 6], dtype=np.int64)
+    n_samples = np.array([10 ** 6, 10 ** 6], dtype=np.int64)
+    data = mix_kernel(cf, v_milieu, v_mix, c_stock, n_samples)
+    failures = []
+    if data['feasible'].tolist() != [False, True]:
+        failures.append("débordement: faisabilité inattendue")
+    if data['v_sirna_total'][0] != 0 or data['v_buffer_total'][0] != 0:
+        failures.append("débordement: totaux de la ligne non faisable non nuls")
+    if data['v_sirna_total'][1] != data['v_sirna'][1] * n_samples[1]:
+        failures.append("débordement: total de la ligne faisable inexact")
+    return failures
+
+
+def main(argv=None):
+    """Lance la comparaison et les mesures de temps."""
+    parser = argparse.ArgumentParser(description="Parité du mode entier avec le moteur flottant")
+    parser.add_argument("--rows", type=int, default=1000000, help="Nombre de lignes (par défaut: 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire (par défaut: 0)")
+    args = parser.parse_args(argv)
+
+    columns = make_columns(args.rows, args.seed)
+    failures = check(columns) + check_overflow()
+
+    inputs = (columns['cf'], columns['v_milieu'], columns['v_mix'], columns['c_stock'], columns['n_samples'])
+    rounds = [best_times([lambda: calculate_mix_batch(*inputs), lambda: calculate_mix_fixed(*inputs)])
+              for _ in range(SPEED_ROUNDS)]
+    float_time, fixed_time = min(rounds, key=lambda times: times[1] / times[0])
+    ratio = fixed_time / float_time
+    print(f"moteur flottant: {float_time * 1000:.1f} ms, mode entier: {fixed_time * 1000:.1f} ms "
+          f"({ratio:.2f}x, meilleure de {SPEED_ROUNDS} séries) pour {args.rows} ligne(s)")
+    if ratio > 1 + SPEED_MARGIN:
+        failures.append(f"mode entier plus lent que le moteur flottant de plus de {SPEED_MARGIN:.0%} "
+                        f"({fixed_time * 1000:.1f} ms contre {float_time * 1000:.1f} ms)")
+
+    if failures:
+        print("ÉCHEC: " + "; ".join(failures))
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
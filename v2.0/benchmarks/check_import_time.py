@@ -0,0 +1,69 @@
+# benchmarks/check_import_time.py - Vérifie le budget de temps d'import du noyau de calcul
+import argparse
+import os
+import subprocess
+import sys
+
+# Dossier v2.0, racine des imports de l'application
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules qui ne doivent jamais être chargés par le noyau de calcul
+FORBIDDEN_MODULES = ("tkinter", "numpy")
+
+DEFAULT_BUDGET_MS = 30.0
+
+
+def measure_import_time(module, runs=5):
+    """
+    Mesure le temps d'import cumulé d'un module avec 'python -X importtime'.
+
+    Chaque mesure est faite dans un nouvel interpréteur; on garde la meilleure
+    des 'runs' mesures pour s'affranchir du bruit (compilation .pyc, cache disque).
+
+    Returns:
+        Tuple (temps en ms, liste des modules interdits chargés)
+    """
+    check = (f"import sys; import {module}; "
+             f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))")
+    best_us = None
+    forbidden = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", check],
+            cwd=APP_DIR, capture_output=True, text=True, check=True
+        )
+        forbidden = [m for m in completed.stdout.strip().split(",") if m]
+        for line in completed.stderr.splitlines():
+            # Format: "import time: self [us] | cumulative | imported package"
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative_us = int(parts[1])
+                if best_us is None or cumulative_us < best_us:
+                    best_us = cumulative_us
+    return best_us / 1000, forbidden
+
+
+def main(argv=None):
+    """Affiche le temps d'import du noyau et échoue si le budget est dépassé."""
+    parser = argparse.ArgumentParser(description="Budget de temps d'import du noyau de calcul")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Budget maximal en ms (par défaut: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--module", default="models",
+                        help="Module à mesurer (par défaut: models)")
+    args = parser.parse_args(argv)
+
+    elapsed_ms, forbidden = measure_import_time(args.module)
+    print(f"import {args.module}: {elapsed_ms:.2f} ms (budget: {args.budget_ms:.0f} ms)")
+
+    status = 0
+    if forbidden:
+        print(f"ÉCHEC: {args.module} charge {', '.join(forbidden)}")
+        status = 1
+    if elapsed_ms > args.budget_ms:
+        print(f"ÉCHEC: budget dépassé de {elapsed_ms - args.budget_ms:.2f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,519 @@
+# benchmarks/run_benchmarks.py - Suite de benchmarks des chemins critiques (sans affichage)
+"""
+Mesure le modèle de calcul, l'historique, la sérialisation des configurations, le coût
+des mesures de temps (SpanTimer) et celui du journal (QueueHandler de main.setup_logging)
+sur le chemin de calcul.
+
+Usage (depuis le dossier v2.0):
+    python benchmarks/run_benchmarks.py                  # mesure et compare à la référence
+    python benchmarks/run_benchmarks.py --save-baseline  # enregistre la référence
+    python benchmarks/run_benchmarks.py --quick          # sans les tailles 100k
+
+Les résultats sont écrits dans benchmarks/results.json. La référence
+(benchmarks/baseline.json) est propre à chaque machine: elle doit être créée avec
+--save-baseline sur le poste utilisé pour les comparaisons. Le script se termine avec
+le code 1 si un benchmark est plus lent que la référence au-delà de la tolérance, ou si
+un résultat en cache n'est pas plus rapide à obtenir que le calcul complet (CACHE_PAIRS),
+ou si le journal coûte plus de LOGGING_BUDGET_US par calcul (LOGGING_PAIR).
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+# Les imports de l'application se font depuis le dossier v2.0
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from main import LOG_BACKUP_COUNT, LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, attach_queue_logging  # noqa: E402
+from models.cache import ResultCache  # noqa: E402
+from models.calculation import SiRNACalculation  # noqa: E402
+from models.plate import build_layout  # noqa: E402
+from models.schema import (KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT,  # noqa: E402
+                           get_validator)
+from utils.config_files import load_config_file, save_config_file  # noqa: E402
+from utils.export import TableExporter  # noqa: E402
+from utils.history_store import HistoryStore  # noqa: E402
+from utils.inventory import InventoryLedger  # noqa: E402
+from utils.timing import SpanTimer  # noqa: E402
+from utils.worklist import WorklistExporter  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results.json")
+
+# Journal silencieux: on mesure les calculs, pas les écritures du journal
+LOGGER = logging.getLogger("benchmarks")
+LOGGER.addHandler(logging.NullHandler())
+LOGGER.propagate = False
+
+
+def make_inputs(count, seed=0):
+    """Génère des jeux d'entrées validées reproductibles (tous faisables)."""
+    rng = random.Random(seed)
+    volumes = [(500.0, "µL"), (1000.0, "µL"), (2000.0, "µL"), (2.0, "mL")]
+    inputs = []
+    for _ in range(count):
+        v_milieu, volume_unit = rng.choice(volumes)
+        inputs.append({
+            KEY_CF: rng.uniform(0.5, 50.0),
+            KEY_VOLUME_MILIEU: v_milieu,
+            KEY_VOLUME_UNIT: volume_unit,
+            KEY_VOLUME_MIX: rng.choice([50.0, 100.0, 200.0]),
+            KEY_STOCK: 20000.0,
+            KEY_SAMPLES: rng.randint(1, 96),
+        })
+    return inputs
+
+
+def make_columns(count, seed=0):
+    """Génère des colonnes numpy pour le moteur vectorisé."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return {
+        KEY_CF: rng.uniform(0.5, 50.0, count),
+        KEY_VOLUME_MILIEU: rng.uniform(100.0, 5000.0, count),
+        KEY_VOLUME_UNIT: "µL",
+        KEY_VOLUME_MIX: rng.choice([50.0, 100.0, 200.0], count),
+        KEY_STOCK: np.full(count, 20000.0),
+        KEY_SAMPLES: rng.integers(1, 97, count),
+    }
+
+
+def make_history_entries(count):
+    """Prépare des entrées d'historique (le calcul n'est pas mesuré)."""
+    model = SiRNACalculation(LOGGER)
+    entries = []
+    for i, inputs in enumerate(make_inputs(count)):
+        entries.append({
+            'timestamp': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:00",
+            'inputs': inputs,
+            'result': model.calculate_mix(inputs)['result'],
+        })
+    return entries
+
+
+def filled_store(count):
+    """Renvoie un historique en mémoire contenant count entrées."""
+    store = HistoryStore(":memory:", LOGGER, batch_size=1000)
+    for entry in make_history_entries(count):
+        store.add(dict(entry))
+    store.flush()
+    return store
+
+
+# Chaque benchmark est une fonction setup() qui renvoie (fonction à mesurer, nombre d'opérations);
+# les benchmarks qui écrivent des fichiers sont des gestionnaires de contexte (contextmanager)
+# qui libèrent leurs ressources (dossier temporaire, fichiers ouverts) après la mesure
+
+def bench_calculate_mix_scalar():
+    model = SiRNACalculation(LOGGER)
+    inputs = make_inputs(10000)
+    return lambda: [model.calculate_mix(values) for values in inputs], len(inputs)
+
+
+def bench_generate_explanation_scalar():
+    model = SiRNACalculation(LOGGER)
+    inputs = make_inputs(2000)
+    return lambda: [model.generate_explanation(values) for values in inputs], len(inputs)
+
+
+def bench_generate_explanation_cached():
+    model = SiRNACalculation(LOGGER, cache=ResultCache(LOGGER, max_size=1000))
+    inputs = make_inputs(500) * 10
+    return lambda: [model.generate_explanation(values) for values in inputs], len(inputs)
+
+
+def bench_generate_explanation_batch():
+    # Explications produites à partir de résultats déjà calculés (rendu seul)
+    model = SiRNACalculation(LOGGER)
+    results = [model.calculate_mix(values)['result'] for values in make_inputs(10000)]
+    return lambda: [result.explanation() for result in results], len(results)
+
+
+def _bench_batch(count):
+    def setup():
+        model = SiRNACalculation(LOGGER)
+        columns = make_columns(count)
+        model.calculate_mix_batch(columns)  # Chargement de numpy hors mesure
+        return lambda: model.calculate_mix_batch(columns), count
+    return setup
+
+
+def bench_inverse_batch():
+    model = SiRNACalculation(LOGGER)
+    columns = make_columns(100000)
+    model.solve_inverse_batch(KEY_SAMPLES, columns, 12.0)  # Chargement de numpy hors mesure
+    return lambda: model.solve_inverse_batch(KEY_SAMPLES, columns, 12.0), 100000
+
+
+def bench_validate_columns():
+    # Colonnes de texte comme lues d'un CSV, avec une ligne invalide par colonne
+    count = 100000
+    columns = {key: [str(inputs[key]) for inputs in make_inputs(count)]
+               for key in (KEY_CF, KEY_VOLUME_MILIEU, KEY_VOLUME_UNIT, KEY_VOLUME_MIX, KEY_STOCK, KEY_SAMPLES)}
+    columns[KEY_CF][10] = ""
+    columns[KEY_SAMPLES][20] = "1.5"
+    validator = get_validator()
+    return lambda: validator.validate_columns(columns, count), count
+
+
+def _bench_fixed_point(count):
+    def setup():
+        model = SiRNACalculation(LOGGER)
+        columns = make_columns(count)
+        model.calculate_mix_batch(columns, fixed_point=True)  # Chargement de numpy hors mesure
+        return lambda: model.calculate_mix_batch(columns, fixed_point=True), count
+    return setup
+
+
+def _bench_history_append(count):
+    def setup():
+        entries = make_history_entries(count)
+
+        def run():
+            store = HistoryStore(":memory:", LOGGER)
+            for entry in entries:
+                store.add(dict(entry))
+            store.close()
+        return run, count
+    return setup
+
+
+def _bench_history_lookup(count):
+    def setup():
+        store = filled_store(count)
+        queries = 100
+
+        def run():
+            for i in range(queries):
+                low = 0.5 + (i % 50)
+                store.recent(limit=100)
+                store.query(cf_range=(low, low + 0.5), limit=100)
+                store.query(stock_range=(20000.0, 20000.0), limit=100)
+                store.get(1 + (i * 7919) % count)
+        return run, queries * 4
+    return setup
+
+
+def _bench_history_search(count):
+    def setup():
+        store = filled_store(count)
+        # Saisie progressive dans la barre de recherche: chaque frappe ajoute ou resserre un filtre
+        searches = [
+            {'cf_range': (5.0, None)},
+            {'cf_range': (5.0, 10.0)},
+            {'cf_range': (5.0, 10.0), 'samples_range': (90, None)},
+            {'cf_range': (5.0, 10.0), 'samples_range': (90, 96)},
+            {'cf_range': (5.0, 10.0), 'samples_range': (90, 96), 'date_range': ("2026-03", None)},
+            {'cf_range': (5.0, 10.0), 'samples_range': (90, 96), 'date_range': ("2026-03", "2026-03\uffff")},
+            {'stock_range': (20000.0, 20000.0), 'samples_range': (1, 1)},
+            {'date_range': ("2026-12-28", "2026-12-28\uffff")},
+        ]
+
+        def run():
+            for filters in searches:
+                store.query(limit=100, **filters)
+                store.query(limit=100, offset=100, **filters)
+        return run, len(searches) * 2
+    return setup
+
+
+@contextlib.contextmanager
+def bench_config_save_load():
+    inputs = [{key: str(value) for key, value in values.items()} for values in make_inputs(500)]
+    with tempfile.TemporaryDirectory(prefix="sirna_bench_") as directory:
+        paths = [os.path.join(directory, f"config_{i}.json") for i in range(len(inputs))]
+
+        def run():
+            for path, values in zip(paths, inputs):
+                save_config_file(path, values)
+            for path in paths:
+                load_config_file(path)
+        yield run, 2 * len(paths)
+
+
+def bench_plate_plan_384():
+    # Plaque 384 puits complète: 16 siRNA x 8 concentrations x 3 réplicats
+    model = SiRNACalculation(LOGGER)
+    sirnas = [(f"siRNA-{i}", 20000.0) for i in range(16)]
+    wells = build_layout(384, sirnas, [0.5, 1, 2, 5, 10, 20, 50, 100], replicates=3)
+    plans = 100
+    return lambda: [model.plan_plate(wells, 100.0, 10.0, overage=0.1, dead_volume=5.0)
+                    for _ in range(plans)], plans
+
+
+@contextlib.contextmanager
+def bench_worklist_1536():
+    # Plaque 1536 puits: 32 siRNA x 8 concentrations x 6 réplicats, écrite sur disque
+    model = SiRNACalculation(LOGGER)
+    sirnas = [(f"siRNA-{i}", 20000.0) for i in range(32)]
+    wells = build_layout(1536, sirnas, [0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50], replicates=6)
+    result = model.plan_plate(wells, 100.0, 10.0, overage=0.1, dead_volume=5.0)
+    exporter = WorklistExporter(LOGGER)
+    with tempfile.TemporaryDirectory(prefix="sirna_bench_") as directory:
+        path = os.path.join(directory, "worklist.csv")
+        exporter.run(result['plan'], result['dilutions'], path)  # Chargement de numpy hors mesure
+        yield lambda: exporter.run(result['plan'], result['dilutions'], path), 1
+
+
+def bench_dilution_series():
+    model = SiRNACalculation(LOGGER)
+    inputs = make_inputs(1)[0]
+    model.calculate_series(inputs, 2.0, 12)  # Chargement de numpy hors mesure
+    series = 1000
+    return lambda: [model.calculate_series(inputs, 2.0, 12) for _ in range(series)], series
+
+
+def bench_feasibility_grid():
+    model = SiRNACalculation(LOGGER)
+    inputs = make_inputs(1)[0]
+    model.sweep_feasibility(inputs, KEY_CF, [1.0], KEY_VOLUME_MIX, [200.0])  # Chargement de numpy hors mesure
+    cf_values = [0.01 * 1.01 ** i for i in range(1000)]
+    mix_values = [1.0 + 0.5 * i for i in range(1000)]
+    return lambda: model.sweep_feasibility(inputs, KEY_CF, cf_values, KEY_VOLUME_MIX, mix_values), 1
+
+
+def _bench_export(extension, count):
+    @contextlib.contextmanager
+    def setup():
+        # Lignes au format de l'export de l'historique, écrites sur disque
+        header = HistoryStore.EXPORT_HEADER
+        rows = [(i, "2024-01-01 12:00:00", 1.0 + i % 50, 100.0, "µL", 10.0, 20000.0, 1 + i % 12, 10.0 + i % 50)
+                for i in range(count)]
+        exporter = TableExporter(LOGGER)
+        with tempfile.TemporaryDirectory(prefix="sirna_bench_") as directory:
+            path = os.path.join(directory, "export" + extension)
+            yield lambda: exporter.run(path, header, rows), count
+    return setup
+
+
+@contextlib.contextmanager
+def bench_inventory_debit():
+    # Prélèvements ajoutés au journal (compaction comprise) puis solde lu en O(1)
+    count = 10000
+    with tempfile.TemporaryDirectory(prefix="sirna_bench_") as directory:
+        ledger = InventoryLedger(os.path.join(directory, "inventory.jsonl"), LOGGER)
+        try:
+            ledger.add_lot("L1", "siRNA-1", 20000.0, 1e9)
+
+            def run():
+                for i in range(count):
+                    ledger.debit("L1", 0.5, reference=i)
+                    ledger.remaining("L1")
+            yield run, count
+        finally:
+            ledger.close()
+
+
+def _bench_logging(enabled):
+    """
+    calculate_mix suivi des messages de SiRNAMixCalculator.perform_calculation, journal
+    désactivé ou branché sur le pipeline de main.setup_logging (file, thread d'écriture,
+    fichier tournant; sans la console).
+    """
+    @contextlib.contextmanager
+    def setup():
+        inputs = make_inputs(10000)
+        if not enabled:
+            logger = LOGGER
+        else:
+            logger = logging.getLogger("benchmarks.queue")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        model = SiRNACalculation(logger)
+
+        def run():
+            for values in inputs:
+                model.calculate_mix(values)
+                logger.info("Calcul ajouté à l'historique: %s", "2026-01-01 12:00:00")
+                logger.info("Calcul effectué avec succès")
+
+        if not enabled:
+            yield run, len(inputs)
+            return
+        with tempfile.TemporaryDirectory(prefix="sirna_bench_") as directory:
+            file_handler = RotatingFileHandler(os.path.join(directory, LOG_FILE), maxBytes=LOG_MAX_BYTES,
+                                               backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            listener = attach_queue_logging(logger, [file_handler])
+            try:
+                yield run, len(inputs)
+            finally:
+                listener.stop()
+                logger.handlers.clear()
+                file_handler.close()
+    return setup
+
+
+def _bench_span(enabled):
+    def setup():
+        timer = SpanTimer(enabled=enabled)
+        count = 100000
+
+        def run():
+            for _ in range(count):
+                with timer.span("calculate_mix"):
+                    pass
+        return run, count
+    return setup
+
+
+BENCHMARKS = {
+    "calculate_mix_scalar": bench_calculate_mix_scalar,
+    "calculate_mix_batch_1k": _bench_batch(1000),
+    "calculate_mix_batch_100k": _bench_batch(100000),
+    "calculate_mix_fixed_100k": _bench_fixed_point(100000),
+    "inverse_max_samples_batch_100k": bench_inverse_batch,
+    "validate_columns_100k": bench_validate_columns,
+    "generate_explanation_scalar": bench_generate_explanation_scalar,
+    "generate_explanation_cached": bench_generate_explanation_cached,
+    "generate_explanation_batch_10k": bench_generate_explanation_batch,
+    "history_append_1k": _bench_history_append(1000),
+    "history_append_10k": _bench_history_append(10000),
+    "history_append_100k": _bench_history_append(100000),
+    "history_lookup_1k": _bench_history_lookup(1000),
+    "history_lookup_10k": _bench_history_lookup(10000),
+    "history_lookup_100k": _bench_history_lookup(100000),
+    "history_search_100k": _bench_history_search(100000),
+    "config_save_load": bench_config_save_load,
+    "plate_plan_384": bench_plate_plan_384,
+    "dilution_series_12": bench_dilution_series,
+    "worklist_1536": bench_worklist_1536,
+    "feasibility_grid_1000": bench_feasibility_grid,
+    "inventory_debit_10k": bench_inventory_debit,
+    "export_csv_10k": _bench_export(".csv", 10000),
+    "export_xlsx_10k": _bench_export(".xlsx", 10000),
+    "export_ods_10k": _bench_export(".ods", 10000),
+    "span_disabled": _bench_span(False),
+    "span_enabled": _bench_span(True),
+    "calculate_path_logging_off": _bench_logging(False),
+    "calculate_path_logging_queue": _bench_logging(True),
+}
+
+# Couple (avec journal, sans journal) dont le surcoût est affiché et borné
+LOGGING_PAIR = ("calculate_path_logging_queue", "calculate_path_logging_off")
+
+# Surcoût accepté du journal, en µs par calcul (deux messages INFO mis en forme et écrits
+# par le thread du QueueListener); mesuré entre 40 et 58 µs/op
+LOGGING_BUDGET_US = 80.0
+
+# Couples (résultat en cache, calcul complet): un accès au cache doit être plus rapide
+CACHE_PAIRS = (("generate_explanation_cached", "generate_explanation_scalar"),)
+
+# Benchmarks ignorés avec --quick
+SLOW_BENCHMARKS = ("calculate_mix_batch_100k", "calculate_mix_fixed_100k", "history_append_100k", "history_lookup_100k",
+                    "history_search_100k")
+
+
+def run_benchmark(setup, repeat):
+    """Exécute un benchmark 'repeat' fois et renvoie le meilleur temps par opération."""
+    prepared = setup()
+    if not hasattr(prepared, "__enter__"):
+        prepared = contextlib.nullcontext(prepared)
+    best = None
+    with prepared as (func, ops):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+    return {'seconds': best, 'ops': ops, 'us_per_op': best / ops * 1e6}
+
+
+def compare(results, baseline, tolerance):
+    """Renvoie la liste des benchmarks plus lents que la référence au-delà de la tolérance."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = result['us_per_op'] / reference['us_per_op']
+        result['ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    """Lance la suite, écrit les résultats et vérifie les régressions."""
+    parser = argparse.ArgumentParser(description="Benchmarks du calculateur de mix siRNA")
+    parser.add_argument("--quick", action="store_true", help="Ignore les benchmarks 100k")
+    parser.add_argument("--only", nargs="*", help="Noms des benchmarks à exécuter")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions (meilleur temps gardé)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichier de référence")
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="Fichier des résultats")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Ralentissement toléré par rapport à la référence (0.25 = +25 %%)")
+    args = parser.parse_args(argv)
+
+    names = args.only or [name for name in BENCHMARKS
+                          if not (args.quick and name in SLOW_BENCHMARKS)]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Benchmark(s) inconnu(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(BENCHMARKS[name], args.repeat)
+        print(f"{name:32s} {results[name]['us_per_op']:12.3f} µs/op  ({results[name]['seconds']:.3f} s)")
+
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+    status = 0
+    for cached, computed in CACHE_PAIRS:
+        if cached in results and computed in results \
+                and results[cached]['us_per_op'] >= results[computed]['us_per_op']:
+            print(f"CACHE INUTILE: {cached} ({results[cached]['us_per_op']:.3f} µs/op) n'est pas plus "
+                  f"rapide que {computed} ({results[computed]['us_per_op']:.3f} µs/op)")
+            status = 1
+
+    logged, silent = LOGGING_PAIR
+    if logged in results and silent in results:
+        overhead = results[logged]['us_per_op'] - results[silent]['us_per_op']
+        print(f"Surcoût du journal sur le chemin de calcul: {overhead:.3f} µs/op "
+              f"({overhead / results[silent]['us_per_op']:+.0%})")
+        if overhead > LOGGING_BUDGET_US:
+            print(f"JOURNAL TROP COÛTEUX: {overhead:.3f} µs/op au-delà du budget de {LOGGING_BUDGET_US:.0f} µs/op")
+            status = 1
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Référence enregistrée dans {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('platform') != report['platform']:
+            print(f"Attention: référence mesurée sur une autre plateforme ({baseline.get('platform')})")
+        regressions = compare(results, baseline, args.tolerance)
+        for name, ratio in regressions:
+            print(f"RÉGRESSION: {name} est {ratio:.2f} fois plus lent que la référence")
+        if regressions:
+            status = 1
+    else:
+        print(f"Pas de référence ({args.baseline}): utiliser --save-baseline pour en créer une")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,120 @@
 # main.py - Point d'entrée principal de l'application
+import argparse
+import atexit
 import logging
-import tkinter as tk
-from tkinter import ttk
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from app import SiRNAMixCalculator
+from models.calculation import SiRNACalculation
+from utils.batch_processing import BatchProcessor
+
+
+# Fichier journal, renouvelé lorsqu'il dépasse LOG_MAX_BYTES (LOG_BACKUP_COUNT anciens fichiers gardés)
+LOG_FILE = "sirna_calculator.log"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def attach_queue_logging(logger, handlers):
+    """
+    Branche logger sur une file vidée par un thread dédié (QueueListener) qui transmet
+    les enregistrements aux handlers.
+
+    LOG_FORMAT n'utilise ni le processus, ni le thread, ni l'emplacement de l'appel: ces
+    informations ne sont plus collectées pour chaque enregistrement (réglages globaux du
+    module logging, voir la section « Optimization » de sa documentation).
+
+    Returns:
+        Le QueueListener démarré; stop() vide la file et arrête le thread
+    """
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Le message (et la trace éventuelle) est mis en forme avant d'entrer dans la file;
+    # l'horodatage et le niveau sont ajoutés par les handlers du thread d'écriture
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
 
 
 def setup_logging():
-    """Configure le système de journalisation global."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler("sirna_calculator.log"),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Configure le système de journalisation global.
+
+    Les appels au journal ne font que déposer l'enregistrement dans une file; l'écriture
+    dans le fichier et sur la console est faite par un thread dédié (QueueListener),
+    jamais par le thread de l'interface.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                       backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    listener = attach_queue_logging(root_logger, [file_handler, stream_handler])
+    # Vide la file et ferme les fichiers à la sortie
+    atexit.register(listener.stop)
+
     return logging.getLogger("SiRNACalculator")
 
 
-def main():
-    """Fonction principale pour démarrer l'application."""
-    logger = setup_logging()
-    logger.info("Démarrage de l'application SiRNA Mix Calculator")
-    
+def parse_arguments(argv=None):
+    """Analyse les arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Calculateur de Mix siRNA")
+    parser.add_argument("--batch", metavar="ENTREE.csv",
+                        help="Calcule un fichier CSV sans interface graphique")
+    parser.add_argument("--out", metavar="RESULTATS.csv",
+                        help="Fichier CSV des résultats (obligatoire avec --batch)")
+    parser.add_argument("--rejects", metavar="REJETS.csv",
+                        help="Fichier CSV des lignes invalides (par défaut: <RESULTATS>_rejets.csv)")
+    parser.add_argument("--delimiter", default=",",
+                        help="Séparateur des fichiers CSV (par défaut: ',')")
+    parser.add_argument("--fixed-point", action="store_true",
+                        help="Mode par lots en virgule fixe (pL, pM): totaux exacts écrits en décimaux")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="Mesure les temps d'exécution dès le démarrage (fenêtre Diagnostics)")
+    args = parser.parse_args(argv)
+
+    if args.batch and not args.out:
+        parser.error("--out est obligatoire avec --batch")
+    if args.batch and not args.rejects:
+        args.rejects = BatchProcessor.default_reject_path(args.out)
+    return args
+
+
+def run_batch(args, logger):
+    """Exécute le mode par lots sans charger Tk."""
+    logger.info(f"Mode par lots: {args.batch} -> {args.out} (rejets: {args.rejects})")
+    processor = BatchProcessor(SiRNACalculation(logger), logger, fixed_point=args.fixed_point)
+    try:
+        stats = processor.run(args.batch, args.out, args.rejects, delimiter=args.delimiter)
+    except (OSError, ValueError) as e:
+        logger.error(f"Échec du traitement par lots: {str(e)}")
+        return 1
+    return 0 if stats['rejected'] == 0 else 2
+
+
+def run_gui(logger, diagnostics=False):
+    """Démarre l'interface graphique Tk."""
+    # Imports différés: le mode par lots doit fonctionner sans Tk ni affichage
+    import tkinter as tk
+    from tkinter import ttk
+
+    from app import SiRNAMixCalculator
+
     root = tk.Tk()
     
     # Configuration du thème
@@ -35,11 +126,24 @@ def main():
         logger.warning("Le thème 'clam' n'est pas disponible, utilisation du thème par défaut")
     
     # Création de l'application
-    app = SiRNAMixCalculator(root, logger)
+    app = SiRNAMixCalculator(root, logger, diagnostics=diagnostics)
     
     # Lancement de l'application
     root.mainloop()
+    return 0
+
+
+def main(argv=None):
+    """Fonction principale pour démarrer l'application."""
+    args = parse_arguments(argv)
+    logger = setup_logging()
+
+    if args.batch:
+        return run_batch(args, logger)
+
+    logger.info("Démarrage de l'application SiRNA Mix Calculator")
+    return run_gui(logger, diagnostics=args.diagnostics)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# models/__init__.py - Noyau de calcul, utilisable sans Tk (scripts, notebooks, mode par lots)
+from models.calculation import SiRNACalculation
+from models.schema import FIELDS, InputValidator, get_validator, validate_inputs
+from models.units import (CONCENTRATION_UNITS, VOLUME_UNITS, convert_concentration, convert_volume, to_microliters,
+                          to_nanomolar)
+
+__all__ = [
+    "SiRNACalculation",
+    "FIELDS",
+    "InputValidator",
+    "get_validator",
+    "validate_inputs",
+    "CONCENTRATION_UNITS",
+    "VOLUME_UNITS",
+    "convert_concentration",
+    "convert_volume",
+    "to_microliters",
+    "to_nanomolar",
+]
@@ -0,0 +1,165 @@
+# models/batch.py - Moteur de calcul vectorisé pour les mix siRNA
+import numpy as np
+
+from models.inverse import SAMPLES_TOLERANCE
+from models.units import (CONCENTRATION_CONVERSIONS, CONCENTRATION_UNIT, VOLUME_CONVERSIONS, VOLUME_UNIT)
+
+
+def _to_reference(values, units, conversions, reference, kind):
+    """
+    Ramène une colonne de valeurs à l'unité de référence en une seule opération vectorisée.
+
+    Les unités (scalaire ou tableau) sont d'abord réduites à leurs valeurs distinctes;
+    la table de conversion précalculée n'est consultée qu'une fois par unité.
+    Les opérations (multiplication puis division) sont celles du calcul scalaire.
+    """
+    if isinstance(units, str):
+        if (units, reference) not in conversions:
+            raise ValueError(f"Unité de {kind} inconnue: {units}")
+        multiplier, divisor = conversions[(units, reference)]
+        if multiplier == divisor:
+            return values
+        return values * multiplier / divisor
+
+    units = np.broadcast_to(np.asarray(units), values.shape)
+    distinct, inverse = np.unique(units.ravel(), return_inverse=True)
+    unknown = [unit for unit in distinct.tolist() if (unit, reference) not in conversions]
+    if unknown:
+        raise ValueError(f"Unité(s) de {kind} inconnue(s): {', '.join(map(str, unknown))}")
+    scales = np.array([conversions[(unit, reference)] for unit in distinct.tolist()], dtype=np.float64)
+    inverse = inverse.reshape(values.shape)
+    return values * scales[:, 0][inverse] / scales[:, 1][inverse]
+
+
+def _to_microliters(values, units):
+    """Ramène une colonne de volumes en µL."""
+    return _to_reference(values, units, VOLUME_CONVERSIONS, VOLUME_UNIT, "volume")
+
+
+def _to_nanomolar(values, units):
+    """Ramène une colonne de concentrations en nM."""
+    return _to_reference(values, units, CONCENTRATION_CONVERSIONS, CONCENTRATION_UNIT, "concentration")
+
+
+def calculate_mix_batch(cf, v_milieu, v_mix, c_stock, n_samples, volume_unit="µL",
+                        cf_unit="nM", v_mix_unit="µL", c_stock_unit="nM"):
+    """
+    Calcule les volumes de mix siRNA pour un ensemble de puits en une seule passe.
+
+    Les opérations sont effectuées dans le même ordre que dans
+    SiRNACalculation.calculate_mix, ce qui garantit des résultats identiques
+    bit à bit pour chaque ligne.
+
+    Args:
+        cf: concentrations finales désirées (nM), tableau ou scalaire
+        v_milieu: volumes du milieu, dans l'unité donnée par volume_unit
+        v_mix: volumes du mix par échantillon (µL)
+        c_stock: concentrations des stocks (nM)
+        n_samples: nombres d'échantillons (tronqués en entiers)
+        volume_unit: unité du volume du milieu ('nL', 'µL' ou 'mL'), scalaire ou tableau
+        cf_unit, v_mix_unit, c_stock_unit: unités de cf, v_mix et c_stock (scalaires ou
+            tableaux); les colonnes sont ramenées en nM et µL avant le calcul
+
+    Returns:
+        Dictionnaire de tableaux numpy de même longueur:
+            - 'ci_mix': concentration initiale du mix (nM)
+            - 'v_sirna', 'v_buffer', 'v_mix': volumes par échantillon (µL)
+            - 'v_sirna_total', 'v_buffer_total', 'v_mix_total': volumes totaux (µL)
+            - 'feasible': masque booléen, faux lorsque ci_mix > c_stock
+        Les volumes des lignes non faisables sont calculés mais ne doivent pas être utilisés.
+    """
+    cf, v_milieu, v_mix, c_stock = np.broadcast_arrays(
+        np.asarray(cf, dtype=np.float64),
+        np.asarray(v_milieu, dtype=np.float64),
+        np.asarray(v_mix, dtype=np.float64),
+        np.asarray(c_stock, dtype=np.float64),
+    )
+    n_samples = np.broadcast_to(np.asarray(n_samples).astype(np.int64), cf.shape)
+
+    # Conversion des colonnes vers les unités de référence (nM, µL)
+    cf = _to_nanomolar(cf, cf_unit)
+    v_mix = _to_microliters(v_mix, v_mix_unit)
+    c_stock = _to_nanomolar(c_stock, c_stock_unit)
+    v_milieu_ul = _to_microliters(v_milieu, volume_unit)
+
+    # Mêmes équations que le calcul scalaire
+    ci_mix = (cf * v_milieu_ul) / v_mix
+    feasible = ~(ci_mix > c_stock)
+    v_sirna = (ci_mix * v_mix) / c_stock
+    v_buffer = v_mix - v_sirna
+
+    return {
+        'ci_mix': ci_mix,
+        'v_sirna': v_sirna,
+        'v_buffer': v_buffer,
+        'v_mix': v_mix,
+        'v_sirna_total': v_sirna * n_samples,
+        'v_buffer_total': v_buffer * n_samples,
+        'v_mix_total': v_mix * n_samples,
+        'feasible': feasible,
+    }
+
+
+def max_samples_batch(cf, v_milieu, v_mix, c_stock, stock_volume, volume_unit="µL"):
+    """
+    Calcule en une seule passe le nombre maximal d'échantillons par ligne (voir models.inverse.max_samples).
+
+    Returns:
+        Tableau d'entiers (int64), 0 pour les lignes non faisables
+    """
+    cf, v_milieu, v_mix, c_stock, stock_volume = np.broadcast_arrays(
+        np.asarray(cf, dtype=np.float64),
+        np.asarray(v_milieu, dtype=np.float64),
+        np.asarray(v_mix, dtype=np.float64),
+        np.asarray(c_stock, dtype=np.float64),
+        np.asarray(stock_volume, dtype=np.float64),
+    )
+    v_milieu_ul = _to_microliters(v_milieu, volume_unit)
+
+    ci_mix = (cf * v_milieu_ul) / v_mix
+    v_sirna = (ci_mix * v_mix) / c_stock
+    samples = np.floor(stock_volume / v_sirna * (1 + SAMPLES_TOLERANCE)).astype(np.int64)
+    samples[ci_mix > c_stock] = 0
+    return samples
+
+
+def min_stock_concentration_batch(cf, v_milieu, v_mix, n_samples, stock_volume=None, volume_unit="µL"):
+    """
+    Calcule en une seule passe la concentration de stock minimale par ligne
+    (voir models.inverse.min_stock_concentration).
+
+    Args:
+        stock_volume: volumes de stock disponibles (µL), None si illimités; np.inf
+            désigne un volume illimité pour une ligne
+
+    Returns:
+        Tableau de concentrations (nM)
+    """
+    cf, v_milieu, v_mix = np.broadcast_arrays(
+        np.asarray(cf, dtype=np.float64),
+        np.asarray(v_milieu, dtype=np.float64),
+        np.asarray(v_mix, dtype=np.float64),
+    )
+    v_milieu_ul = _to_microliters(v_milieu, volume_unit)
+
+    ci_mix = (cf * v_milieu_ul) / v_mix
+    if stock_volume is None:
+        return ci_mix
+    n_samples = np.broadcast_to(np.asarray(n_samples).astype(np.int64), cf.shape)
+    return np.maximum(ci_mix, (cf * v_milieu_ul) * n_samples / np.asarray(stock_volume, dtype=np.float64))
+
+
+def min_mix_volume_batch(cf, v_milieu, c_stock, min_volume=0.0, volume_unit="µL"):
+    """
+    Calcule en une seule passe le volume de mix minimal par ligne (voir models.inverse.min_mix_volume).
+
+    Returns:
+        Tableau de volumes par échantillon (µL)
+    """
+    cf, v_milieu, c_stock = np.broadcast_arrays(
+        np.asarray(cf, dtype=np.float64),
+        np.asarray(v_milieu, dtype=np.float64),
+        np.asarray(c_stock, dtype=np.float64),
+    )
+    v_milieu_ul = _to_microliters(v_milieu, volume_unit)
+    return np.maximum((cf * v_milieu_ul) / c_stock, min_volume)
@@ -0,0 +1,173 @@
+# models/cache.py - Cache des explications de calcul (LRU en mémoire, niveau disque optionnel)
+import json
+import sqlite3
+from collections import OrderedDict
+
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+
+
+class ResultCache:
+    """
+    Cache LRU borné des explications du modèle de calcul (texte), avec compteurs et niveau
+    disque optionnel.
+
+    Une recherche coûte la construction de la clé (et une requête SQLite si la valeur n'est
+    pas en mémoire): seules les explications, plus coûteuses à produire, y gagnent;
+    calculate_mix n'y passe pas.
+    """
+
+    DISK_SCHEMA = "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+    def __init__(self, logger, max_size=512, disk_path=None, disk_batch_size=50):
+        """
+        Initialise le cache.
+
+        Args:
+            logger: journal de l'application
+            max_size: nombre maximal d'explications gardées en mémoire
+            disk_path: fichier SQLite du niveau disque (None pour un cache en mémoire seulement)
+            disk_batch_size: nombre d'explications accumulées avant une écriture sur disque
+        """
+        self.logger = logger
+        self.max_size = max_size
+        self.disk_batch_size = disk_batch_size
+        self.entries = OrderedDict()
+        self.pending_disk = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+        self.connection = None
+        if disk_path is not None:
+            self.connection = sqlite3.connect(disk_path)
+            self.connection.execute(self.DISK_SCHEMA)
+            self.connection.commit()
+
+    def make_key(self, kind, inputs):
+        """
+        Construit la clé normalisée d'une explication.
+
+        Les valeurs sont converties en float (ou int pour le nombre d'échantillons). Le
+        volume du milieu garde la valeur et l'unité saisies, qui apparaissent dans le texte
+        des explications.
+
+        Le cache ne contient que des explications. La clé ne ramène pas les volumes en µL
+        et ignore les unités de Cf, du mix et du stock (entrées déjà converties par la
+        validation): elle ne convient pas à un cache placé devant calculate_mix.
+        """
+        return (
+            kind,
+            float(inputs[KEY_CF]),
+            float(inputs[KEY_VOLUME_MILIEU]),
+            inputs[KEY_VOLUME_UNIT],
+            float(inputs[KEY_VOLUME_MIX]),
+            float(inputs[KEY_STOCK]),
+            int(inputs[KEY_SAMPLES]),
+        )
+
+    def get_or_compute(self, kind, inputs, compute):
+        """
+        Renvoie le résultat en cache pour ces entrées, ou le calcule avec compute(inputs).
+
+        Les entrées incomplètes ou non numériques ne sont pas mises en cache:
+        compute() est alors appelé directement et produit son propre message d'erreur.
+        """
+        try:
+            key = self.make_key(kind, inputs)
+        except (KeyError, TypeError, ValueError):
+            key = None
+        if key is None:
+            return compute(inputs)
+
+        value = self.get(key)
+        if value is None:
+            value = compute(inputs)
+            self.put(key, value)
+        return value
+
+    def get(self, key):
+        """Renvoie la valeur associée à la clé (mémoire puis disque), ou None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        value = self._disk_get(key)
+        if value is not None:
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Ajoute une explication au cache mémoire et, si activé, au niveau disque."""
+        self._remember(key, value)
+        if self.connection is not None:
+            self.pending_disk[self._disk_key(key)] = json.dumps(value, ensure_ascii=False)
+            if len(self.pending_disk) >= self.disk_batch_size:
+                self.flush()
+
+    def stats(self):
+        """Renvoie les compteurs du cache."""
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def clear(self):
+        """Vide le cache mémoire et le niveau disque, et remet les compteurs à zéro."""
+        self.entries.clear()
+        self.pending_disk = {}
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+        if self.connection is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM results")
+
+    def flush(self):
+        """Écrit sur disque les explications en attente."""
+        if self.connection is None or not self.pending_disk:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                self.pending_disk.items()
+            )
+        self.pending_disk = {}
+
+    def close(self):
+        """Écrit les explications en attente et ferme le niveau disque."""
+        self.flush()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        self.logger.info(f"Cache des explications fermé: {self.stats()}")
+
+    def _remember(self, key, value):
+        """Insère une valeur en mémoire en évinçant la moins récemment utilisée si besoin."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_key(self, key):
+        """Sérialise une clé pour le niveau disque (repr conserve les float exactement)."""
+        return repr(key)
+
+    def _disk_get(self, key):
+        """Cherche une valeur dans le niveau disque."""
+        if self.connection is None:
+            return None
+        disk_key = self._disk_key(key)
+        if disk_key in self.pending_disk:
+            return json.loads(self.pending_disk[disk_key])
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (disk_key,)).fetchone()
+        return json.loads(row[0]) if row else None
@@ -1,13 +1,47 @@
 # models/calculation.py - Modèle pour les calculs de mix siRNA
 import datetime
 
+from models.inverse import INVERSE_TARGETS, max_samples, min_mix_volume, min_stock_concentration
+from models.pipetting import DEFAULT_MAX_TUBE_VOLUME, DEFAULT_MIN_PIPETTING_VOLUME, PipettingSolver
+from models.plate import plan_plate
+from models.result import MixResult
+from models.schema import KEY_CF_UNIT, KEY_SAMPLES, KEY_STOCK, KEY_STOCK_UNIT, KEY_VOLUME_MIX, KEY_VOLUME_MIX_UNIT
+
 
 class SiRNACalculation:
     """Classe pour effectuer les calculs de mix siRNA."""
 
-    def __init__(self, logger):
-        """Initialise le modèle de calcul."""
+    def __init__(self, logger, cache=None, min_volume=DEFAULT_MIN_PIPETTING_VOLUME,
+                 max_tube_volume=DEFAULT_MAX_TUBE_VOLUME):
+        """
+        Initialise le modèle de calcul.
+
+        Args:
+            logger: journal de l'application
+            cache: ResultCache optionnel placé devant generate_explanation; calculate_mix
+                n'y passe pas, le calcul étant plus rapide que la recherche en cache
+            min_volume: plus petit volume pipetable (µL)
+            max_tube_volume: volume maximal d'un tube de dilution intermédiaire (µL)
+        """
         self.logger = logger
+        self.cache = cache
+        self.solver = PipettingSolver(min_volume, max_tube_volume)
+
+    def set_pipetting_limits(self, min_volume, max_tube_volume):
+        """Change les limites de pipetage utilisées pour les dilutions intermédiaires."""
+        if (min_volume, max_tube_volume) != (self.solver.min_volume, self.solver.max_tube_volume):
+            self.solver = PipettingSolver(min_volume, max_tube_volume)
+            self.logger.info("Limites de pipetage: %g µL minimum, %g µL par tube", min_volume, max_tube_volume)
+
+    def solve_pipetting(self, mix_result):
+        """
+        Cherche les dilutions intermédiaires nécessaires pour pipeter le stock d'un calcul simple.
+
+        Returns:
+            DilutionPlan (voir models.pipetting); ses lignes de tableau sont celles du
+            MixResult lorsque le stock peut être pipeté directement
+        """
+        return self.solver.solve_mix(mix_result)
 
     def calculate_mix(self, inputs):
         """
@@ -17,7 +51,7 @@ class SiRNACalculation:
             inputs: Dictionnaire contenant les valeurs d'entrée
                 - 'Cf de siRNA désiré': concentration finale désirée (nM)
                 - 'Volume du milieu': volume total du milieu de culture
-                - 'volume_unit': unité du volume (µL ou mL)
+                - 'volume_unit': unité du volume (nL, µL ou mL)
                 - 'Volume final du mix à mettre dans le milieu de culture': volume du mix (µL)
                 - 'Concentration du stock de siRNA': concentration du stock (nM)
                 - 'Nombre d'échantillon(s)': nombre d'échantillons
@@ -26,57 +60,334 @@ class SiRNACalculation:
             Dictionnaire contenant:
                 - 'success': booléen indiquant si le calcul a réussi
                 - 'error': message d'erreur en cas d'échec
-                - 'data': tableau des valeurs calculées pour chaque composant
+                - 'result': MixResult contenant les valeurs brutes du calcul
                 - 'ci_mix': concentration initiale du mix
         """
         try:
-            # Extraction des valeurs d'entrée
-            cf = inputs['Cf de siRNA désiré']  # Concentration finale désirée (nM)
-            v_milieu = inputs['Volume du milieu']  # Volume du milieu (µL ou mL)
-            v_mix = inputs['Volume final du mix à mettre dans le milieu de culture']  # Volume du mix (µL)
-            c_stock = inputs['Concentration du stock de siRNA']  # Concentration du stock (nM)
-            n_samples = int(inputs['Nombre d\'échantillon(s)'])  # Nombre d'échantillons
-
-            # Conversion du volume du milieu en µL si nécessaire
-            if inputs['volume_unit'] == 'mL':
-                v_milieu = v_milieu * 1000
-
-            # Calcul de la concentration initiale du mix
-            ci_mix = (cf * v_milieu) / v_mix
+            mix_result = MixResult.from_inputs(inputs)
 
             # Vérification de la faisabilité
-            if ci_mix > c_stock:
+            if not mix_result.is_feasible:
                 return {
                     'success': False,
-                    'error': f"La concentration requise dans le mix ({ci_mix:.2f} nM) est supérieure à la concentration stock ({c_stock} nM). Augmentez le volume du mix ou diminuez la concentration finale désirée."
+                    'error': f"La concentration requise dans le mix ({mix_result.ci_mix:.2f} nM) est supérieure à la concentration stock ({mix_result.c_stock} nM). Augmentez le volume du mix ou diminuez la concentration finale désirée."
                 }
 
-            # Calcul du volume de siRNA stock à utiliser par échantillon
-            v_sirna = (ci_mix * v_mix) / c_stock
+            return {
+                'success': True,
+                'result': mix_result,
+                'ci_mix': mix_result.ci_mix
+            }
 
-            # Calcul du volume de tampon par échantillon
-            v_buffer = v_mix - v_sirna
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul du mix: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
 
-            # Calcul des volumes totaux pour tous les échantillons
-            v_sirna_total = v_sirna * n_samples
-            v_buffer_total = v_buffer * n_samples
-            v_mix_total = v_mix * n_samples
+    def calculate_mix_batch(self, inputs, fixed_point=False):
+        """
+        Calcule les volumes pour un ensemble de mix siRNA en une seule passe vectorisée.
 
-            # Préparation des données pour l'affichage
-            data = [
-                ("siRNA", f"{v_sirna:.2f}", f"{v_sirna_total:.2f}"),
-                ("Tampon", f"{v_buffer:.2f}", f"{v_buffer_total:.2f}"),
-                ("Mix total", f"{v_mix:.2f}", f"{v_mix_total:.2f}")
-            ]
+        Args:
+            inputs: Dictionnaire avec les mêmes clés que pour calculate_mix, chaque valeur
+                pouvant être un tableau (une valeur par puits) ou un scalaire commun.
+                'volume_unit' vaut 'µL' par défaut; les colonnes 'cf_unit', 'v_mix_unit'
+                et 'c_stock_unit' (nM, µL et nM par défaut) sont converties en une passe.
+            fixed_point: si vrai, calcul entier exact (voir models.fixed_point): 'ci_mix' en
+                pM et volumes en pL (int64), totaux exacts et sommables sur une plaque
 
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si le calcul a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'data': dictionnaire de tableaux numpy (voir models.batch.calculate_mix_batch)
+                - 'feasible': masque des lignes pour lesquelles ci_mix <= c_stock
+        """
+        # Import différé: numpy est coûteux à charger et inutile pour le calcul simple
+        if fixed_point:
+            from models.fixed_point import calculate_mix_fixed as calculate_mix_batch
+        else:
+            from models.batch import calculate_mix_batch
+
+        try:
+            data = calculate_mix_batch(
+                inputs['Cf de siRNA désiré'],
+                inputs['Volume du milieu'],
+                inputs['Volume final du mix à mettre dans le milieu de culture'],
+                inputs['Concentration du stock de siRNA'],
+                inputs['Nombre d\'échantillon(s)'],
+                inputs.get('volume_unit', 'µL'),
+                inputs.get(KEY_CF_UNIT, 'nM'),
+                inputs.get(KEY_VOLUME_MIX_UNIT, 'µL'),
+                inputs.get(KEY_STOCK_UNIT, 'nM')
+            )
+            self.logger.debug("Calcul vectorisé effectué pour %d ligne(s)", data['ci_mix'].size)
             return {
                 'success': True,
                 'data': data,
-                'ci_mix': ci_mix
+                'feasible': data['feasible']
             }
 
         except Exception as e:
-            self.logger.error(f"Erreur dans le calcul du mix: {str(e)}", exc_info=True)
+            self.logger.error(f"Erreur dans le calcul vectorisé du mix: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
+
+    def solve_inverse(self, target, inputs, stock_volume=None):
+        """
+        Résout le calcul à l'envers: la grandeur 'target' est déduite des autres entrées.
+
+        Args:
+            target: clé du champ à résoudre (voir models.inverse.INVERSE_TARGETS)
+                - nombre d'échantillons: maximum permis par stock_volume (obligatoire)
+                - concentration du stock: minimum pour un mix faisable (et pour tous les
+                  échantillons si stock_volume est donné)
+                - volume du mix: minimum pour un mix faisable et pipetable
+            inputs: entrées validées, sans le champ 'target'
+            stock_volume: volume de stock disponible (µL), ou None
+
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si la résolution a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'value': valeur résolue du champ 'target'
+        """
+        if target not in INVERSE_TARGETS:
+            return {'success': False, 'error': f"Erreur : grandeur à résoudre inconnue '{target}'."}
+        try:
+            if target == KEY_SAMPLES:
+                if stock_volume is None:
+                    return {'success': False, 'error': "Erreur : indiquez le volume de stock disponible."}
+                value = max_samples(inputs, stock_volume)
+                if value == 0:
+                    return {
+                        'success': False,
+                        'error': f"Le stock disponible ({stock_volume:g} µL) ne suffit pas pour un échantillon, ou la concentration requise dans le mix est supérieure à celle du stock."
+                    }
+            elif target == KEY_STOCK:
+                value = min_stock_concentration(inputs, stock_volume)
+            else:
+                value = min_mix_volume(inputs, self.solver.min_volume)
+                if stock_volume is not None and max_samples(dict(inputs, **{KEY_VOLUME_MIX: value}), stock_volume) < int(inputs[KEY_SAMPLES]):
+                    return {
+                        'success': False,
+                        'error': f"Le stock disponible ({stock_volume:g} µL) ne suffit pas pour {inputs[KEY_SAMPLES]} échantillon(s), quel que soit le volume du mix."
+                    }
+
+            self.logger.info("Calcul inverse: %s = %g", INVERSE_TARGETS[target], value)
+            return {'success': True, 'value': value}
+
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul inverse: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
+
+    def solve_inverse_batch(self, target, inputs, stock_volume=None):
+        """
+        Résout le calcul à l'envers pour un ensemble de lignes en une seule passe vectorisée.
+
+        Args:
+            target: clé du champ à résoudre (voir solve_inverse)
+            inputs: dictionnaire de colonnes comme pour calculate_mix_batch, sans le champ 'target'
+            stock_volume: volumes de stock disponibles (µL), tableau ou scalaire, ou None
+
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si la résolution a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'values': tableau numpy des valeurs résolues (0 échantillon pour les
+                  lignes non faisables)
+        """
+        # Import différé: numpy est coûteux à charger et inutile pour le calcul simple
+        from models.batch import max_samples_batch, min_mix_volume_batch, min_stock_concentration_batch
+
+        if target not in INVERSE_TARGETS:
+            return {'success': False, 'error': f"Erreur : grandeur à résoudre inconnue '{target}'."}
+        try:
+            volume_unit = inputs.get('volume_unit', 'µL')
+            if target == KEY_SAMPLES:
+                if stock_volume is None:
+                    return {'success': False, 'error': "Erreur : indiquez le volume de stock disponible."}
+                values = max_samples_batch(
+                    inputs['Cf de siRNA désiré'],
+                    inputs['Volume du milieu'],
+                    inputs['Volume final du mix à mettre dans le milieu de culture'],
+                    inputs['Concentration du stock de siRNA'],
+                    stock_volume,
+                    volume_unit
+                )
+            elif target == KEY_STOCK:
+                values = min_stock_concentration_batch(
+                    inputs['Cf de siRNA désiré'],
+                    inputs['Volume du milieu'],
+                    inputs['Volume final du mix à mettre dans le milieu de culture'],
+                    inputs.get('Nombre d\'échantillon(s)', 1),
+                    stock_volume,
+                    volume_unit
+                )
+            else:
+                values = min_mix_volume_batch(
+                    inputs['Cf de siRNA désiré'],
+                    inputs['Volume du milieu'],
+                    inputs['Concentration du stock de siRNA'],
+                    self.solver.min_volume,
+                    volume_unit
+                )
+            self.logger.debug("Calcul inverse vectorisé effectué pour %d ligne(s)", values.size)
+            return {'success': True, 'values': values}
+
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul inverse vectorisé: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
+
+    def calculate_series(self, inputs, dilution_factor, n_points):
+        """
+        Calcule une série de dilutions (dose-réponse) en une seule passe vectorisée.
+
+        Args:
+            inputs: Dictionnaire d'entrées validées, comme pour calculate_mix; la Cf
+                désirée est celle du point le plus concentré
+            dilution_factor: facteur entre deux points successifs (> 1)
+            n_points: nombre de points de la série
+
+        Les points dont le volume de stock n'est pas pipetable sont préparés à partir de
+        dilutions intermédiaires, communes à toute la série (voir PipettingSolver).
+
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si le calcul a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'data': dictionnaire de tableaux numpy (voir models.series.calculate_series)
+                - 'dilutions': DilutionPlan des points faisables
+                - 'rows': lignes du tableau de résultats
+                - 'errors': messages des points non faisables ou non pipetables
+        """
+        # Import différé: numpy est coûteux à charger et inutile pour le calcul simple
+        from models.series import calculate_series, series_mixes, series_table_rows
+
+        try:
+            data = calculate_series(
+                inputs['Cf de siRNA désiré'],
+                dilution_factor,
+                n_points,
+                inputs['Volume du milieu'],
+                inputs['Volume final du mix à mettre dans le milieu de culture'],
+                inputs['Concentration du stock de siRNA'],
+                inputs['Nombre d\'échantillon(s)'],
+                inputs.get('volume_unit', 'µL')
+            )
+            mixes, indices = series_mixes(data)
+            dilution_plan = self.solver.solve(mixes)
+
+            errors = []
+            for i, (cf, ci_mix, feasible) in enumerate(zip(
+                    data['cf'].tolist(), data['ci_mix'].tolist(), data['feasible'].tolist()), start=1):
+                if not feasible:
+                    errors.append(f"Point {i} ({cf:g} nM): la concentration requise dans le mix ({ci_mix:.2f} nM) est supérieure à la concentration stock ({inputs['Concentration du stock de siRNA']} nM).")
+            errors.extend(dilution_plan.errors)
+            self.logger.debug("Série de dilutions calculée: %d point(s), %d dilution(s) intermédiaire(s)",
+                              n_points, len(dilution_plan.dilutions))
+            return {
+                'success': True,
+                'data': data,
+                'dilutions': dilution_plan,
+                'rows': series_table_rows(data, dilution_plan, indices),
+                'errors': errors
+            }
+
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul de la série de dilutions: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
+
+    def sweep_feasibility(self, inputs, x_key, x_values, y_key, y_values):
+        """
+        Évalue la faisabilité et la consommation de stock sur une grille de deux paramètres.
+
+        Args:
+            inputs: Dictionnaire d'entrées validées; les paramètres hors axes gardent leur valeur
+            x_key, y_key: clés des paramètres en abscisse et en ordonnée (voir models.sweep.SWEEP_AXES)
+            x_values, y_values: valeurs des axes
+
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si le calcul a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'grid': dictionnaire de tableaux numpy (voir models.sweep.feasibility_grid)
+        """
+        # Import différé: numpy est coûteux à charger et inutile pour le calcul simple
+        from models.sweep import feasibility_grid
+
+        try:
+            grid = feasibility_grid(inputs, x_key, x_values, y_key, y_values, self.solver.min_volume)
+            self.logger.debug("Carte de faisabilité calculée: %d x %d points", len(x_values), len(y_values))
+            return {
+                'success': True,
+                'grid': grid
+            }
+
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul de la carte de faisabilité: {str(e)}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Erreur de calcul: {str(e)}"
+            }
+
+    def plan_plate(self, wells, v_milieu, v_mix, volume_unit="µL", overage=0.1, dead_volume=0.0):
+        """
+        Calcule un plan de plaque: un master mix par siRNA et par concentration.
+
+        Args:
+            wells: liste de PlateWell (voir models.plate.build_layout et read_layout_csv)
+            v_milieu: volume de milieu par puits (dans volume_unit)
+            v_mix: volume de mix ajouté à chaque puits (µL)
+            volume_unit: unité du volume du milieu (µL ou mL)
+            overage: surplus relatif préparé pour chaque mix (0.1 = 10 %)
+            dead_volume: volume mort par tube de mix (µL)
+
+        Returns:
+            Dictionnaire contenant:
+                - 'success': booléen indiquant si le calcul a réussi
+                - 'error': message d'erreur en cas d'échec
+                - 'plan': PlatePlan calculé
+                - 'dilutions': DilutionPlan des master mix (dilutions intermédiaires partagées)
+                - 'errors': messages des master mix non faisables ou non pipetables (le plan
+                  est tout de même renvoyé)
+        """
+        try:
+            if not wells:
+                return {'success': False, 'error': "Le plan de plaque ne contient aucun puits."}
+            plan = plan_plate(wells, v_milieu, v_mix, volume_unit, overage, dead_volume)
+            errors = [
+                f"{mix.label}: la concentration requise dans le mix ({mix.result.ci_mix:.2f} nM) est supérieure à la concentration stock ({mix.result.c_stock} nM)."
+                for mix in plan.infeasible
+            ]
+            dilution_plan = self.solver.solve([
+                (mix.sirna, mix.result.c_stock, mix.result.ci_mix, mix.v_mix_total, len(mix.wells))
+                for mix in plan.mixes
+            ])
+            errors.extend(dilution_plan.errors)
+            self.logger.debug("Plan de plaque: %d puits, %d master mix", plan.n_wells, len(plan.mixes))
+            return {
+                'success': True,
+                'plan': plan,
+                'dilutions': dilution_plan,
+                'errors': errors
+            }
+
+        except Exception as e:
+            self.logger.error(f"Erreur dans le calcul du plan de plaque: {str(e)}", exc_info=True)
             return {
                 'success': False,
                 'error': f"Erreur de calcul: {str(e)}"
@@ -92,76 +403,22 @@ class SiRNACalculation:
         Returns:
             Texte explicatif des calculs
         """
+        if self.cache is not None:
+            # Les instructions dépendent des limites de pipetage
+            kind = f"explanation:{self.solver.min_volume:g}:{self.solver.max_tube_volume:g}"
+            return self.cache.get_or_compute(kind, inputs, self._generate_explanation)
+        return self._generate_explanation(inputs)
+
+    def _generate_explanation(self, inputs):
+        """Génère le texte de generate_explanation, sans passer par le cache."""
         try:
-            # Extraction des valeurs d'entrée
-            cf = inputs['Cf de siRNA désiré']  # Concentration finale désirée (nM)
-            v_milieu = inputs['Volume du milieu']  # Volume du milieu (µL ou mL)
-            v_mix = inputs['Volume final du mix à mettre dans le milieu de culture']  # Volume du mix (µL)
-            c_stock = inputs['Concentration du stock de siRNA']  # Concentration du stock (nM)
-            n_samples = int(inputs['Nombre d\'échantillon(s)'])  # Nombre d'échantillons
-            volume_unit = inputs['volume_unit']  # Unité de volume
-
-            # Conversion du volume du milieu en µL si nécessaire
-            v_milieu_ul = v_milieu
-            if volume_unit == 'mL':
-                v_milieu_ul = v_milieu * 1000
-
-            # Calcul de la concentration initiale du mix
-            ci_mix = (cf * v_milieu_ul) / v_mix
-
-            # Calcul du volume de siRNA stock à utiliser par échantillon
-            v_sirna = (ci_mix * v_mix) / c_stock
-
-            # Calcul du volume de tampon par échantillon
-            v_buffer = v_mix - v_sirna
-
-            # Calcul des volumes totaux pour tous les échantillons
-            v_sirna_total = v_sirna * n_samples
-            v_buffer_total = v_buffer * n_samples
-            v_mix_total = v_mix * n_samples
-
-            # Génération de l'explication
-            explanation = f"""
-Explication détaillée du calcul de mix siRNA:
-
-Valeurs d'entrée:
-- Concentration finale (Cf) de siRNA désirée dans la culture: {cf} nM
-- Volume du milieu de culture: {v_milieu} {volume_unit} ({v_milieu_ul} µL)
-- Volume final du mix à ajouter au milieu: {v_mix} µL
-- Concentration du stock de siRNA: {c_stock} nM
-- Nombre d'échantillons: {n_samples}
-
-Équations utilisées:
-1) Pour calculer la concentration initiale requise dans le mix (Ci):
-   Ci = (Cf * Vmilieu) / Vmix
-   Ci = ({cf} nM * {v_milieu_ul} µL) / {v_mix} µL
-   Ci = {ci_mix:.2f} nM
-
-2) Pour calculer le volume de siRNA stock nécessaire:
-   VsiRNA = (Ci * Vmix) / Cstock
-   VsiRNA = ({ci_mix:.2f} nM * {v_mix} µL) / {c_stock} nM
-   VsiRNA = {v_sirna:.2f} µL par échantillon
-   Volume total de siRNA pour {n_samples} échantillon(s): {v_sirna_total:.2f} µL
-
-3) Pour calculer le volume de tampon nécessaire:
-   Vtampon = Vmix - VsiRNA
-   Vtampon = {v_mix} µL - {v_sirna:.2f} µL
-   Vtampon = {v_buffer:.2f} µL par échantillon
-   Volume total de tampon pour {n_samples} échantillon(s): {v_buffer_total:.2f} µL
-
-4) Volume total du mix pour {n_samples} échantillon(s):
-   Vmix_total = {v_mix} µL * {n_samples} = {v_mix_total:.2f} µL
-
-Instructions pour la préparation:
-1. Dans un tube, mélanger {v_sirna_total:.2f} µL de solution stock de siRNA ({c_stock} nM)
-2. Ajouter {v_buffer_total:.2f} µL de tampon
-3. Mélanger doucement par pipetage
-4. Ajouter {v_mix} µL de ce mix à chaque échantillon de milieu de culture
-
-La concentration finale de siRNA dans chaque échantillon sera de {cf} nM.
-"""
-
-            return explanation
+            # L'explication est aussi produite pour un mix non faisable, comme indication
+            calculation_result = self.calculate_mix(inputs)
+            if not calculation_result['success']:
+                return MixResult.from_inputs(inputs).explanation()
+            mix_result = calculation_result['result']
+            dilution_plan = self.solve_pipetting(mix_result)
+            return mix_result.explanation(dilution_plan.instructions(mix_result, self.solver.min_volume))
 
         except Exception as e:
             self.logger.error(f"Erreur dans la génération de l'explication: {str(e)}", exc_info=True)
@@ -0,0 +1,260 @@
+# models/fixed_point.py - Moteur vectorisé en virgule fixe (entiers int64)
+import numpy as np
+
+from models.batch import _to_microliters, _to_nanomolar
+
+# Résolutions: les volumes sont comptés en picolitres, les concentrations en
+# picomolaire (femtomoles par mL)
+PICOLITERS_PER_MICROLITER = 10 ** 6
+PICOMOLAR_PER_NANOMOLAR = 10 ** 3
+
+# Nombre de lignes calculées à la fois (tableaux de travail dans le cache)
+BLOCK_SIZE = 32768
+
+# Colonnes de sortie entières, dans l'ordre des lignes du tableau alloué
+OUTPUT_COLUMNS = ('ci_mix', 'v_sirna', 'v_buffer', 'v_mix', 'v_sirna_total', 'v_buffer_total', 'v_mix_total')
+
+# Borne des produits intermédiaires: au-delà, int64 risquerait de déborder
+MAX_PRODUCT = 2 ** 62
+
+# Borne des opérandes pour lesquels une division en float64, arrondie au plus proche
+# puis tronquée, donne exactement le quotient entier (voir mix_kernel)
+MAX_FLOAT_EXACT = 2 ** 51
+
+
+def quantize(values, scale, label):
+    """
+    Convertit une colonne de nombres flottants en entiers à la résolution 1 / scale.
+
+    Raises:
+        ValueError: si une valeur positive devient nulle (inférieure à la résolution)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * scale
+    np.rint(scaled, out=scaled)
+    # Vérification complète seulement si une valeur arrondie est nulle ou négative
+    if scaled.size and scaled.min() <= 0 and ((scaled <= 0) & (values > 0)).any():
+        raise ValueError(f"{label}: valeur inférieure à la résolution du mode entier (1/{scale:g})")
+    return scaled.astype(np.int64)
+
+
+def _column_max(column):
+    """Renvoie le maximum d'une colonne entière (0 pour une colonne vide)."""
+    return int(column.max()) if column.size else 0
+
+
+def _plan(max_cf, max_v_milieu, max_v_mix, max_c_stock, max_samples):
+    """
+    Vérifie que les produits de colonnes entières tiennent dans un int64 et choisit le
+    calcul de mix_kernel à partir des maxima des colonnes.
+
+    Returns:
+        (use_float, max_volume): divisions en float64 possibles, et volume par
+        échantillon au-delà duquel un total déborderait
+    """
+    for left, right in ((max_cf, max_v_milieu), (max_c_stock, max_v_mix), (max_v_mix, max_samples)):
+        if left * right >= MAX_PRODUCT:
+            raise ValueError("Valeurs trop grandes pour le mode entier (dépassement int64)")
+    use_float = max(max_cf * max_v_milieu, max_c_stock, max_v_mix) < MAX_FLOAT_EXACT
+    # Les lignes faisables (v_sirna <= v_mix, v_mix x n_samples vérifié) restent toujours en deçà
+    return use_float, MAX_PRODUCT // max(max_samples, 1)
+
+
+def _round_div(numerator, denominator, out):
+    """Division entière arrondie au plus proche (valeurs positives), écrite dans out."""
+    np.right_shift(denominator, 1, out=out)
+    out += numerator
+    np.floor_divide(out, denominator, out=out)
+    return out
+
+
+def _allocate(size, names=OUTPUT_COLUMNS):
+    """
+    Alloue les colonnes de sortie entières (lignes d'un seul tableau, dans l'ordre de
+    names) et le masque 'feasible'.
+
+    Returns:
+        (tableau à deux dimensions, dictionnaire des colonnes)
+    """
+    table = np.empty((len(names), size), dtype=np.int64)
+    data = dict(zip(names, table))
+    data['feasible'] = np.empty(size, dtype=bool)
+    return table, data
+
+
+def mix_kernel(cf, v_milieu, v_mix, c_stock, n_samples):
+    """
+    Calcule les volumes d'un ensemble de mix sur des colonnes entières.
+
+    Chaque volume par échantillon est arrondi une seule fois au picolitre; les totaux
+    (volume par échantillon x nombre d'échantillons) et leurs sommes sur une plaque
+    sont ensuite exacts. Les lignes non faisables (stock trop faible) peuvent avoir un
+    volume de siRNA bien supérieur à v_mix: si le total de l'une d'elles dépasse int64,
+    les totaux des lignes non faisables de son bloc valent 0.
+
+    Tant que cf x v_milieu, v_mix et c_stock restent inférieurs à MAX_FLOAT_EXACT (cas
+    courant), les divisions et la faisabilité passent par float64, avec des résultats
+    identiques au calcul entier: floor_divide sur int64 est plusieurs fois plus lent.
+
+    Args (colonnes int64 à une dimension, de même longueur):
+        cf: concentrations finales (pM, int64)
+        v_milieu: volumes du milieu (pL, int64)
+        v_mix: volumes du mix par échantillon (pL, int64)
+        c_stock: concentrations des stocks (pM, int64)
+        n_samples: nombres d'échantillons (int64)
+
+    Returns:
+        Dictionnaire de tableaux int64 ('ci_mix' en pM, volumes en pL) et le masque
+        booléen 'feasible', avec les mêmes clés que models.batch.calculate_mix_batch
+    """
+    use_float, max_volume = _plan(_column_max(cf), _column_max(v_milieu), _column_max(v_mix),
+                                  _column_max(c_stock), _column_max(n_samples))
+
+    size = cf.size
+    _, data = _allocate(size, [name for name in OUTPUT_COLUMNS if name != 'v_mix'])
+    data['v_mix'] = v_mix
+
+    # Calcul par blocs tenant dans le cache: chaque opération écrit directement dans
+    # les tableaux de sortie, sans tableau intermédiaire de la taille des colonnes
+    amount_buffer = np.empty(min(size, BLOCK_SIZE), dtype=np.float64 if use_float else np.int64)
+    work_buffer = np.empty_like(amount_buffer)
+    for start in range(0, size, BLOCK_SIZE):
+        block = slice(start, min(start + BLOCK_SIZE, size))
+        count = block.stop - start
+        amount = amount_buffer[:count]
+        work = work_buffer[:count]
+        mix = v_mix[block]
+        stock = c_stock[block]
+        samples = n_samples[block]
+        v_sirna = data['v_sirna'][block]
+
+        # Quantité de siRNA par échantillon (pM x pL), exacte
+        np.multiply(cf[block], v_milieu[block], out=amount)
+        if use_float:
+            # Quotients flottants arrondis au plus proche puis tronqués: l'erreur
+            # d'arrondi (< 1 / (2 x diviseur)) ne peut pas franchir un entier
+            np.divide(amount, mix, out=work)
+            work += 0.5
+            np.copyto(data['ci_mix'][block], work, casting='unsafe')
+            # amount / c_stock <= v_mix équivaut à Ci <= stock, pour la même raison
+            np.divide(amount, stock, out=work)
+            np.less_equal(work, mix, out=data['feasible'][block])
+            work += 0.5
+            np.copyto(v_sirna, work, casting='unsafe')
+        else:
+            _round_div(amount, mix, data['ci_mix'][block])
+            # Comparaison exacte de Ci = amount / v_mix avec le stock, sans division
+            np.multiply(stock, mix, out=work)
+            np.less_equal(amount, work, out=data['feasible'][block])
+            _round_div(amount, stock, v_sirna)
+        v_buffer = np.subtract(mix, v_sirna, out=data['v_buffer'][block])
+
+        v_sirna_total = data['v_sirna_total'][block]
+        v_buffer_total = data['v_buffer_total'][block]
+        v_mix_total = np.multiply(mix, samples, out=data['v_mix_total'][block])
+        if v_sirna.max() < max_volume:
+            np.multiply(v_sirna, samples, out=v_sirna_total)
+            # Soustraction exacte, plus rapide qu'une multiplication int64
+            np.subtract(v_mix_total, v_sirna_total, out=v_buffer_total)
+        else:
+            # Totaux calculés pour les seules lignes faisables, sans débordement possible
+            feasible = data['feasible'][block]
+            for volume, total in ((v_sirna, v_sirna_total), (v_buffer, v_buffer_total)):
+                total.fill(0)
+                np.multiply(volume, samples, out=total, where=feasible)
+    return data
+
+
+def calculate_mix_fixed(cf, v_milieu, v_mix, c_stock, n_samples, volume_unit="µL",
+                        cf_unit="nM", v_mix_unit="µL", c_stock_unit="nM"):
+    """
+    Calcule les volumes de mix en virgule fixe, avec les mêmes arguments que
+    models.batch.calculate_mix_batch.
+
+    Les entrées sont ramenées en nM et µL, puis quantifiées au pM et au pL avant le
+    calcul entier (voir mix_kernel). La quantification, les vérifications de bornes et
+    le calcul sont faits bloc par bloc sur des tableaux de travail qui tiennent dans le
+    cache: les colonnes quantifiées ne sont jamais construites en entier. Un bloc hors
+    des bornes du calcul en float64 passe par quantize et mix_kernel.
+
+    Returns:
+        Dictionnaire de tableaux int64 ('ci_mix' en pM, volumes en pL) et le masque 'feasible'
+    """
+    cf, v_milieu, v_mix, c_stock = np.broadcast_arrays(
+        np.asarray(cf, dtype=np.float64),
+        np.asarray(v_milieu, dtype=np.float64),
+        np.asarray(v_mix, dtype=np.float64),
+        np.asarray(c_stock, dtype=np.float64),
+    )
+    shape = cf.shape
+    n_samples = np.broadcast_to(np.asarray(n_samples).astype(np.int64, copy=False), shape).reshape(-1)
+
+    # Le calcul se fait sur des colonnes à une dimension; les facteurs d'échelle sont
+    # des flottants (un entier Python ralentit chaque multiplication d'un bloc)
+    columns = (
+        (_to_nanomolar(cf, cf_unit).reshape(-1), float(PICOMOLAR_PER_NANOMOLAR), "Cf"),
+        (_to_microliters(v_milieu, volume_unit).reshape(-1), float(PICOLITERS_PER_MICROLITER), "Volume du milieu"),
+        (_to_microliters(v_mix, v_mix_unit).reshape(-1), float(PICOLITERS_PER_MICROLITER), "Volume du mix"),
+        (_to_nanomolar(c_stock, c_stock_unit).reshape(-1), float(PICOMOLAR_PER_NANOMOLAR), "Stock"),
+    )
+    size = n_samples.size
+    table, data = _allocate(size)
+
+    # Lignes de travail d'un bloc: Cf, milieu, v_mix et stock quantifiés (flottants à
+    # valeurs entières, exacts sous MAX_FLOAT_EXACT), quantité de siRNA, puis les
+    # quotients par v_mix et par le stock
+    buffers = np.empty((7, min(size, BLOCK_SIZE)), dtype=np.float64)
+    for start in range(0, size, BLOCK_SIZE):
+        block = slice(start, min(start + BLOCK_SIZE, size))
+        work = buffers[:, :block.stop - start]
+        for (values, scale, _), row in zip(columns, work):
+            np.multiply(values[block], scale, out=row)
+        np.rint(work[:4], out=work[:4])
+        cf_block, v_milieu_block, mix, stock, amount, ci_mix, v_sirna = work
+        samples = n_samples[block]
+        np.multiply(cf_block, v_milieu_block, out=amount)
+
+        # Bornes du bloc (v_mix, stock et quantité de siRNA sont des lignes consécutives):
+        # valeurs au moins égales à la résolution (une quantité nulle signale Cf ou le
+        # volume du milieu), divisions exactes en float64, et totaux sans débordement
+        # (v_sirna <= quantité, le stock valant au moins 1 pM)
+        bounded = work[2:5]
+        largest = int(bounded.max())
+        if not (bounded.min() > 0 and largest < MAX_FLOAT_EXACT and largest * int(samples.max()) < MAX_PRODUCT):
+            # Valeurs nulles, négatives, sous la résolution ou très grandes: calcul entier
+            # du bloc (quantize signale les valeurs sous la résolution, mix_kernel les
+            # débordements)
+            block_data = mix_kernel(*(quantize(values[block], scale, label) for values, scale, label in columns),
+                                    samples)
+            for name, values in block_data.items():
+                data[name][block] = values
+            continue
+
+        # Quotients par v_mix et par le stock en une opération (voir mix_kernel)
+        np.divide(amount, work[2:4], out=work[5:7])
+        np.less_equal(v_sirna, mix, out=data['feasible'][block])
+        work[5:7] += 0.5
+        out = table[:, block]
+        np.copyto(out[:2], work[5:7], casting='unsafe')
+        np.copyto(out[3], mix, casting='unsafe')
+        _, v_sirna_out, v_buffer_out, v_mix_out, v_sirna_total, v_buffer_total, v_mix_total = out
+        np.subtract(v_mix_out, v_sirna_out, out=v_buffer_out)
+        np.multiply(v_mix_out, samples, out=v_mix_total)
+        np.multiply(v_sirna_out, samples, out=v_sirna_total)
+        np.subtract(v_mix_total, v_sirna_total, out=v_buffer_total)
+    return {name: values.reshape(shape) for name, values in data.items()}
+
+
+def format_fixed(values, scale):
+    """
+    Écrit une colonne d'entiers en nombres décimaux exacts (ex. pL -> µL avec scale=10**6).
+
+    Returns:
+        Liste de chaînes, sans passer par des flottants
+    """
+    digits = len(str(scale)) - 1
+    values = np.asarray(values, dtype=np.int64)
+    units, remainders = np.divmod(np.abs(values), scale)
+    signs = np.where(values < 0, "-", "")
+    return [f"{sign}{unit}.{remainder:0{digits}d}"
+            for sign, unit, remainder in zip(signs.tolist(), units.tolist(), remainders.tolist())]
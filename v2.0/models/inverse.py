@@ -0,0 +1,89 @@
+# models/inverse.py - Calculs inverses: que permet un stock ou un budget de réactif donné ?
+import math
+
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+from models.units import to_microliters
+
+# Grandeurs pouvant être résolues: clé du champ -> libellé affiché
+INVERSE_TARGETS = {
+    KEY_SAMPLES: "Nombre max. d'échantillons",
+    KEY_STOCK: "Concentration min. du stock",
+    KEY_VOLUME_MIX: "Volume min. du mix",
+}
+
+# Tolérance relative sur le nombre d'échantillons: 12 µL / 1 µL ne doit pas donner 11
+SAMPLES_TOLERANCE = 1e-9
+
+
+def max_samples(inputs, stock_volume):
+    """
+    Renvoie le nombre maximal d'échantillons réalisables avec le volume de stock disponible.
+
+    Le volume de stock par échantillon (Cf * Vmilieu / Cstock) ne dépend pas du volume
+    du mix; le nombre d'échantillons des entrées est ignoré.
+
+    Args:
+        inputs: entrées validées (le champ du nombre d'échantillons peut manquer)
+        stock_volume: volume de stock disponible (µL)
+
+    Returns:
+        Nombre entier d'échantillons, 0 si le mix n'est pas faisable avec ce stock
+    """
+    v_milieu_ul = to_microliters(inputs[KEY_VOLUME_MILIEU], inputs[KEY_VOLUME_UNIT])
+    ci_mix = (inputs[KEY_CF] * v_milieu_ul) / inputs[KEY_VOLUME_MIX]
+    if ci_mix > inputs[KEY_STOCK]:
+        return 0
+    v_sirna = (ci_mix * inputs[KEY_VOLUME_MIX]) / inputs[KEY_STOCK]
+    return math.floor(stock_volume / v_sirna * (1 + SAMPLES_TOLERANCE))
+
+
+def min_stock_concentration(inputs, stock_volume=None):
+    """
+    Renvoie la concentration de stock minimale pour réaliser le mix.
+
+    Le stock doit être au moins aussi concentré que le mix (Ci); avec un volume de
+    stock limité, il doit aussi permettre de préparer tous les échantillons.
+
+    Args:
+        inputs: entrées validées (le champ de la concentration du stock peut manquer)
+        stock_volume: volume de stock disponible (µL), ou None si illimité
+
+    Returns:
+        Concentration minimale du stock (nM)
+    """
+    v_milieu_ul = to_microliters(inputs[KEY_VOLUME_MILIEU], inputs[KEY_VOLUME_UNIT])
+    ci_mix = (inputs[KEY_CF] * v_milieu_ul) / inputs[KEY_VOLUME_MIX]
+    if stock_volume is None:
+        return ci_mix
+    return max(ci_mix, (inputs[KEY_CF] * v_milieu_ul) * int(inputs[KEY_SAMPLES]) / stock_volume)
+
+
+def min_mix_volume(inputs, min_volume=0.0):
+    """
+    Renvoie le volume de mix minimal par échantillon.
+
+    En dessous, le mix devrait être plus concentré que le stock: le volume minimal est
+    celui du stock seul (Cf * Vmilieu / Cstock), et au moins le plus petit volume pipetable.
+
+    Args:
+        inputs: entrées validées (le champ du volume du mix peut manquer)
+        min_volume: plus petit volume pipetable (µL)
+
+    Returns:
+        Volume minimal du mix par échantillon (µL)
+    """
+    v_milieu_ul = to_microliters(inputs[KEY_VOLUME_MILIEU], inputs[KEY_VOLUME_UNIT])
+    return max((inputs[KEY_CF] * v_milieu_ul) / inputs[KEY_STOCK], min_volume)
+
+
+def round_up(value, digits=4):
+    """
+    Arrondit une valeur positive par excès à 'digits' chiffres significatifs.
+
+    Une borne minimale affichée ne doit jamais être inférieure à la valeur calculée.
+    """
+    scale = 10.0 ** (digits - 1 - math.floor(math.log10(value)))
+    rounded = math.ceil(value * scale) / scale
+    while rounded < value:
+        rounded += 1 / scale
+    return rounded
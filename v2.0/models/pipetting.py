@@ -0,0 +1,312 @@
+# models/pipetting.py - Volumes pipetables: dilutions intermédiaires du stock (sans Tk)
+import math
+from functools import lru_cache
+
+# Plus petit volume pipetable par défaut (µL)
+DEFAULT_MIN_PIPETTING_VOLUME = 0.5
+
+# Volume maximal par défaut d'un tube de dilution intermédiaire (µL)
+DEFAULT_MAX_TUBE_VOLUME = 1500.0
+
+# Nombre maximal de dilutions intermédiaires successives
+MAX_DILUTION_STEPS = 6
+
+# Tolérance relative des comparaisons de concentrations
+_TOLERANCE = 1e-9
+
+
+def dilution_factors(max_factor):
+    """Renvoie les facteurs 2, 5, 10, 20, 50, ... ne dépassant pas max_factor, du plus grand au plus petit."""
+    factors = []
+    scale = 1
+    while scale <= max_factor:
+        for step in (1, 2, 5):
+            factor = step * scale
+            if 2 <= factor <= max_factor:
+                factors.append(factor)
+        scale *= 10
+    return tuple(sorted(factors, reverse=True))
+
+
+@lru_cache(maxsize=4096)
+def find_dilution_chains(c_stock, c_low, c_high, factors, max_steps=MAX_DILUTION_STEPS):
+    """
+    Cherche les plus courtes suites de dilutions amenant c_stock dans [c_low, c_high].
+
+    Parcours en largeur: toutes les concentrations atteignables en k dilutions sont
+    examinées avant celles en k + 1. Les solutions les plus courtes sont classées de la
+    concentration finale la plus proche (en échelle logarithmique) du milieu de
+    l'intervalle à la plus éloignée: le volume pipeté n'est alors ni minimal ni égal à
+    tout le mix. Le résultat est mémorisé, les mix d'une même plaque posant souvent le
+    même sous-problème.
+
+    Args:
+        c_stock: concentration de départ (nM)
+        c_low, c_high: concentrations acceptables pour la source du mix (nM)
+        factors: facteurs de dilution autorisés (voir dilution_factors)
+        max_steps: nombre maximal de dilutions
+
+    Returns:
+        Tuple de suites de facteurs (((),) si le stock convient), vide sans solution
+    """
+    low = c_low * (1 - _TOLERANCE)
+    high = c_high * (1 + _TOLERANCE)
+    if c_stock < low:
+        return ()
+    if c_stock <= high:
+        return ((),)
+
+    target = math.sqrt(c_low * c_high)
+    frontier = {c_stock: ()}
+    for _ in range(max_steps):
+        next_frontier = {}
+        solutions = []
+        for concentration, chain in frontier.items():
+            for factor in factors:
+                diluted = concentration / factor
+                if diluted < low:
+                    continue
+                if diluted <= high:
+                    solutions.append((abs(math.log(diluted / target)), chain + (factor,)))
+                elif not solutions:
+                    # Les chemins menant à la même concentration sont équivalents
+                    next_frontier.setdefault(float(f"{diluted:.12g}"), chain + (factor,))
+        if solutions:
+            solutions.sort()
+            return tuple(chain for _, chain in solutions)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return ()
+
+
+def _total_factor(chain):
+    """Renvoie le facteur de dilution cumulé d'une suite de dilutions."""
+    total = 1
+    for factor in chain:
+        total *= factor
+    return total
+
+
+class IntermediateDilution:
+    """Dilution intermédiaire à préparer: volume de la source précédente et de tampon."""
+
+    __slots__ = ("sirna", "chain", "concentration", "source_concentration", "volume", "v_source", "v_diluent")
+
+    def __init__(self, sirna, chain, concentration, source_concentration, volume, v_source, v_diluent):
+        self.sirna = sirna
+        self.chain = chain
+        self.concentration = concentration
+        self.source_concentration = source_concentration
+        self.volume = volume
+        self.v_source = v_source
+        self.v_diluent = v_diluent
+
+    @property
+    def label(self):
+        return f"{self.sirna} dilué 1/{_total_factor(self.chain)} ({self.concentration:g} nM)"
+
+    @property
+    def source_label(self):
+        if len(self.chain) == 1:
+            return f"solution stock de {self.sirna} ({self.source_concentration:g} nM)"
+        return f"{self.sirna} dilué 1/{_total_factor(self.chain[:-1])} ({self.source_concentration:g} nM)"
+
+
+class MixRecipe:
+    """Préparation d'un mix: source pipetée (stock ou dilution) et tampon, pour tout le mix."""
+
+    __slots__ = ("sirna", "chain", "c_source", "v_source", "v_buffer", "v_mix", "n_samples")
+
+    def __init__(self, sirna, chain, c_source, v_source, v_buffer, v_mix, n_samples):
+        self.sirna = sirna
+        self.chain = chain
+        self.c_source = c_source
+        self.v_source = v_source
+        self.v_buffer = v_buffer
+        self.v_mix = v_mix
+        self.n_samples = n_samples
+
+    @property
+    def source_label(self):
+        if not self.chain:
+            return self.sirna
+        return f"{self.sirna} dilué 1/{_total_factor(self.chain)}"
+
+
+class DilutionPlan:
+    """
+    Résultat du solveur pour un ensemble de mix.
+
+    recipes est aligné sur les mix demandés (None pour un mix sans solution);
+    dilutions liste les dilutions intermédiaires à préparer, dans l'ordre de préparation;
+    stock_totals donne le volume de stock prélevé par siRNA (µL).
+    """
+
+    __slots__ = ("recipes", "dilutions", "stock_totals", "errors")
+
+    def __init__(self, recipes, dilutions, stock_totals, errors):
+        self.recipes = recipes
+        self.dilutions = dilutions
+        self.stock_totals = stock_totals
+        self.errors = errors
+
+    @property
+    def has_dilutions(self):
+        return bool(self.dilutions)
+
+    def dilution_rows(self):
+        """Renvoie les lignes du tableau des dilutions intermédiaires (source puis tampon)."""
+        rows = []
+        for dilution in self.dilutions:
+            rows.append((f"{dilution.label} - source", "-", dilution.v_source))
+            rows.append((f"{dilution.label} - Tampon", "-", dilution.v_diluent))
+        return rows
+
+    def mix_table_rows(self, result):
+        """
+        Renvoie les lignes du tableau de résultats d'un calcul simple: celles de
+        MixResult.table_rows() si le stock est pipetable directement, sinon les dilutions
+        intermédiaires suivies du mix préparé à partir de la dernière.
+        """
+        recipe = self.recipes[0] if self.recipes else None
+        if recipe is None or not recipe.chain:
+            return result.table_rows()
+        n_samples = recipe.n_samples
+        return self.dilution_rows() + [
+            (recipe.source_label, recipe.v_source / n_samples, recipe.v_source),
+            ("Tampon", recipe.v_buffer / n_samples, recipe.v_buffer),
+            ("Mix total", result.v_mix, recipe.v_mix),
+        ]
+
+    def instructions(self, result, min_volume):
+        """
+        Renvoie les instructions de préparation d'un calcul simple lorsque des dilutions
+        intermédiaires sont nécessaires (None sinon: la préparation directe s'applique).
+        """
+        recipe = self.recipes[0] if self.recipes else None
+        if recipe is None or not recipe.chain:
+            return None
+        lines = [f"Le volume de stock à prélever ({result.v_sirna_total:.3g} µL) est inférieur au volume "
+                 f"pipetable minimal ({min_volume:g} µL): le stock est d'abord dilué "
+                 f"en {len(self.dilutions)} étape(s)."]
+        step = 0
+        for step, dilution in enumerate(self.dilutions, start=1):
+            lines.append(f"{step}. Préparer {dilution.volume:.2f} µL de {dilution.label}: mélanger "
+                         f"{dilution.v_source:.2f} µL de {dilution.source_label} et {dilution.v_diluent:.2f} µL de tampon")
+        lines.extend([
+            f"{step + 1}. Dans un tube, mélanger {recipe.v_source:.2f} µL de {recipe.source_label} ({recipe.c_source:g} nM)",
+            f"{step + 2}. Ajouter {recipe.v_buffer:.2f} µL de tampon",
+            f"{step + 3}. Mélanger doucement par pipetage",
+            f"{step + 4}. Ajouter {result.v_mix} µL de ce mix à chaque échantillon de milieu de culture",
+        ])
+        return lines
+
+
+class PipettingSolver:
+    """
+    Choisit, pour chaque mix, le plus petit nombre de dilutions intermédiaires du stock
+    permettant de ne jamais pipeter moins de min_volume ni préparer plus de
+    max_tube_volume dans un tube de dilution.
+    """
+
+    def __init__(self, min_volume=DEFAULT_MIN_PIPETTING_VOLUME, max_tube_volume=DEFAULT_MAX_TUBE_VOLUME):
+        """
+        Initialise le solveur.
+
+        Args:
+            min_volume: plus petit volume pipetable (µL)
+            max_tube_volume: volume maximal d'un tube de dilution intermédiaire (µL)
+        """
+        if min_volume <= 0:
+            raise ValueError("Le volume pipetable minimal doit être supérieur à 0")
+        if max_tube_volume < 2 * min_volume:
+            raise ValueError("Le volume maximal d'un tube doit être au moins le double du volume pipetable minimal")
+        self.min_volume = min_volume
+        self.max_tube_volume = max_tube_volume
+        self.factors = dilution_factors(max_tube_volume / min_volume)
+
+    def solve_mix(self, result):
+        """Résout un calcul simple (MixResult): le mix total est préparé en un seul tube."""
+        return self.solve([("siRNA", result.c_stock, result.ci_mix, result.v_mix_total, result.n_samples)])
+
+    def solve(self, mixes):
+        """
+        Résout un ensemble de mix en une passe.
+
+        Les dilutions intermédiaires d'un même siRNA suivant la même suite de facteurs
+        sont partagées entre les mix; leur volume est la somme des prélèvements qui en
+        dépendent. Parmi les suites les plus courtes d'un mix, celle qui réutilise le plus
+        de dilutions déjà prévues pour les mix précédents est retenue.
+
+        Args:
+            mixes: liste de tuples (nom du siRNA, concentration du stock en nM,
+                concentration du mix en nM, volume total du mix en µL, nombre d'échantillons)
+
+        Returns:
+            DilutionPlan; un mix non faisable (concentration du mix supérieure à celle du
+            stock) n'a pas de recette et n'est pas signalé ici
+        """
+        recipes = []
+        errors = []
+        # (siRNA, stock, suite de facteurs) -> volume prélevé dans cette dilution
+        draws = {}
+        # Dilutions déjà prévues (y compris celles qui ne servent que de source à d'autres)
+        nodes = set()
+        stock_totals = {}
+
+        for sirna, c_stock, ci_mix, v_mix_total, n_samples in mixes:
+            if ci_mix > c_stock:
+                recipes.append(None)
+                continue
+            amount = ci_mix * v_mix_total
+            chains = ()
+            if v_mix_total >= self.min_volume and ci_mix > 0:
+                chains = find_dilution_chains(c_stock, ci_mix, amount / self.min_volume, self.factors)
+            if not chains:
+                recipes.append(None)
+                errors.append(f"{sirna} ({ci_mix:.2f} nM dans le mix): aucune suite de dilutions ne permet "
+                              f"de pipeter au moins {self.min_volume:g} µL.")
+                continue
+
+            # Candidats classés par préférence: le premier qui partage le plus de dilutions l'emporte
+            chain = max(chains, key=lambda candidate: sum(
+                (sirna, c_stock, candidate[:depth]) in nodes for depth in range(1, len(candidate) + 1)))
+            for depth in range(1, len(chain) + 1):
+                nodes.add((sirna, c_stock, chain[:depth]))
+            c_source = c_stock / _total_factor(chain)
+            v_source = amount / c_source
+            recipes.append(MixRecipe(sirna, chain, c_source, v_source, v_mix_total - v_source, v_mix_total, n_samples))
+            if chain:
+                key = (sirna, c_stock, chain)
+                draws[key] = draws.get(key, 0.0) + v_source
+            else:
+                stock_totals[sirna] = stock_totals.get(sirna, 0.0) + v_source
+
+        # Les dilutions les plus profondes sont dimensionnées d'abord: leur prélèvement
+        # s'ajoute à celui de la dilution dont elles proviennent
+        dilutions = []
+        depth = max((len(chain) for _, _, chain in draws), default=0)
+        while depth > 0:
+            for key in [key for key in draws if len(key[2]) == depth]:
+                sirna, c_stock, chain = key
+                factor = chain[-1]
+                volume = max(draws[key], factor * self.min_volume)
+                v_source = volume / factor
+                if volume > self.max_tube_volume * (1 + _TOLERANCE):
+                    errors.append(f"{sirna}: la dilution 1/{_total_factor(chain)} demande {volume:.2f} µL, "
+                                  f"plus que le volume maximal d'un tube ({self.max_tube_volume:g} µL).")
+                dilutions.append(IntermediateDilution(
+                    sirna, chain, c_stock / _total_factor(chain), c_stock / _total_factor(chain[:-1]),
+                    volume, v_source, volume - v_source
+                ))
+                parent = chain[:-1]
+                if parent:
+                    draws[(sirna, c_stock, parent)] = draws.get((sirna, c_stock, parent), 0.0) + v_source
+                else:
+                    stock_totals[sirna] = stock_totals.get(sirna, 0.0) + v_source
+            depth -= 1
+
+        # Ordre de préparation: des dilutions du stock vers les plus diluées
+        dilutions.sort(key=lambda dilution: len(dilution.chain))
+        return DilutionPlan(recipes, dilutions, stock_totals, errors)
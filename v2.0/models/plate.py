@@ -0,0 +1,273 @@
+# models/plate.py - Plans de plaque: regroupement des puits en master mix (sans Tk)
+from models.result import MixResult
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+
+# Formats de plaque: nombre de puits -> (lignes, colonnes)
+PLATE_FORMATS = {
+    6: (2, 3),
+    12: (3, 4),
+    24: (4, 6),
+    48: (6, 8),
+    96: (8, 12),
+    384: (16, 24),
+    1536: (32, 48),
+}
+
+
+def row_label(index):
+    """Renvoie le nom d'une ligne de plaque: A, B, ..., Z, AA, AB, ..."""
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+def well_names(plate_format):
+    """Renvoie les noms des puits d'une plaque (A1, A2, ...), ligne par ligne."""
+    if plate_format not in PLATE_FORMATS:
+        raise ValueError(f"Format de plaque inconnu: {plate_format}")
+    rows, columns = PLATE_FORMATS[plate_format]
+    return [f"{row_label(row)}{column + 1}" for row in range(rows) for column in range(columns)]
+
+
+class PlateWell:
+    """Puits d'un plan de plaque: un siRNA à une concentration finale."""
+
+    __slots__ = ("well", "sirna", "cf", "c_stock")
+
+    def __init__(self, well, sirna, cf, c_stock):
+        self.well = well
+        self.sirna = sirna
+        self.cf = cf
+        self.c_stock = c_stock
+
+
+def build_layout(plate_format, sirnas, concentrations, replicates=1):
+    """
+    Construit un plan de plaque siRNA x concentrations x réplicats, puits par puits.
+
+    Args:
+        plate_format: nombre de puits de la plaque (voir PLATE_FORMATS)
+        sirnas: liste de couples (nom du siRNA, concentration du stock en nM)
+        concentrations: concentrations finales désirées (nM)
+        replicates: nombre de puits par siRNA et par concentration
+
+    Returns:
+        Liste de PlateWell dans l'ordre de remplissage de la plaque (ligne par ligne)
+    """
+    names = well_names(plate_format)
+    needed = len(sirnas) * len(concentrations) * replicates
+    if needed > len(names):
+        raise ValueError(f"Le plan demande {needed} puits, la plaque n'en a que {len(names)}")
+
+    wells = []
+    for sirna, c_stock in sirnas:
+        for cf in concentrations:
+            for _ in range(replicates):
+                wells.append(PlateWell(names[len(wells)], sirna, cf, c_stock))
+    return wells
+
+
+def read_layout_csv(file_path, delimiter=","):
+    """
+    Lit un plan de plaque CSV avec les colonnes 'puits', 'sirna', 'cf' et 'c_stock'.
+
+    Returns:
+        Liste de PlateWell
+    """
+    # Import différé: csv (et re) alourdit le chargement du modèle
+    import csv
+
+    wells = []
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        missing = [name for name in ("puits", "sirna", "cf", "c_stock") if name not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Colonne(s) manquante(s) dans {file_path}: {', '.join(missing)}")
+        for row in reader:
+            try:
+                wells.append(PlateWell(row["puits"].strip(), row["sirna"].strip(),
+                                       float(row["cf"]), float(row["c_stock"])))
+            except (TypeError, ValueError):
+                raise ValueError(f"Ligne {reader.line_num} invalide dans {file_path}")
+    return wells
+
+
+class MasterMix:
+    """
+    Master mix partagé par les puits d'un même siRNA à la même concentration.
+
+    'result' est le calcul pour un puits; prep_factor est le nombre d'équivalents
+    puits réellement préparés (surplus et volume mort inclus).
+    """
+
+    __slots__ = ("sirna", "wells", "result", "prep_factor")
+
+    def __init__(self, sirna, wells, result, prep_factor):
+        self.sirna = sirna
+        self.wells = wells
+        self.result = result
+        self.prep_factor = prep_factor
+
+    @property
+    def is_feasible(self):
+        return self.result.is_feasible
+
+    @property
+    def v_sirna_total(self):
+        """Volume de stock de siRNA à prélever pour ce mix (µL)."""
+        return self.result.v_sirna * self.prep_factor
+
+    @property
+    def v_buffer_total(self):
+        """Volume de tampon pour ce mix (µL)."""
+        return self.result.v_buffer * self.prep_factor
+
+    @property
+    def v_mix_total(self):
+        """Volume de mix préparé (µL)."""
+        return self.result.v_mix * self.prep_factor
+
+    @property
+    def label(self):
+        return f"{self.sirna} {self.result.cf:g} nM"
+
+
+class PlatePlan:
+    """Plan de plaque calculé: master mix et totaux des réactifs."""
+
+    __slots__ = ("mixes", "overage", "dead_volume")
+
+    # Colonnes de well_rows() (volumes en µL, concentrations en nM)
+    WELL_COLUMNS = ("Puits", "siRNA", "Cf (nM)", "Stock (nM)", "Master mix", "Ci (nM)",
+                    "Source", "Source par puits (µL)", "Tampon par puits (µL)", "Mix par puits (µL)")
+
+    def __init__(self, mixes, overage, dead_volume):
+        self.mixes = mixes
+        self.overage = overage
+        self.dead_volume = dead_volume
+
+    @property
+    def infeasible(self):
+        """Master mix dont la concentration requise dépasse celle du stock."""
+        return [mix for mix in self.mixes if not mix.is_feasible]
+
+    @property
+    def n_wells(self):
+        return sum(len(mix.wells) for mix in self.mixes)
+
+    def reagent_totals(self):
+        """Renvoie le volume total de stock à prévoir pour chaque siRNA (µL), dans l'ordre du plan."""
+        totals = {}
+        for mix in self.mixes:
+            totals[mix.sirna] = totals.get(mix.sirna, 0.0) + mix.v_sirna_total
+        return totals
+
+    @property
+    def v_buffer_total(self):
+        return sum(mix.v_buffer_total for mix in self.mixes)
+
+    @property
+    def v_mix_total(self):
+        return sum(mix.v_mix_total for mix in self.mixes)
+
+    def table_rows(self, dilution_plan=None):
+        """
+        Renvoie les lignes du tableau de résultats: siRNA et tampon de chaque mix
+        (volume par puits, volume à préparer), puis les totaux par réactif.
+
+        Avec un DilutionPlan (voir models.pipetting), les dilutions intermédiaires sont
+        listées en premier et chaque mix est préparé à partir de sa source pipetable.
+        """
+        if dilution_plan is None:
+            rows = []
+            for mix in self.mixes:
+                rows.append((f"{mix.label} - siRNA", mix.result.v_sirna, mix.v_sirna_total))
+                rows.append((f"{mix.label} - Tampon", mix.result.v_buffer, mix.v_buffer_total))
+            stock_totals = self.reagent_totals()
+            v_buffer_total = self.v_buffer_total
+        else:
+            rows = dilution_plan.dilution_rows()
+            for mix, recipe in zip(self.mixes, dilution_plan.recipes):
+                if recipe is None:
+                    rows.append((f"{mix.label} - non préparable", "-", "-"))
+                    continue
+                rows.append((f"{mix.label} - {recipe.source_label}", recipe.v_source / mix.prep_factor, recipe.v_source))
+                rows.append((f"{mix.label} - Tampon", recipe.v_buffer / mix.prep_factor, recipe.v_buffer))
+            stock_totals = dilution_plan.stock_totals
+            v_buffer_total = (sum(recipe.v_buffer for recipe in dilution_plan.recipes if recipe is not None)
+                              + sum(dilution.v_diluent for dilution in dilution_plan.dilutions))
+        for sirna, total in stock_totals.items():
+            rows.append((f"Total stock {sirna}", "-", total))
+        rows.append(("Total tampon", "-", v_buffer_total))
+        rows.append(("Total mix", "-", self.v_mix_total))
+        return rows
+
+    def well_rows(self, dilution_plan=None):
+        """
+        Génère une ligne par puits (voir WELL_COLUMNS), mix par mix, pour l'export du plan.
+
+        Avec un DilutionPlan, la source de chaque mix est sa source pipetable; les mix non
+        préparables ont des volumes vides (None).
+        """
+        recipes = dilution_plan.recipes if dilution_plan is not None else [None] * len(self.mixes)
+        for mix, recipe in zip(self.mixes, recipes):
+            result = mix.result
+            if dilution_plan is None:
+                source, v_source, v_buffer = "Stock", result.v_sirna, result.v_buffer
+            elif recipe is None:
+                source, v_source, v_buffer = "Non préparable", None, None
+            else:
+                source = recipe.source_label
+                v_source = recipe.v_source / mix.prep_factor
+                v_buffer = recipe.v_buffer / mix.prep_factor
+            for well in mix.wells:
+                yield (well, mix.sirna, result.cf, result.c_stock, mix.label, result.ci_mix,
+                       source, v_source, v_buffer, result.v_mix)
+
+
+def plan_plate(wells, v_milieu, v_mix, volume_unit="µL", overage=0.1, dead_volume=0.0):
+    """
+    Regroupe les puits partageant un master mix et calcule les volumes de chaque mix.
+
+    Les puits d'un même siRNA (même stock) à la même concentration finale partagent
+    un mix; chaque mix est calculé une seule fois, pour un puits, puis multiplié par
+    le nombre d'équivalents puits préparés: n_puits * (1 + overage) + dead_volume / v_mix.
+
+    Args:
+        wells: liste de PlateWell
+        v_milieu: volume de milieu par puits (dans volume_unit)
+        v_mix: volume de mix ajouté à chaque puits (µL)
+        overage: surplus relatif préparé pour chaque mix (0.1 = 10 %)
+        dead_volume: volume mort par tube de mix (µL), non prélevable
+
+    Returns:
+        PlatePlan
+    """
+    if overage < 0 or dead_volume < 0:
+        raise ValueError("Le surplus et le volume mort doivent être positifs ou nuls")
+
+    groups = {}
+    for well in wells:
+        key = (well.sirna, well.cf, well.c_stock)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [well.well]
+        else:
+            group.append(well.well)
+
+    dead_factor = dead_volume / v_mix
+    mixes = []
+    for (sirna, cf, c_stock), names in groups.items():
+        result = MixResult.from_inputs({
+            KEY_CF: cf,
+            KEY_VOLUME_MILIEU: v_milieu,
+            KEY_VOLUME_UNIT: volume_unit,
+            KEY_VOLUME_MIX: v_mix,
+            KEY_STOCK: c_stock,
+            KEY_SAMPLES: len(names),
+        })
+        mixes.append(MasterMix(sirna, names, result, len(names) * (1 + overage) + dead_factor))
+    return PlatePlan(mixes, overage, dead_volume)
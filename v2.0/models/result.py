@@ -0,0 +1,151 @@
+# models/result.py - Résultat typé d'un calcul de mix siRNA
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+from models.units import to_microliters
+
+
+class MixResult:
+    """
+    Résultat d'un calcul de mix siRNA, conservé sous forme de nombres bruts.
+
+    Le tableau, l'historique et l'explication utilisent tous cet objet: les volumes
+    ne sont calculés qu'une fois et ne sont formatés qu'au moment de l'affichage.
+    """
+
+    __slots__ = ("cf", "v_milieu", "volume_unit", "v_milieu_ul", "v_mix", "c_stock",
+                 "n_samples", "ci_mix", "v_sirna", "v_buffer")
+
+    def __init__(self, cf, v_milieu, volume_unit, v_milieu_ul, v_mix, c_stock, n_samples,
+                 ci_mix, v_sirna, v_buffer):
+        self.cf = cf
+        self.v_milieu = v_milieu
+        self.volume_unit = volume_unit
+        self.v_milieu_ul = v_milieu_ul
+        self.v_mix = v_mix
+        self.c_stock = c_stock
+        self.n_samples = n_samples
+        self.ci_mix = ci_mix
+        self.v_sirna = v_sirna
+        self.v_buffer = v_buffer
+
+    @classmethod
+    def from_inputs(cls, inputs):
+        """
+        Effectue le calcul à partir d'un dictionnaire d'entrées validées.
+
+        Aucune vérification de faisabilité n'est faite ici (voir is_feasible).
+        """
+        cf = inputs[KEY_CF]  # Concentration finale désirée (nM)
+        v_milieu = inputs[KEY_VOLUME_MILIEU]  # Volume du milieu (µL ou mL)
+        volume_unit = inputs[KEY_VOLUME_UNIT]  # Unité de volume
+        v_mix = inputs[KEY_VOLUME_MIX]  # Volume du mix (µL)
+        c_stock = inputs[KEY_STOCK]  # Concentration du stock (nM)
+        n_samples = int(inputs[KEY_SAMPLES])  # Nombre d'échantillons
+
+        # Conversion du volume du milieu en µL
+        v_milieu_ul = to_microliters(v_milieu, volume_unit)
+
+        # Calcul de la concentration initiale du mix
+        ci_mix = (cf * v_milieu_ul) / v_mix
+
+        # Calcul du volume de siRNA stock à utiliser par échantillon
+        v_sirna = (ci_mix * v_mix) / c_stock
+
+        # Calcul du volume de tampon par échantillon
+        v_buffer = v_mix - v_sirna
+
+        return cls(cf, v_milieu, volume_unit, v_milieu_ul, v_mix, c_stock, n_samples,
+                   ci_mix, v_sirna, v_buffer)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Reconstruit un résultat à partir de to_dict()."""
+        return cls(**values)
+
+    def to_dict(self):
+        """Renvoie les valeurs brutes sous forme de dictionnaire (sérialisation JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @property
+    def is_feasible(self):
+        """Faux si la concentration requise dans le mix dépasse celle du stock."""
+        return not self.ci_mix > self.c_stock
+
+    @property
+    def v_sirna_total(self):
+        """Volume total de siRNA pour tous les échantillons (µL)."""
+        return self.v_sirna * self.n_samples
+
+    @property
+    def v_buffer_total(self):
+        """Volume total de tampon pour tous les échantillons (µL)."""
+        return self.v_buffer * self.n_samples
+
+    @property
+    def v_mix_total(self):
+        """Volume total du mix pour tous les échantillons (µL)."""
+        return self.v_mix * self.n_samples
+
+    def table_rows(self):
+        """Renvoie les lignes du tableau de résultats (composant, volume par échantillon, volume total)."""
+        return [
+            ("siRNA", self.v_sirna, self.v_sirna_total),
+            ("Tampon", self.v_buffer, self.v_buffer_total),
+            ("Mix total", self.v_mix, self.v_mix_total)
+        ]
+
+    def preparation_steps(self):
+        """Renvoie les instructions de préparation directe à partir du stock."""
+        return [
+            f"1. Dans un tube, mélanger {self.v_sirna_total:.2f} µL de solution stock de siRNA ({self.c_stock} nM)",
+            f"2. Ajouter {self.v_buffer_total:.2f} µL de tampon",
+            "3. Mélanger doucement par pipetage",
+            f"4. Ajouter {self.v_mix} µL de ce mix à chaque échantillon de milieu de culture",
+        ]
+
+    def explanation(self, instructions=None):
+        """
+        Rédige l'explication détaillée du calcul.
+
+        Args:
+            instructions: lignes des instructions de préparation (par défaut celles de
+                preparation_steps(); voir DilutionPlan.instructions pour un stock dilué)
+        """
+        if instructions is None:
+            instructions = self.preparation_steps()
+        steps = "\n".join(instructions)
+        return f"""
+Explication détaillée du calcul de mix siRNA:
+
+Valeurs d'entrée:
+- Concentration finale (Cf) de siRNA désirée dans la culture: {self.cf} nM
+- Volume du milieu de culture: {self.v_milieu} {self.volume_unit} ({self.v_milieu_ul} µL)
+- Volume final du mix à ajouter au milieu: {self.v_mix} µL
+- Concentration du stock de siRNA: {self.c_stock} nM
+- Nombre d'échantillons: {self.n_samples}
+
+Équations utilisées:
+1) Pour calculer la concentration initiale requise dans le mix (Ci):
+   Ci = (Cf * Vmilieu) / Vmix
+   Ci = ({self.cf} nM * {self.v_milieu_ul} µL) / {self.v_mix} µL
+   Ci = {self.ci_mix:.2f} nM
+
+2) Pour calculer le volume de siRNA stock nécessaire:
+   VsiRNA = (Ci * Vmix) / Cstock
+   VsiRNA = ({self.ci_mix:.2f} nM * {self.v_mix} µL) / {self.c_stock} nM
+   VsiRNA = {self.v_sirna:.2f} µL par échantillon
+   Volume total de siRNA pour {self.n_samples} échantillon(s): {self.v_sirna_total:.2f} µL
+
+3) Pour calculer le volume de tampon nécessaire:
+   Vtampon = Vmix - VsiRNA
+   Vtampon = {self.v_mix} µL - {self.v_sirna:.2f} µL
+   Vtampon = {self.v_buffer:.2f} µL par échantillon
+   Volume total de tampon pour {self.n_samples} échantillon(s): {self.v_buffer_total:.2f} µL
+
+4) Volume total du mix pour {self.n_samples} échantillon(s):
+   Vmix_total = {self.v_mix} µL * {self.n_samples} = {self.v_mix_total:.2f} µL
+
+Instructions pour la préparation:
+{steps}
+
+La concentration finale de siRNA dans chaque échantillon sera de {self.cf} nM.
+"""
@@ -0,0 +1,267 @@
+# models/schema.py - Schéma et validation des paramètres d'entrée
+from math import isnan
+
+from models.units import (CONCENTRATION_CONVERSIONS, CONCENTRATION_UNIT, CONCENTRATION_UNITS, VOLUME_CONVERSIONS,
+                          VOLUME_UNIT, VOLUME_UNITS)
+
+KEY_CF = "Cf de siRNA désiré"
+KEY_VOLUME_MILIEU = "Volume du milieu"
+KEY_VOLUME_UNIT = "volume_unit"
+KEY_VOLUME_MIX = "Volume final du mix à mettre dans le milieu de culture"
+KEY_STOCK = "Concentration du stock de siRNA"
+KEY_SAMPLES = "Nombre d'échantillon(s)"
+KEY_CF_UNIT = "cf_unit"
+KEY_VOLUME_MIX_UNIT = "v_mix_unit"
+KEY_STOCK_UNIT = "c_stock_unit"
+
+# Champs numériques dans l'ordre du formulaire: (clé, libellé affiché, type)
+FIELDS = (
+    (KEY_CF, "Cf de siRNA désiré", float),
+    (KEY_VOLUME_MILIEU, "Volume du milieu", float),
+    (KEY_VOLUME_MIX, "Volume final du mix à mettre dans le milieu de culture", float),
+    (KEY_STOCK, "Concentration du stock de siRNA", float),
+    (KEY_SAMPLES, "Nombre d'échantillon(s)", int),
+)
+
+# Champs saisis avec une unité au choix, ramenés à l'unité de référence (nM, µL) par
+# la validation: clé -> (clé de l'unité, unités acceptées, unité de référence, table de conversion)
+# Le volume du milieu garde son unité, affichée dans l'explication.
+FIELD_UNITS = {
+    KEY_CF: (KEY_CF_UNIT, CONCENTRATION_UNITS, CONCENTRATION_UNIT, CONCENTRATION_CONVERSIONS),
+    KEY_VOLUME_MIX: (KEY_VOLUME_MIX_UNIT, VOLUME_UNITS, VOLUME_UNIT, VOLUME_CONVERSIONS),
+    KEY_STOCK: (KEY_STOCK_UNIT, CONCENTRATION_UNITS, CONCENTRATION_UNIT, CONCENTRATION_CONVERSIONS),
+}
+
+# Messages d'erreur de la validation
+MESSAGE_EMPTY = "Erreur : le champ '{label}' est vide."
+MESSAGE_NOT_NUMBER = "Erreur : le champ '{label}' n'est pas un nombre valide."
+MESSAGE_NOT_INTEGER = "Erreur : le champ '{label}' n'est pas un nombre entier valide."
+MESSAGE_NOT_POSITIVE = "Erreur : le champ '{label}' doit être supérieur à 0."
+MESSAGE_UNKNOWN_UNIT = "Erreur : unité inconnue '{unit}' pour le champ '{label}'."
+MESSAGE_UNKNOWN_VOLUME_UNIT = "Erreur : unité de volume inconnue '{unit}'."
+
+# Noms courts acceptés dans les fichiers de données (CSV)
+ALIASES = {
+    "cf": KEY_CF,
+    "v_milieu": KEY_VOLUME_MILIEU,
+    "volume_unit": KEY_VOLUME_UNIT,
+    "v_mix": KEY_VOLUME_MIX,
+    "c_stock": KEY_STOCK,
+    "n_samples": KEY_SAMPLES,
+    "cf_unit": KEY_CF_UNIT,
+    "v_mix_unit": KEY_VOLUME_MIX_UNIT,
+    "c_stock_unit": KEY_STOCK_UNIT,
+}
+
+
+def canonical_key(name):
+    """Renvoie la clé du schéma correspondant à un nom de colonne, ou None si inconnu."""
+    name = name.strip()
+    if name in ALIASES:
+        return ALIASES[name]
+    if name in ALIASES.values():
+        return name
+    return None
+
+
+def parse_count(value):
+    """
+    Convertit un nombre d'échantillons en entier: '3', 3, '3.0' et 3.0 sont acceptés.
+
+    Raises:
+        ValueError: si la valeur n'est pas un nombre entier
+    """
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        raise ValueError(f"nombre non entier: {value}")
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"nombre non entier: {value}") from None
+        return int(number)
+
+
+# Conversion du texte saisi selon le type du champ (voir FIELDS)
+PARSERS = {float: float, int: parse_count}
+
+
+class InputValidator:
+    """
+    Validateur des paramètres d'entrée, préparé une fois et appliqué colonne par colonne.
+
+    Chaque colonne est convertie et vérifiée en une passe de fonctions natives (map, min);
+    la vérification cellule par cellule n'a lieu que pour les colonnes contenant au moins
+    une valeur invalide. Toutes les erreurs
+    sont relevées, pour chaque ligne et chaque champ. Le formulaire, les fichiers de
+    configuration et le traitement par lots partagent ce validateur (voir get_validator).
+    """
+
+    def __init__(self, exclude=()):
+        """
+        Args:
+            exclude: clés des champs à ignorer (champ résolu par un calcul inverse)
+        """
+        # Champs compilés: (clé, libellé, type, conversion, message si non numérique, unité ou None)
+        self.fields = [
+            (key, label_text, field_type, PARSERS[field_type],
+             MESSAGE_NOT_INTEGER if field_type is int else MESSAGE_NOT_NUMBER, FIELD_UNITS.get(key))
+            for key, label_text, field_type in FIELDS if key not in exclude
+        ]
+        # Colonnes lues par validate_columns
+        self.keys = [key for key, *_ in self.fields]
+        self.keys += [unit[0] for *_, unit in self.fields if unit is not None]
+        self.keys.append(KEY_VOLUME_UNIT)
+
+    def validate(self, raw_values):
+        """
+        Valide les valeurs d'un formulaire ou d'un fichier de configuration.
+
+        Args:
+            raw_values: Dictionnaire clé -> texte saisi, avec éventuellement 'volume_unit'
+                (µL par défaut) et les unités de FIELD_UNITS (nM ou µL par défaut)
+
+        Returns:
+            Un dictionnaire des valeurs converties (concentrations en nM, volume du mix en µL),
+            ou les messages de toutes les erreurs (str, un par ligne)
+        """
+        values, errors = self.validate_columns({key: [raw_values.get(key)] for key in self.keys}, 1)
+        if errors:
+            return "\n".join(message for _, _, message in errors)
+        return {key: column[0] for key, column in values.items()}
+
+    def validate_columns(self, columns, size):
+        """
+        Valide un ensemble de lignes, colonne par colonne.
+
+        Args:
+            columns: dictionnaire clé -> liste de size valeurs brutes (textes ou nombres);
+                une colonne absente est vide (ou à l'unité par défaut pour les unités)
+            size: nombre de lignes
+
+        Returns:
+            Tuple (values, errors):
+                - values: clé -> liste des valeurs converties, None pour une valeur invalide,
+                  pour chaque champ validé et pour 'volume_unit'
+                - errors: liste de tuples (indice de ligne, clé, message), champ par champ
+        """
+        values = {}
+        errors = []
+        for key, label_text, field_type, parse, not_number, unit in self.fields:
+            column = columns.get(key)
+            if column is None:
+                column = [None] * size
+            parsed = self._parse_column(column, key, label_text, field_type, parse, not_number, errors)
+            if unit is not None:
+                self._convert_column(parsed, columns.get(unit[0]), label_text, unit, errors)
+            values[key] = parsed
+
+        volume_units = columns.get(KEY_VOLUME_UNIT)
+        if volume_units is None:
+            volume_units = [VOLUME_UNIT] * size
+        else:
+            distinct = set(volume_units)
+            if None in distinct or "" in distinct:
+                volume_units = [unit or VOLUME_UNIT for unit in volume_units]
+                distinct = set(volume_units)
+            for unit in distinct.difference(VOLUME_UNITS):
+                message = MESSAGE_UNKNOWN_VOLUME_UNIT.format(unit=unit)
+                errors.extend((row, KEY_VOLUME_UNIT, message)
+                              for row, value in enumerate(volume_units) if value == unit)
+        values[KEY_VOLUME_UNIT] = volume_units
+        return values, errors
+
+    @staticmethod
+    def errors_by_row(errors):
+        """Regroupe les erreurs de validate_columns: indice de ligne -> messages, dans l'ordre des champs."""
+        rows = {}
+        for row, _, message in errors:
+            if row in rows:
+                rows[row].append(message)
+            else:
+                rows[row] = [message]
+        return rows
+
+    def _parse_column(self, column, key, label_text, field_type, parse, not_number, errors):
+        """Convertit une colonne et vérifie que ses valeurs sont > 0 (None pour une valeur invalide)."""
+        try:
+            if field_type is int:
+                # Passage par str: '3.0' ou 3.7 échouent ici et sont traités par parse_count
+                parsed = list(map(int, map(str, column)))
+            else:
+                parsed = list(map(field_type, column))
+        except (TypeError, ValueError):
+            pass
+        else:
+            # min() ignore NaN selon sa position: NaN est recherché à part
+            if not parsed or (min(parsed) > 0 and (field_type is int or not any(map(isnan, parsed)))):
+                return parsed
+
+        # Au moins une valeur invalide: vérification cellule par cellule
+        parsed = []
+        for row, value in enumerate(column):
+            try:
+                number = parse(value)
+            except (TypeError, ValueError):
+                message = MESSAGE_EMPTY if value is None or str(value).strip() == "" else not_number
+            else:
+                if number > 0:
+                    parsed.append(number)
+                    continue
+                message = MESSAGE_NOT_POSITIVE
+            errors.append((row, key, message.format(label=label_text)))
+            parsed.append(None)
+        return parsed
+
+    def _convert_column(self, parsed, units_column, label_text, unit, errors):
+        """Ramène les valeurs d'une colonne à l'unité de référence, une unité distincte à la fois."""
+        if units_column is None:
+            return
+        unit_key, units, reference, conversions = unit
+        for from_unit in set(units_column):
+            if not from_unit or from_unit == reference:
+                continue
+            rows = [row for row, value in enumerate(units_column) if value == from_unit]
+            if from_unit in units:
+                # Même calcul que models.units.convert_volume / convert_concentration
+                multiplier, divisor = conversions[(from_unit, reference)]
+                for row in rows:
+                    value = parsed[row]
+                    if value is not None:
+                        parsed[row] = value * multiplier / divisor
+            else:
+                message = MESSAGE_UNKNOWN_UNIT.format(unit=from_unit, label=label_text)
+                for row in rows:
+                    errors.append((row, unit_key, message))
+                    parsed[row] = None
+
+
+# Validateurs préparés, par ensemble de champs ignorés
+_validators = {}
+
+
+def get_validator(exclude=()):
+    """Renvoie le validateur (préparé une seule fois) ignorant les champs de exclude."""
+    exclude = frozenset(exclude)
+    validator = _validators.get(exclude)
+    if validator is None:
+        validator = _validators[exclude] = InputValidator(exclude)
+    return validator
+
+
+def validate_inputs(raw_values, exclude=()):
+    """
+    Vérifie que tous les champs sont remplis, numériques et > 0 (voir InputValidator.validate).
+
+    Args:
+        raw_values: Dictionnaire clé -> texte saisi, avec éventuellement 'volume_unit'
+            (µL par défaut) et les unités de FIELD_UNITS (nM ou µL par défaut)
+        exclude: clés des champs à ignorer (champ résolu par un calcul inverse)
+
+    Returns:
+        Un dictionnaire des valeurs converties (concentrations en nM, volume du mix en µL),
+        ou les messages de toutes les erreurs (str, un par ligne)
+    """
+    return get_validator(exclude).validate(raw_values)
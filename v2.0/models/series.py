@@ -0,0 +1,66 @@
+# models/series.py - Séries de dilutions (dose-réponse) calculées avec le moteur vectorisé
+import numpy as np
+
+from models.batch import calculate_mix_batch
+
+
+def dilution_series(top_cf, dilution_factor, n_points):
+    """Renvoie les concentrations finales top_cf, top_cf / facteur, ... (n_points valeurs)."""
+    if dilution_factor <= 1:
+        raise ValueError("Le facteur de dilution doit être supérieur à 1")
+    if n_points < 1:
+        raise ValueError("La série doit contenir au moins un point")
+    return top_cf / np.power(float(dilution_factor), np.arange(n_points))
+
+
+def calculate_series(top_cf, dilution_factor, n_points, v_milieu, v_mix, c_stock, n_samples, volume_unit="µL"):
+    """
+    Calcule tous les points d'une série de dilutions en une passe.
+
+    Returns:
+        Dictionnaire de tableaux numpy (un élément par point): les colonnes de
+        models.batch.calculate_mix_batch, ainsi que 'cf', 'c_stock' et 'n_samples'
+    """
+    cf = dilution_series(top_cf, dilution_factor, n_points)
+    data = calculate_mix_batch(cf, v_milieu, v_mix, c_stock, n_samples, volume_unit)
+    data['cf'] = cf
+    data['c_stock'] = np.broadcast_to(np.asarray(c_stock, dtype=np.float64), cf.shape)
+    data['n_samples'] = np.broadcast_to(np.asarray(n_samples).astype(np.int64), cf.shape)
+    return data
+
+
+def series_mixes(data):
+    """
+    Renvoie les mix des points faisables pour PipettingSolver.solve(), et leurs indices.
+
+    Tous les points partagent le même stock: leurs dilutions intermédiaires sont communes.
+    """
+    indices = np.flatnonzero(data['feasible']).tolist()
+    columns = [data[name][indices].tolist() for name in ('c_stock', 'ci_mix', 'v_mix_total', 'n_samples')]
+    return [("siRNA", *values) for values in zip(*columns)], indices
+
+
+def series_table_rows(data, dilution_plan, indices):
+    """
+    Renvoie les lignes du tableau de résultats pour une série: dilutions intermédiaires
+    communes, puis source et tampon de chaque point.
+
+    Args:
+        data: résultat de calculate_series
+        dilution_plan: DilutionPlan des points faisables (voir series_mixes)
+        indices: indices des points faisables, dans l'ordre de dilution_plan.recipes
+    """
+    recipe_of_point = dict(zip(indices, dilution_plan.recipes))
+    rows = dilution_plan.dilution_rows()
+    for i, cf in enumerate(data['cf'].tolist()):
+        label = f"Point {i + 1} ({cf:g} nM)"
+        if i not in recipe_of_point:
+            rows.append((f"{label} - non faisable", "-", "-"))
+            continue
+        recipe = recipe_of_point[i]
+        if recipe is None:
+            rows.append((f"{label} - volume non pipetable", "-", "-"))
+            continue
+        rows.append((f"{label} - {recipe.source_label}", recipe.v_source / recipe.n_samples, recipe.v_source))
+        rows.append((f"{label} - Tampon", recipe.v_buffer / recipe.n_samples, recipe.v_buffer))
+    return rows
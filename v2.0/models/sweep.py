@@ -0,0 +1,68 @@
+# models/sweep.py - Carte de faisabilité: balayage vectorisé d'une grille de paramètres
+import numpy as np
+
+from models.batch import calculate_mix_batch
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+
+# Paramètres pouvant servir d'axe: clé du schéma -> libellé
+SWEEP_AXES = {
+    KEY_CF: "Cf (nM)",
+    KEY_VOLUME_MIX: "Volume du mix (µL)",
+    KEY_STOCK: "Stock (nM)",
+}
+
+# États d'un point de la grille
+STATUS_INFEASIBLE = 0  # ci_mix > c_stock
+STATUS_DILUTION = 1  # faisable, mais volume de stock inférieur au volume pipetable minimal
+STATUS_DIRECT = 2  # faisable directement à partir du stock
+
+
+def axis_values(low, high, points, log=False):
+    """Renvoie les valeurs d'un axe: points valeurs de low à high, régulières ou logarithmiques."""
+    if low <= 0 or high <= low:
+        raise ValueError("Les bornes d'un axe doivent vérifier 0 < min < max")
+    if points < 2:
+        raise ValueError("Un axe doit contenir au moins deux points")
+    if log:
+        return np.geomspace(low, high, points)
+    return np.linspace(low, high, points)
+
+
+def feasibility_grid(inputs, x_key, x_values, y_key, y_values, min_volume):
+    """
+    Évalue la faisabilité et la consommation de stock sur une grille à deux dimensions.
+
+    Les paramètres qui ne sont pas des axes gardent la valeur de inputs.
+
+    Args:
+        inputs: Dictionnaire d'entrées validées (voir SiRNACalculation.calculate_mix)
+        x_key, y_key: clés des paramètres en abscisse et en ordonnée (voir SWEEP_AXES)
+        x_values, y_values: valeurs des axes (voir axis_values)
+        min_volume: plus petit volume pipetable (µL)
+
+    Returns:
+        Dictionnaire de tableaux numpy de forme (len(y_values), len(x_values)):
+            - 'ci_mix', 'v_sirna_total': concentration du mix (nM) et volume de stock (µL)
+            - 'status': STATUS_INFEASIBLE, STATUS_DILUTION ou STATUS_DIRECT
+        ainsi que les axes 'x' et 'y'
+    """
+    if x_key == y_key or x_key not in SWEEP_AXES or y_key not in SWEEP_AXES:
+        raise ValueError("Les axes de la carte doivent être deux paramètres différents")
+
+    params = {key: inputs[key] for key in SWEEP_AXES}
+    params[x_key] = np.asarray(x_values, dtype=np.float64)[np.newaxis, :]
+    params[y_key] = np.asarray(y_values, dtype=np.float64)[:, np.newaxis]
+
+    data = calculate_mix_batch(params[KEY_CF], inputs[KEY_VOLUME_MILIEU], params[KEY_VOLUME_MIX],
+                               params[KEY_STOCK], inputs[KEY_SAMPLES], inputs[KEY_VOLUME_UNIT])
+
+    status = np.full(data['ci_mix'].shape, STATUS_DIRECT, dtype=np.uint8)
+    status[data['v_sirna_total'] < min_volume] = STATUS_DILUTION
+    status[~data['feasible']] = STATUS_INFEASIBLE
+    return {
+        'x': np.asarray(x_values),
+        'y': np.asarray(y_values),
+        'ci_mix': data['ci_mix'],
+        'v_sirna_total': data['v_sirna_total'],
+        'status': status,
+    }
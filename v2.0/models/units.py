@@ -0,0 +1,93 @@
+# models/units.py - Gestion des unités de concentration et de volume
+# Unités acceptées et puissance de dix par rapport à l'unité de référence (nM, µL)
+CONCENTRATION_UNITS = ("pM", "nM", "µM")
+CONCENTRATION_EXPONENTS = {"pM": -3, "nM": 0, "µM": 3}
+CONCENTRATION_UNIT = "nM"
+
+VOLUME_UNITS = ("nL", "µL", "mL")
+VOLUME_EXPONENTS = {"nL": -3, "µL": 0, "mL": 3}
+VOLUME_UNIT = "µL"
+
+
+def _conversion_table(exponents):
+    """
+    Précalcule la conversion de chaque couple d'unités sous forme (multiplicateur, diviseur).
+
+    Multiplier puis diviser par des puissances de dix exactes évite les erreurs
+    d'arrondi d'un facteur 0.001 (500 nL donnent exactement 0.5 µL).
+    """
+    return {
+        (from_unit, to_unit): (10.0 ** max(from_exp - to_exp, 0), 10.0 ** max(to_exp - from_exp, 0))
+        for from_unit, from_exp in exponents.items()
+        for to_unit, to_exp in exponents.items()
+    }
+
+
+CONCENTRATION_CONVERSIONS = _conversion_table(CONCENTRATION_EXPONENTS)
+VOLUME_CONVERSIONS = _conversion_table(VOLUME_EXPONENTS)
+
+# Facteurs de conversion vers l'unité de référence
+CONCENTRATION_FACTORS = {unit: m / d for (unit, to_unit), (m, d) in CONCENTRATION_CONVERSIONS.items()
+                         if to_unit == CONCENTRATION_UNIT}
+VOLUME_FACTORS = {unit: m / d for (unit, to_unit), (m, d) in VOLUME_CONVERSIONS.items()
+                  if to_unit == VOLUME_UNIT}
+
+
+def _convert(value, from_unit, to_unit, conversions, kind):
+    """Convertit une valeur à l'aide d'une table de conversion précalculée."""
+    try:
+        multiplier, divisor = conversions[(from_unit, to_unit)]
+    except KeyError:
+        unknown = from_unit if (from_unit, from_unit) not in conversions else to_unit
+        raise ValueError(f"Unité de {kind} inconnue: {unknown}") from None
+    return value * multiplier / divisor
+
+
+def volume_factor(unit):
+    """Renvoie le facteur de conversion d'une unité de volume vers le µL."""
+    try:
+        return VOLUME_FACTORS[unit]
+    except KeyError:
+        raise ValueError(f"Unité de volume inconnue: {unit}") from None
+
+
+def concentration_factor(unit):
+    """Renvoie le facteur de conversion d'une unité de concentration vers le nM."""
+    try:
+        return CONCENTRATION_FACTORS[unit]
+    except KeyError:
+        raise ValueError(f"Unité de concentration inconnue: {unit}") from None
+
+
+def to_microliters(value, unit):
+    """Convertit un volume exprimé dans l'unité donnée en µL."""
+    return _convert(value, unit, VOLUME_UNIT, VOLUME_CONVERSIONS, "volume")
+
+
+def to_nanomolar(value, unit):
+    """Convertit une concentration exprimée dans l'unité donnée en nM."""
+    return _convert(value, unit, CONCENTRATION_UNIT, CONCENTRATION_CONVERSIONS, "concentration")
+
+
+def convert_volume(value, from_unit, to_unit):
+    """Convertit un volume d'une unité vers une autre."""
+    return _convert(value, from_unit, to_unit, VOLUME_CONVERSIONS, "volume")
+
+
+def convert_concentration(value, from_unit, to_unit):
+    """Convertit une concentration d'une unité vers une autre."""
+    return _convert(value, from_unit, to_unit, CONCENTRATION_CONVERSIONS, "concentration")
+
+
+# Décimales affichées pour un volume selon son unité
+VOLUME_DECIMALS = {"nL": 0, "µL": 2, "mL": 4}
+
+
+def format_volume(value, unit):
+    """Formate un volume exprimé en µL dans l'unité d'affichage donnée."""
+    return f"{convert_volume(value, VOLUME_UNIT, unit):.{VOLUME_DECIMALS[unit]}f}"
+
+
+def format_quantity(value):
+    """Formate une valeur convertie sans bruit d'arrondi ni troncature (0.5 reste 0.5)."""
+    return f"{value:.10g}"
@@ -44,4 +44,53 @@ class ActionFrame(ttk.Frame):
             self, text="Charger config",
             command=self.controller.load_config
         )
-        self.btn_load.grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
\ No newline at end of file
+        self.btn_load.grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
+
+        # Calcul d'un fichier CSV en arrière-plan
+        self.btn_batch = ttk.Button(
+            self, text="Calcul par lots (CSV)",
+            command=self.controller.run_batch_file
+        )
+        self.btn_batch.grid(row=2, column=0, padx=5, sticky=tk.EW)
+
+        # Temps d'exécution des phases du calcul
+        self.btn_diagnostics = ttk.Button(
+            self, text="Diagnostics",
+            command=self.controller.show_diagnostics
+        )
+        self.btn_diagnostics.grid(row=2, column=1, padx=5, sticky=tk.EW)
+
+        # Plan de plaque (plusieurs siRNA et concentrations)
+        self.btn_plate = ttk.Button(
+            self, text="Plan de plaque",
+            command=self.controller.show_plate_planner
+        )
+        self.btn_plate.grid(row=3, column=0, padx=5, pady=(5, 0), sticky=tk.EW)
+
+        # Série de dilutions à partir de la Cf désirée
+        self.btn_series = ttk.Button(
+            self, text="Calculer la série",
+            command=self.controller.perform_series_calculation
+        )
+        self.btn_series.grid(row=3, column=1, padx=5, pady=(5, 0), sticky=tk.EW)
+
+        # Carte de faisabilité sur une grille de paramètres
+        self.btn_feasibility = ttk.Button(
+            self, text="Carte de faisabilité",
+            command=self.controller.show_feasibility_map
+        )
+        self.btn_feasibility.grid(row=4, column=0, padx=5, pady=(5, 0), sticky=tk.EW)
+
+        # Import et calcul de toutes les configurations d'un dossier
+        self.btn_import_folder = ttk.Button(
+            self, text="Importer un dossier de configs",
+            command=self.controller.import_config_directory
+        )
+        self.btn_import_folder.grid(row=4, column=1, padx=5, pady=(5, 0), sticky=tk.EW)
+
+        # Inventaire des lots de stock
+        self.btn_inventory = ttk.Button(
+            self, text="Inventaire des stocks",
+            command=self.controller.show_inventory
+        )
+        self.btn_inventory.grid(row=5, column=0, columnspan=2, padx=5, pady=(5, 0), sticky=tk.EW)
\ No newline at end of file
@@ -0,0 +1,111 @@
+# ui/diagnostics_window.py - Fenêtre des temps d'exécution des phases du calcul
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Fenêtre affichant les percentiles des durées mesurées par le SpanTimer de l'application."""
+
+    # Colonnes du tableau: (identifiant, titre, largeur)
+    COLUMNS = (
+        ("span", "Phase", 170),
+        ("count", "Mesures", 70),
+        ("p50", "p50 (ms)", 80),
+        ("p90", "p90 (ms)", 80),
+        ("p99", "p99 (ms)", 80),
+        ("max", "Max (ms)", 80),
+    )
+
+    # Intervalle de rafraîchissement automatique
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = controller.logger
+        self.timer = controller.timer
+
+        self.title("Diagnostics")
+        self.geometry("620x360")
+        self.minsize(500, 250)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        """Crée l'interrupteur de mesure, le tableau des durées et les boutons."""
+        self.enabled = tk.BooleanVar(value=self.timer.enabled)
+        chk_enabled = ttk.Checkbutton(self, text="Mesurer les temps d'exécution",
+                                      variable=self.enabled, command=self.on_toggle)
+        chk_enabled.grid(row=0, column=0, padx=10, pady=(10, 5), sticky=tk.W)
+
+        frame = ttk.Frame(self)
+        frame.grid(row=1, column=0, padx=10, sticky=tk.NSEW)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(frame, columns=[name for name, _, _ in self.COLUMNS],
+                                 show="headings", height=8)
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor="w" if name == "span" else "e")
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        # Compteurs du cache des résultats
+        self.label_cache = ttk.Label(self, text="", anchor="w")
+        self.label_cache.grid(row=2, column=0, padx=10, pady=5, sticky=tk.W)
+
+        buttons = ttk.Frame(self)
+        buttons.grid(row=3, column=0, padx=10, pady=(0, 10), sticky=tk.EW)
+        for column in range(3):
+            buttons.columnconfigure(column, weight=1)
+        ttk.Button(buttons, text="Réinitialiser", command=self.reset).grid(row=0, column=0, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Exporter JSON", command=self.export_json).grid(row=0, column=1, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Fermer", command=self.destroy).grid(row=0, column=2, padx=5, sticky=tk.EW)
+
+    def on_toggle(self):
+        """Active ou désactive la mesure."""
+        self.timer.enabled = self.enabled.get()
+        self.logger.info("Mesure des temps d'exécution %s", "activée" if self.timer.enabled else "désactivée")
+
+    def refresh(self):
+        """Met à jour le tableau et les compteurs, puis se reprogramme tant que la fenêtre est ouverte."""
+        self.tree.delete(*self.tree.get_children())
+        for name, stats in sorted(self.timer.summary().items()):
+            self.tree.insert("", tk.END, values=(
+                name, stats['count'],
+                f"{stats['p50']:.3f}", f"{stats['p90']:.3f}", f"{stats['p99']:.3f}", f"{stats['max']:.3f}"
+            ))
+
+        cache = self.controller.result_cache.stats()
+        self.label_cache.configure(
+            text=f"Cache des résultats: {cache['size']}/{cache['max_size']} entrée(s), "
+                 f"{cache['hits']} succès ({cache['disk_hits']} sur disque), {cache['misses']} échec(s)"
+        )
+        self.after(self.REFRESH_INTERVAL_MS, self.refresh)
+
+    def reset(self):
+        """Oublie les durées mesurées."""
+        self.timer.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def export_json(self):
+        """Enregistre les statistiques dans un fichier JSON."""
+        file_path = self.controller.file_ops.get_save_file_path("Exporter les diagnostics",
+                                                                filetypes=[("Fichier JSON", "*.json"),
+                                                                           ("Tous les fichiers", "*.*")])
+        if not file_path:
+            return
+        try:
+            self.timer.dump_json(file_path, extra={'cache': self.controller.result_cache.stats()})
+            self.logger.info(f"Diagnostics exportés dans {file_path}")
+        except OSError as e:
+            self.logger.error(f"Erreur lors de l'export des diagnostics: {str(e)}", exc_info=True)
+            messagebox.showerror("Erreur", f"Impossible d'exporter les diagnostics: {str(e)}", parent=self)
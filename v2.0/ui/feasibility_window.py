@@ -0,0 +1,280 @@
+# ui/feasibility_window.py - Carte de faisabilité (heatmap) sur une grille de paramètres
+import math
+import tkinter as tk
+from tkinter import ttk
+
+from ui.custom_widgets import SelectableLabel
+from models.schema import KEY_CF, KEY_STOCK, KEY_VOLUME_MIX
+from models.sweep import SWEEP_AXES, STATUS_DILUTION, STATUS_DIRECT, STATUS_INFEASIBLE, axis_values
+
+
+class FeasibilityWindow(tk.Toplevel):
+    """Fenêtre affichant la région faisable (ou la consommation de stock) sur une grille de deux paramètres."""
+
+    # Couples d'axes proposés: libellé -> (abscisse, ordonnée)
+    AXIS_PAIRS = {
+        "Volume du mix × Cf": (KEY_VOLUME_MIX, KEY_CF),
+        "Stock × Cf": (KEY_STOCK, KEY_CF),
+        "Volume du mix × Stock": (KEY_VOLUME_MIX, KEY_STOCK),
+    }
+
+    # Bornes par défaut des axes: (min, max, logarithmique)
+    DEFAULT_RANGES = {
+        KEY_CF: ("0.01", "100", True),
+        KEY_VOLUME_MIX: ("1", "500", False),
+        KEY_STOCK: ("100", "100000", True),
+    }
+
+    DISPLAY_MODES = ("Faisabilité", "Volume de stock")
+
+    # Couleurs des états (RVB)
+    STATUS_COLORS = {
+        STATUS_INFEASIBLE: (215, 70, 70),
+        STATUS_DILUTION: (240, 175, 60),
+        STATUS_DIRECT: (80, 170, 95),
+    }
+
+    STATUS_LABELS = {
+        STATUS_INFEASIBLE: "non faisable",
+        STATUS_DILUTION: "faisable avec dilution intermédiaire",
+        STATUS_DIRECT: "faisable directement",
+    }
+
+    MAX_POINTS = 1000
+
+    # Zone de dessin et marges pour les graduations
+    CANVAS_WIDTH = 680
+    CANVAS_HEIGHT = 500
+    MARGIN_LEFT = 70
+    MARGIN_BOTTOM = 40
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = controller.logger
+
+        # Grille affichée et correspondance pixels -> cellules
+        self.grid_data = None
+        self.image = None
+        self.display_step = 1
+        self.display_zoom = 1
+        self.axes = None
+
+        self.title("Carte de faisabilité")
+        self.geometry("780x760")
+        self.minsize(700, 700)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Crée les paramètres de la grille, la zone de dessin et la légende."""
+        params = ttk.Frame(self, padding="10")
+        params.grid(row=0, column=0, sticky=tk.EW)
+
+        ttk.Label(params, text="Axes (abscisse × ordonnée) :").grid(row=0, column=0, sticky=tk.W, pady=3)
+        self.axis_pair = tk.StringVar(value=next(iter(self.AXIS_PAIRS)))
+        ttk.Combobox(params, textvariable=self.axis_pair, values=list(self.AXIS_PAIRS),
+                     state="readonly", width=24).grid(row=0, column=1, columnspan=3, sticky=tk.W, pady=3)
+
+        self.range_entries = {}
+        self.log_scales = {}
+        for row, (key, label) in enumerate(SWEEP_AXES.items(), start=1):
+            low, high, log = self.DEFAULT_RANGES[key]
+            ttk.Label(params, text=f"{label} de").grid(row=row, column=0, sticky=tk.W, pady=3)
+            entry_low = ttk.Entry(params, width=10)
+            entry_low.insert(0, low)
+            entry_low.grid(row=row, column=1, padx=5, pady=3)
+            ttk.Label(params, text="à").grid(row=row, column=2)
+            entry_high = ttk.Entry(params, width=10)
+            entry_high.insert(0, high)
+            entry_high.grid(row=row, column=3, padx=5, pady=3)
+            self.log_scales[key] = tk.BooleanVar(value=log)
+            ttk.Checkbutton(params, text="logarithmique", variable=self.log_scales[key]).grid(
+                row=row, column=4, padx=5, pady=3, sticky=tk.W)
+            self.range_entries[key] = (entry_low, entry_high)
+
+        ttk.Label(params, text="Points par axe :").grid(row=4, column=0, sticky=tk.W, pady=3)
+        self.entry_points = ttk.Entry(params, width=10)
+        self.entry_points.insert(0, "500")
+        self.entry_points.grid(row=4, column=1, padx=5, pady=3)
+
+        ttk.Label(params, text="Affichage :").grid(row=5, column=0, sticky=tk.W, pady=3)
+        self.display_mode = tk.StringVar(value=self.DISPLAY_MODES[0])
+        combobox_mode = ttk.Combobox(params, textvariable=self.display_mode, values=list(self.DISPLAY_MODES),
+                                     state="readonly", width=24)
+        combobox_mode.grid(row=5, column=1, columnspan=3, sticky=tk.W, pady=3)
+        combobox_mode.bind("<<ComboboxSelected>>", lambda e: self.render())
+
+        ttk.Button(params, text="Calculer la carte", command=self.compute).grid(
+            row=6, column=0, columnspan=5, pady=(5, 0), sticky=tk.EW)
+
+        self.canvas = tk.Canvas(self, width=self.CANVAS_WIDTH, height=self.CANVAS_HEIGHT,
+                                background="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, padx=10, sticky=tk.NSEW)
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Button-1>", self.on_click)
+
+        self.label_info = SelectableLabel(self, text="Survoler la carte pour lire les valeurs; "
+                                                     "cliquer pour les reporter dans le formulaire.")
+        self.label_info.grid(row=2, column=0, padx=10, pady=5, sticky=tk.EW)
+
+        self.label_error = SelectableLabel(self, text="")
+        self.label_error.grid(row=3, column=0, padx=10, pady=(0, 10), sticky=tk.EW)
+
+    def read_axes(self):
+        """
+        Lit les axes demandés.
+
+        Returns:
+            Tuple (clé x, valeurs x, clé y, valeurs y), ou un message d'erreur (str)
+        """
+        x_key, y_key = self.AXIS_PAIRS[self.axis_pair.get()]
+        try:
+            points = int(self.entry_points.get())
+        except ValueError:
+            return "Erreur : le nombre de points n'est pas un nombre entier valide."
+        if not 2 <= points <= self.MAX_POINTS:
+            return f"Erreur : le nombre de points doit être compris entre 2 et {self.MAX_POINTS}."
+
+        values = {}
+        for key in (x_key, y_key):
+            entry_low, entry_high = self.range_entries[key]
+            try:
+                values[key] = axis_values(float(entry_low.get()), float(entry_high.get()), points,
+                                          log=self.log_scales[key].get())
+            except ValueError:
+                return f"Erreur : bornes invalides pour '{SWEEP_AXES[key]}' (0 < min < max)."
+        return x_key, values[x_key], y_key, values[y_key]
+
+    def compute(self):
+        """Calcule la grille à partir du formulaire principal (paramètres hors axes) et l'affiche."""
+        input_values = self.controller.input_frame.get_validated_inputs()
+        if isinstance(input_values, str):
+            self.label_error.update_text(input_values, "red")
+            return
+        limits_error = self.controller.apply_pipetting_limits()
+        if limits_error is not None:
+            self.label_error.update_text(limits_error, "red")
+            return
+        axes = self.read_axes()
+        if isinstance(axes, str):
+            self.label_error.update_text(axes, "red")
+            return
+
+        with self.controller.timer.span("sweep_feasibility"):
+            result = self.controller.calculation_model.sweep_feasibility(input_values, *axes)
+        if not result['success']:
+            self.label_error.update_text(result['error'], "red")
+            return
+
+        self.label_error.update_text("", "red")
+        self.grid_data = result['grid']
+        self.axes = (axes[0], axes[2])
+        self.render()
+
+    def render(self):
+        """Dessine la grille sous forme d'image (une seule image PPM construite avec numpy)."""
+        if self.grid_data is None:
+            return
+        # Import différé: numpy n'est chargé qu'à l'ouverture de la carte
+        import numpy as np
+
+        with self.controller.timer.span("render_heatmap"):
+            # Ordonnée croissante vers le haut
+            status = self.grid_data['status'][::-1]
+            if self.display_mode.get() == self.DISPLAY_MODES[0]:
+                palette = np.zeros((max(self.STATUS_COLORS) + 1, 3), dtype=np.uint8)
+                for value, color in self.STATUS_COLORS.items():
+                    palette[value] = color
+                rgb = palette[status]
+            else:
+                rgb = self._volume_colors(np, self.grid_data['v_sirna_total'][::-1], status)
+
+            height, width = status.shape
+            area_width = self.CANVAS_WIDTH - self.MARGIN_LEFT - 10
+            area_height = self.CANVAS_HEIGHT - self.MARGIN_BOTTOM - 10
+            # Réduction par échantillonnage (numpy) ou agrandissement entier (Tk)
+            self.display_step = max(1, math.ceil(max(width / area_width, height / area_height)))
+            rgb = rgb[::self.display_step, ::self.display_step]
+            self.display_zoom = max(1, min(area_width // rgb.shape[1], area_height // rgb.shape[0]))
+
+            header = f"P6 {rgb.shape[1]} {rgb.shape[0]} 255\n".encode("ascii")
+            self.image = tk.PhotoImage(data=header + np.ascontiguousarray(rgb).tobytes(), format="PPM")
+            if self.display_zoom > 1:
+                self.image = self.image.zoom(self.display_zoom)
+
+            self.canvas.delete("all")
+            self.canvas.create_image(self.MARGIN_LEFT, 10, image=self.image, anchor="nw")
+            self._draw_axes(rgb.shape[1] * self.display_zoom, rgb.shape[0] * self.display_zoom)
+
+        counts = np.bincount(self.grid_data['status'].ravel(), minlength=3)
+        total = self.grid_data['status'].size
+        self.logger.info("Carte de faisabilité: %d point(s), %.1f %% faisables", total,
+                         100.0 * (counts[STATUS_DILUTION] + counts[STATUS_DIRECT]) / total)
+
+    def _volume_colors(self, np, volumes, status):
+        """Colore le volume de stock (échelle logarithmique) dans la région faisable, gris ailleurs."""
+        feasible = status != STATUS_INFEASIBLE
+        rgb = np.full(volumes.shape + (3,), 200, dtype=np.uint8)
+        if feasible.any():
+            logs = np.log10(np.where(feasible, volumes, 1.0))
+            low, high = logs[feasible].min(), logs[feasible].max()
+            scale = (logs - low) / (high - low) if high > low else np.zeros_like(logs)
+            # Dégradé du jaune clair (peu de stock) au bleu foncé (beaucoup de stock)
+            start = np.array([255, 245, 180], dtype=np.float64)
+            end = np.array([30, 60, 140], dtype=np.float64)
+            colors = start + scale[..., np.newaxis] * (end - start)
+            rgb[feasible] = colors[feasible].astype(np.uint8)
+        return rgb
+
+    def _draw_axes(self, width, height):
+        """Écrit les bornes et les libellés des axes autour de l'image."""
+        x_key, y_key = self.axes
+        x_values, y_values = self.grid_data['x'], self.grid_data['y']
+        left, top = self.MARGIN_LEFT, 10
+        self.canvas.create_rectangle(left, top, left + width, top + height)
+        self.canvas.create_text(left, top + height + 5, text=f"{x_values[0]:.3g}", anchor="nw")
+        self.canvas.create_text(left + width, top + height + 5, text=f"{x_values[-1]:.3g}", anchor="ne")
+        self.canvas.create_text(left + width / 2, top + height + 20, text=SWEEP_AXES[x_key], anchor="n")
+        self.canvas.create_text(left - 5, top + height, text=f"{y_values[0]:.3g}", anchor="se")
+        self.canvas.create_text(left - 5, top, text=f"{y_values[-1]:.3g}", anchor="ne")
+        self.canvas.create_text(left - 5, top + height / 2, text=SWEEP_AXES[y_key], anchor="e", width=self.MARGIN_LEFT - 10)
+
+    def _cell_at(self, event):
+        """Renvoie les indices (ligne, colonne) de la grille sous le pointeur, ou None."""
+        if self.grid_data is None:
+            return None
+        height, width = self.grid_data['status'].shape
+        column = int((event.x - self.MARGIN_LEFT) / self.display_zoom) * self.display_step
+        row_from_top = int((event.y - 10) / self.display_zoom) * self.display_step
+        if event.x < self.MARGIN_LEFT or event.y < 10 or not (0 <= column < width and 0 <= row_from_top < height):
+            return None
+        return height - 1 - row_from_top, column
+
+    def on_motion(self, event):
+        """Affiche les valeurs du point survolé."""
+        cell = self._cell_at(event)
+        if cell is None:
+            return
+        row, column = cell
+        x_key, y_key = self.axes
+        status = int(self.grid_data['status'][row, column])
+        self.label_info.update_text(
+            f"{SWEEP_AXES[x_key]} = {self.grid_data['x'][column]:.4g}, {SWEEP_AXES[y_key]} = {self.grid_data['y'][row]:.4g} : "
+            f"Ci = {self.grid_data['ci_mix'][row, column]:.2f} nM, stock {self.grid_data['v_sirna_total'][row, column]:.3g} µL "
+            f"({self.STATUS_LABELS[status]})"
+        )
+
+    def on_click(self, event):
+        """Reporte les valeurs du point cliqué dans le formulaire principal."""
+        cell = self._cell_at(event)
+        if cell is None:
+            return
+        row, column = cell
+        x_key, y_key = self.axes
+        values = {x_key: f"{self.grid_data['x'][column]:.4g}", y_key: f"{self.grid_data['y'][row]:.4g}"}
+        self.controller.input_frame.set_input_values(values)
+        self.logger.info("Valeurs reportées depuis la carte de faisabilité: %s", values)
@@ -1,20 +1,70 @@
 # ui/history_frame.py - Cadre pour l'historique des calculs
+import re
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
+
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_UNIT
+
+# Date saisie dans un filtre: un préfixe d'horodatage 'AAAA-MM-JJ HH:MM:SS'
+DATE_PATTERN = re.compile(r"^\d{4}(-\d{2}(-\d{2}( \d{2}(:\d{2}(:\d{2})?)?)?)?)?$")
+
+
+def parse_date_bound(text, end=False):
+    """
+    Convertit une date saisie (préfixe 'AAAA-MM-JJ HH:MM:SS') en borne d'horodatage.
+
+    Les horodatages sont comparés comme des chaînes: une borne de fin est complétée
+    par un caractère supérieur à tous les autres pour inclure toute la période saisie
+    (ex. '2024-05' inclut tout le mois de mai).
+
+    Raises:
+        ValueError: si le texte n'est pas un préfixe de date valide
+    """
+    if not DATE_PATTERN.match(text):
+        raise ValueError(text)
+    return text + "\uffff" if end else text
 
 
 class HistoryFrame(ttk.Frame):
     """Cadre affichant l'historique des calculs précédents."""
 
+    # Nombre d'entrées chargées à chaque fois que la fin de la liste devient visible
+    PAGE_SIZE = 100
+
+    # Fraction de la liste au-delà de laquelle la page suivante est chargée
+    LOAD_THRESHOLD = 0.9
+
+    # Délai (ms) entre la dernière frappe dans un filtre et la recherche
+    SEARCH_DELAY = 200
+
+    # Filtres de recherche: (argument de HistoryStore.query, libellé, conversion d'une borne)
+    FILTERS = (
+        ("cf_range", "Cf (nM)", float),
+        ("stock_range", "Stock (nM)", float),
+        ("samples_range", "Échantillons", int),
+        ("date_range", "Date (AAAA-MM-JJ)", parse_date_bound),
+    )
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
         self.logger = controller.logger
 
+        # Identifiants des entrées affichées, dans l'ordre de la liste
+        self.entry_ids = []
+        # Vrai lorsque toutes les entrées de l'historique ont été chargées
+        self.exhausted = False
+        self.loading_scheduled = False
+
+        # Filtres actifs (arguments de HistoryStore.query) et recherche en attente
+        self.filters = {}
+        self.search_job = None
+        # Champs (min, max) de chaque filtre
+        self.filter_vars = {}
+
         # Configuration de la grille
         self.columnconfigure(0, weight=1)
-        self.rowconfigure(1, weight=1)
+        self.rowconfigure(2, weight=1)
 
         self.create_widgets()
 
@@ -24,38 +74,160 @@ class HistoryFrame(ttk.Frame):
         lbl_history = ttk.Label(self, text="Historique des calculs", font=("Helvetica", 12, "bold"))
         lbl_history.grid(row=0, column=0, pady=(0, 5), sticky=tk.W)
 
+        # Barre de recherche: un couple de bornes par filtre, deux filtres par ligne
+        search_frame = ttk.Frame(self)
+        search_frame.grid(row=1, column=0, columnspan=2, pady=(0, 5), sticky=tk.EW)
+        for index, (name, label, _) in enumerate(self.FILTERS):
+            row, column = divmod(index, 2)
+            column *= 4
+            ttk.Label(search_frame, text=label).grid(row=row, column=column, padx=(0 if column == 0 else 10, 5), sticky=tk.W)
+            bounds = (tk.StringVar(), tk.StringVar())
+            for offset, var in enumerate(bounds, start=1):
+                entry = ttk.Entry(search_frame, textvariable=var, width=11)
+                entry.grid(row=row, column=column + offset, padx=(0, 2), pady=1, sticky=tk.EW)
+                entry.bind("<KeyRelease>", self.schedule_search)
+            self.filter_vars[name] = bounds
+        for column in (1, 2, 5, 6):
+            search_frame.columnconfigure(column, weight=1)
+
+        self.btn_clear = ttk.Button(search_frame, text="Effacer les filtres", command=self.clear_filters)
+        self.btn_clear.grid(row=0, column=8, rowspan=2, padx=(10, 0), sticky=tk.NS)
+
+        self.label_search = ttk.Label(search_frame, text="", foreground="red")
+        self.label_search.grid(row=2, column=0, columnspan=9, sticky=tk.W)
+
         # Liste des calculs
         self.history_listbox = tk.Listbox(self, height=4)
-        self.history_listbox.grid(row=1, column=0, sticky=tk.NSEW)
+        self.history_listbox.grid(row=2, column=0, sticky=tk.NSEW)
 
         # Scrollbar pour la liste
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.history_listbox.yview)
-        scrollbar.grid(row=1, column=1, sticky=tk.NS)
-        self.history_listbox.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.history_listbox.yview)
+        self.scrollbar.grid(row=2, column=1, sticky=tk.NS)
+        self.history_listbox.configure(yscrollcommand=self.on_listbox_scroll)
 
         # Bouton pour charger un calcul depuis l'historique
         self.btn_load = ttk.Button(
             self, text="Charger le calcul sélectionné",
             command=self.load_selected_calculation
         )
-        self.btn_load.grid(row=2, column=0, pady=(5, 0), sticky=tk.EW)
+        self.btn_load.grid(row=3, column=0, pady=(5, 0), sticky=tk.EW)
+
+        # Bouton pour exporter tout l'historique
+        self.btn_export = ttk.Button(
+            self, text="Exporter l'historique",
+            command=self.controller.export_history
+        )
+        self.btn_export.grid(row=4, column=0, pady=(5, 0), sticky=tk.EW)
 
         # Double-clic pour charger un calcul
         self.history_listbox.bind("<Double-1>", lambda e: self.load_selected_calculation())
 
-    def update_history(self, history):
-        """Met à jour la liste de l'historique des calculs."""
+    def update_history(self):
+        """Recharge la liste depuis l'historique persistant (première page seulement)."""
         self.history_listbox.delete(0, tk.END)
+        self.entry_ids = []
+        self.exhausted = False
+        self.load_next_page()
+
+    def prepend_entry(self, item):
+        """Ajoute une nouvelle entrée en tête de liste sans recharger les autres."""
+        if self.filters:
+            # La nouvelle entrée ne correspond pas forcément aux filtres: la requête
+            # indexée de la première page décide
+            self.update_history()
+            return
+        self.history_listbox.insert(0, self._describe(item))
+        self.entry_ids.insert(0, item['id'])
 
-        for item in reversed(history):  # Afficher les plus récents en premier
-            timestamp = item['timestamp']
-            inputs = item['inputs']
-
-            # Créer un texte descriptif pour l'entrée d'historique
-            description = f"{timestamp} - Cf: {inputs.get('Cf de siRNA désiré', '-')} nM, " \
-                          f"Vol: {inputs.get('Volume du milieu', '-')} {inputs.get('volume_unit', 'µL')}"
+    def load_next_page(self):
+        """Charge et affiche la page suivante de l'historique (les plus récents en premier)."""
+        self.loading_scheduled = False
+        if self.exhausted:
+            return
 
-            self.history_listbox.insert(tk.END, description)
+        # Les lignes affichées forment toujours un préfixe des résultats triés par
+        # date décroissante: la page suivante commence donc à len(entry_ids)
+        items = self.controller.history_store.query(limit=self.PAGE_SIZE, offset=len(self.entry_ids),
+                                                    **self.filters)
+        if len(items) < self.PAGE_SIZE:
+            self.exhausted = True
+
+        self.history_listbox.insert(tk.END, *[self._describe(item) for item in items])
+        self.entry_ids.extend(item['id'] for item in items)
+        self.logger.debug("Historique: %d entrée(s) chargée(s), %d affichée(s)", len(items), len(self.entry_ids))
+
+        if self.filters and not self.entry_ids:
+            self.label_search.config(text="Aucun calcul ne correspond aux filtres", foreground="gray")
+
+    def on_listbox_scroll(self, first, last):
+        """Met à jour la barre de défilement et charge la suite lorsque la fin approche."""
+        self.scrollbar.set(first, last)
+        if not self.exhausted and not self.loading_scheduled and float(last) >= self.LOAD_THRESHOLD:
+            # Chargement différé: on ne modifie pas la liste pendant son propre rafraîchissement
+            self.loading_scheduled = True
+            self.after_idle(self.load_next_page)
+
+    def schedule_search(self, event=None):
+        """Relance la recherche SEARCH_DELAY ms après la dernière frappe."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(self.SEARCH_DELAY, self.apply_filters)
+
+    def parse_filters(self):
+        """
+        Lit les bornes saisies dans la barre de recherche.
+
+        Returns:
+            Dictionnaire d'arguments pour HistoryStore.query, ou message d'erreur
+        """
+        filters = {}
+        for name, label, convert in self.FILTERS:
+            bounds = []
+            for end, var in enumerate(self.filter_vars[name]):
+                text = var.get().strip()
+                if not text:
+                    bounds.append(None)
+                    continue
+                try:
+                    if convert is parse_date_bound:
+                        bounds.append(convert(text, end=bool(end)))
+                    else:
+                        bounds.append(convert(text.replace(",", ".")))
+                except ValueError:
+                    return f"Filtre '{label}' invalide: {text}"
+            if bounds != [None, None]:
+                filters[name] = tuple(bounds)
+        return filters
+
+    def apply_filters(self):
+        """Recharge la liste avec les filtres saisis, s'ils sont valides et ont changé."""
+        self.search_job = None
+        filters = self.parse_filters()
+        if isinstance(filters, str):
+            # On garde la liste précédente tant que la saisie est incomplète
+            self.label_search.config(text=filters, foreground="red")
+            return
+        self.label_search.config(text="")
+        if filters == self.filters:
+            return
+        self.filters = filters
+        self.logger.debug("Filtres de l'historique: %s", filters)
+        self.update_history()
+
+    def clear_filters(self):
+        """Vide la barre de recherche et affiche tout l'historique."""
+        for bounds in self.filter_vars.values():
+            for var in bounds:
+                var.set("")
+        self.apply_filters()
+
+    def _describe(self, item):
+        """Crée un texte descriptif pour une entrée d'historique."""
+        timestamp = item['timestamp']
+        inputs = item['inputs']
+        return f"{timestamp} - Cf: {inputs.get(KEY_CF, '-')} nM, " \
+               f"Vol: {inputs.get(KEY_VOLUME_MILIEU, '-')} {inputs.get(KEY_VOLUME_UNIT, 'µL')}, " \
+               f"Stock: {inputs.get(KEY_STOCK, '-')} nM, Éch.: {inputs.get(KEY_SAMPLES, '-')}"
 
     def load_selected_calculation(self):
         """Charge le calcul sélectionné dans l'interface principale."""
@@ -63,9 +235,10 @@ class HistoryFrame(ttk.Frame):
         if not selection:
             return
 
-        # Récupérer l'index dans l'historique (inversé car affiché en ordre inverse)
-        history_index = len(self.controller.calculation_history) - 1 - selection[0]
-        if 0 <= history_index < len(self.controller.calculation_history):
-            history_item = self.controller.calculation_history[history_index]
+        # Retrouver l'entrée correspondant à la ligne sélectionnée
+        if selection[0] >= len(self.entry_ids):
+            return
+        history_item = self.controller.history_store.get(self.entry_ids[selection[0]])
+        if history_item is not None:
             self.controller.load_from_history(history_item)
-            self.logger.info(f"Calcul chargé depuis l'historique: {history_item['timestamp']}")
\ No newline at end of file
+            self.logger.info(f"Calcul chargé depuis l'historique: {history_item['timestamp']}")
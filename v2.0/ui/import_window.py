@@ -0,0 +1,120 @@
+# ui/import_window.py - Fenêtre de comparaison des configurations importées depuis un dossier
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from ui.custom_widgets import SelectableLabel
+
+
+class ImportReportWindow(tk.Toplevel):
+    """Fenêtre listant les configurations importées, leurs résultats et les fichiers en erreur."""
+
+    # Colonnes du tableau de comparaison: (identifiant, titre, largeur)
+    COLUMNS = (
+        ("file", "Fichier", 180),
+        ("cf", "Cf (nM)", 70),
+        ("v_milieu", "Milieu", 80),
+        ("v_mix", "Mix (µL)", 70),
+        ("c_stock", "Stock (nM)", 80),
+        ("n_samples", "Éch.", 45),
+        ("ci_mix", "Ci (nM)", 80),
+        ("v_sirna", "siRNA (µL)", 80),
+        ("v_buffer", "Tampon (µL)", 80),
+        ("status", "Statut", 260),
+    )
+
+    def __init__(self, parent, controller, directory, report):
+        """
+        Args:
+            directory: dossier importé
+            report: rapport de ConfigImporter.run
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = controller.logger
+        self.report = report
+        # Entrées validées des lignes calculées, par identifiant Treeview
+        self.inputs_of_item = {}
+
+        self.title(f"Import de configurations - {os.path.basename(directory) or directory}")
+        self.geometry("1000x560")
+        self.minsize(700, 400)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.create_widgets()
+        self.fill_table()
+
+    def create_widgets(self):
+        """Crée le résumé, le tableau de comparaison et les boutons."""
+        self.label_summary = SelectableLabel(self, text="")
+        self.label_summary.grid(row=0, column=0, padx=10, pady=(10, 0), sticky=tk.EW)
+
+        frame = ttk.Frame(self, padding="10")
+        frame.grid(row=1, column=0, sticky=tk.NSEW)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(frame, columns=[name for name, _, _ in self.COLUMNS], show="headings")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor="w" if name in ("file", "status") else "e")
+        self.tree.tag_configure("error", foreground="#b00020")
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        # Double-clic: charger la configuration dans la fenêtre principale
+        self.tree.bind("<Double-1>", lambda e: self.load_selected())
+
+        bottom = ttk.Frame(self, padding="10")
+        bottom.grid(row=2, column=0, sticky=tk.EW)
+        for column in range(3):
+            bottom.columnconfigure(column, weight=1)
+        ttk.Button(bottom, text="Charger la configuration sélectionnée", command=self.load_selected).grid(
+            row=0, column=0, padx=5, sticky=tk.EW)
+        ttk.Button(bottom, text="Exporter le rapport", command=self.export_report).grid(
+            row=0, column=1, padx=5, sticky=tk.EW)
+        ttk.Button(bottom, text="Fermer", command=self.destroy).grid(row=0, column=2, padx=5, sticky=tk.EW)
+
+    def report_rows(self):
+        """Renvoie les lignes du rapport: configurations calculées puis fichiers en erreur."""
+        rows = []
+        for name, inputs, result in self.report['results']:
+            rows.append((name, result.cf, f"{result.v_milieu:g} {result.volume_unit}", result.v_mix,
+                         result.c_stock, result.n_samples, result.ci_mix, result.v_sirna, result.v_buffer, "OK"))
+        for name, error in self.report['errors']:
+            rows.append((name,) + (None,) * (len(self.COLUMNS) - 2) + (error,))
+        return rows
+
+    def fill_table(self):
+        """Remplit le tableau de comparaison et le résumé."""
+        results = self.report['results']
+        for index, row in enumerate(self.report_rows()):
+            if index < len(results):
+                # Ci et volumes arrondis à l'affichage seulement (valeurs brutes à l'export)
+                item_id = self.tree.insert("", tk.END, values=row[:6] + tuple(f"{value:.2f}" for value in row[6:9])
+                                           + row[9:])
+                self.inputs_of_item[item_id] = results[index][1]
+            else:
+                self.tree.insert("", tk.END, values=tuple("-" if value is None else value for value in row),
+                                 tags=("error",))
+
+        self.label_summary.update_text(f"{self.report['total']} fichier(s): {len(results)} calculé(s) et "
+                                       f"ajouté(s) à l'historique, {len(self.report['errors'])} en erreur")
+
+    def load_selected(self):
+        """Charge la configuration sélectionnée dans la fenêtre principale et la recalcule."""
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self.inputs_of_item:
+            return
+        self.controller.input_frame.set_input_values(self.inputs_of_item[selection[0]])
+        # Le calcul est déjà dans l'historique: ni nouvelle entrée ni débit
+        self.controller.perform_calculation(record=False)
+
+    def export_report(self):
+        """Exporte le rapport complet (CSV, TSV, XLSX ou ODS)."""
+        header = [heading for _, heading, _ in self.COLUMNS]
+        rows = self.report_rows()
+        self.controller.export_table("Rapport d'import", header, rows, total=len(rows))
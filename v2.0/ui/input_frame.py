@@ -3,6 +3,12 @@ import tkinter as tk
 from tkinter import ttk
 
 from ui.custom_widgets import SelectableLabel
+from models.inverse import INVERSE_TARGETS
+from models.pipetting import DEFAULT_MAX_TUBE_VOLUME, DEFAULT_MIN_PIPETTING_VOLUME
+from models.schema import (KEY_CF, KEY_CF_UNIT, KEY_STOCK, KEY_STOCK_UNIT, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX,
+                           KEY_VOLUME_MIX_UNIT, KEY_VOLUME_UNIT, validate_inputs)
+from models.units import (CONCENTRATION_UNIT, CONCENTRATION_UNITS, VOLUME_UNIT, VOLUME_UNITS,
+                          convert_concentration, convert_volume, format_quantity)
 
 
 class InputFrame(ttk.Frame):
@@ -14,7 +20,20 @@ class InputFrame(ttk.Frame):
         "volume_culture": "2000",
         "mix_volume": "200",
         "stock_conc": "20000",
-        "num_samples": "1"
+        "num_samples": "1",
+        "series_factor": "2",
+        "series_points": "8",
+        "min_volume": f"{DEFAULT_MIN_PIPETTING_VOLUME:g}",
+        "max_tube_volume": f"{DEFAULT_MAX_TUBE_VOLUME:g}",
+        "stock_volume": ""
+    }
+    
+    # Champs avec unité: clé de l'unité -> (clé du champ, unités proposées, unité par défaut, conversion)
+    UNIT_FIELDS = {
+        KEY_CF_UNIT: (KEY_CF, CONCENTRATION_UNITS, CONCENTRATION_UNIT, convert_concentration),
+        KEY_VOLUME_UNIT: (KEY_VOLUME_MILIEU, VOLUME_UNITS, VOLUME_UNIT, convert_volume),
+        KEY_VOLUME_MIX_UNIT: (KEY_VOLUME_MIX, VOLUME_UNITS, VOLUME_UNIT, convert_volume),
+        KEY_STOCK_UNIT: (KEY_STOCK, CONCENTRATION_UNITS, CONCENTRATION_UNIT, convert_concentration),
     }
     
     def __init__(self, parent, controller):
@@ -22,8 +41,10 @@ class InputFrame(ttk.Frame):
         self.controller = controller
         self.logger = controller.logger
         
-        # Variable pour mémoriser la dernière unité de volume
-        self.last_unit = "µL"
+        # Unité choisie et dernière unité connue de chaque champ (pour la conversion)
+        self.units = {}
+        self.last_units = {}
+        self.unit_comboboxes = {}
         
         # Configuration de la grille pour ce frame
         self.columnconfigure(1, weight=1)
@@ -41,11 +62,12 @@ class InputFrame(ttk.Frame):
         lbl_milieu.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Concentration finale
-        ttk.Label(self, text="Cf de siRNA désiré (nM) :", anchor="w").grid(
+        ttk.Label(self, text="Cf de siRNA désiré :", anchor="w").grid(
             row=2, column=0, sticky=tk.W, pady=5)
         self.entry_cf_culture = ttk.Entry(self)
         self.entry_cf_culture.insert(0, self.DEFAULT_VALUES["cf_culture"])
-        self.entry_cf_culture.grid(row=2, column=1, columnspan=2, pady=5, sticky=tk.EW)
+        self.entry_cf_culture.grid(row=2, column=1, pady=5, sticky=tk.EW)
+        self._create_unit_combobox(KEY_CF_UNIT, row=2)
         
         # Volume du milieu
         ttk.Label(self, text="Volume du milieu :", anchor="w").grid(
@@ -54,31 +76,28 @@ class InputFrame(ttk.Frame):
         self.entry_volume_culture.insert(0, self.DEFAULT_VALUES["volume_culture"])
         self.entry_volume_culture.grid(row=3, column=1, pady=5, sticky=tk.EW)
         
-        self.volume_unit = tk.StringVar(value="µL")
-        self.combobox_unit = ttk.Combobox(
-            self, textvariable=self.volume_unit, values=["µL", "mL"], 
-            width=5, state="readonly"
-        )
-        self.combobox_unit.grid(row=3, column=2, padx=5, pady=5)
-        self.combobox_unit.bind("<<ComboboxSelected>>", self.on_unit_change)
+        self.combobox_unit = self._create_unit_combobox(KEY_VOLUME_UNIT, row=3)
+        self.volume_unit = self.units[KEY_VOLUME_UNIT]
         
         # Section Mix siRNA
         lbl_mix = ttk.Label(self, text="Mix siRNA", font=("Helvetica", 10, "bold"))
         lbl_mix.grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Volume du mix
-        ttk.Label(self, text="Volume final du mix à mettre\n dans le milieu de culture (µL) :", 
+        ttk.Label(self, text="Volume final du mix à mettre\n dans le milieu de culture :", 
                   anchor="w").grid(row=5, column=0, sticky=tk.W, pady=5)
         self.entry_mix_volume = ttk.Entry(self)
         self.entry_mix_volume.insert(0, self.DEFAULT_VALUES["mix_volume"])
-        self.entry_mix_volume.grid(row=5, column=1, columnspan=2, pady=5, sticky=tk.EW)
+        self.entry_mix_volume.grid(row=5, column=1, pady=5, sticky=tk.EW)
+        self._create_unit_combobox(KEY_VOLUME_MIX_UNIT, row=5)
         
         # Concentration du stock
-        ttk.Label(self, text="Concentration du stock de siRNA (nM) :", 
+        ttk.Label(self, text="Concentration du stock de siRNA :", 
                   anchor="w").grid(row=6, column=0, sticky=tk.W, pady=5)
         self.entry_stock_conc = ttk.Entry(self)
         self.entry_stock_conc.insert(0, self.DEFAULT_VALUES["stock_conc"])
-        self.entry_stock_conc.grid(row=6, column=1, columnspan=2, pady=5, sticky=tk.EW)
+        self.entry_stock_conc.grid(row=6, column=1, pady=5, sticky=tk.EW)
+        self._create_unit_combobox(KEY_STOCK_UNIT, row=6)
         
         # Section Nombre d'échantillons
         frame_samples = ttk.Frame(self)
@@ -89,70 +108,163 @@ class InputFrame(ttk.Frame):
         self.entry_num_samples.grid(row=0, column=1, padx=5)
         ttk.Label(frame_samples, text="échantillon(s)", anchor="w").grid(row=0, column=2)
         
+        # Paramètres de la série de dilutions (la Cf désirée est celle du premier point)
+        frame_series = ttk.Frame(self)
+        frame_series.grid(row=8, column=0, columnspan=3, pady=5, sticky=tk.W)
+        ttk.Label(frame_series, text="Série : facteur", anchor="w").grid(row=0, column=0)
+        self.entry_series_factor = ttk.Entry(frame_series, width=5)
+        self.entry_series_factor.insert(0, self.DEFAULT_VALUES["series_factor"])
+        self.entry_series_factor.grid(row=0, column=1, padx=5)
+        ttk.Label(frame_series, text="points", anchor="w").grid(row=0, column=2)
+        self.entry_series_points = ttk.Entry(frame_series, width=5)
+        self.entry_series_points.insert(0, self.DEFAULT_VALUES["series_points"])
+        self.entry_series_points.grid(row=0, column=3, padx=5)
+        
+        # Limites de pipetage: en dessous du volume minimal, le stock est dilué
+        frame_pipetting = ttk.Frame(self)
+        frame_pipetting.grid(row=9, column=0, columnspan=3, pady=5, sticky=tk.W)
+        ttk.Label(frame_pipetting, text="Pipetage : volume min. (µL)", anchor="w").grid(row=0, column=0)
+        self.entry_min_volume = ttk.Entry(frame_pipetting, width=6)
+        self.entry_min_volume.insert(0, self.DEFAULT_VALUES["min_volume"])
+        self.entry_min_volume.grid(row=0, column=1, padx=5)
+        ttk.Label(frame_pipetting, text="tube de dilution max. (µL)", anchor="w").grid(row=0, column=2)
+        self.entry_max_tube_volume = ttk.Entry(frame_pipetting, width=7)
+        self.entry_max_tube_volume.insert(0, self.DEFAULT_VALUES["max_tube_volume"])
+        self.entry_max_tube_volume.grid(row=0, column=3, padx=5)
+        
+        # Calcul inverse: le champ choisi est déduit des autres (et du stock disponible)
+        frame_solve = ttk.Frame(self)
+        frame_solve.grid(row=10, column=0, columnspan=3, pady=5, sticky=tk.W)
+        ttk.Label(frame_solve, text="Résoudre :", anchor="w").grid(row=0, column=0)
+        self.solve_target = tk.StringVar(value=next(iter(INVERSE_TARGETS.values())))
+        self.combobox_solve = ttk.Combobox(
+            frame_solve, textvariable=self.solve_target, values=list(INVERSE_TARGETS.values()),
+            width=26, state="readonly"
+        )
+        self.combobox_solve.grid(row=0, column=1, padx=5)
+        ttk.Label(frame_solve, text="stock disponible (µL)", anchor="w").grid(row=0, column=2)
+        self.entry_stock_volume = ttk.Entry(frame_solve, width=7)
+        self.entry_stock_volume.insert(0, self.DEFAULT_VALUES["stock_volume"])
+        self.entry_stock_volume.grid(row=0, column=3, padx=5)
+        self.btn_solve = ttk.Button(frame_solve, text="Résoudre", command=self.controller.perform_inverse_solve)
+        self.btn_solve.grid(row=0, column=4, padx=5)
+        
         # Zone de résultat pour la concentration dans le mix
         self.label_conc = SelectableLabel(self, text="")
-        self.label_conc.grid(row=9, column=0, columnspan=3, pady=(5, 0), sticky=tk.W+tk.E)
+        self.label_conc.grid(row=11, column=0, columnspan=3, pady=(5, 0), sticky=tk.W+tk.E)
         
         # Zone d'erreur
         self.label_error = SelectableLabel(self, text="")
-        self.label_error.grid(row=10, column=0, columnspan=3, pady=(5, 0), sticky=tk.W+tk.E)
+        self.label_error.grid(row=12, column=0, columnspan=3, pady=(5, 0), sticky=tk.W+tk.E)
+    
+    def _create_unit_combobox(self, unit_key, row):
+        """Crée la liste des unités d'un champ, en colonne 2 de la ligne donnée."""
+        _, units, default_unit, _ = self.UNIT_FIELDS[unit_key]
+        self.units[unit_key] = tk.StringVar(value=default_unit)
+        self.last_units[unit_key] = default_unit
+        combobox = ttk.Combobox(
+            self, textvariable=self.units[unit_key], values=list(units),
+            width=5, state="readonly"
+        )
+        combobox.grid(row=row, column=2, padx=5, pady=5)
+        combobox.bind("<<ComboboxSelected>>", lambda e: self.on_unit_change(unit_key))
+        self.unit_comboboxes[unit_key] = combobox
+        return combobox
+    
+    def _entry_for(self, key):
+        """Renvoie le champ de saisie associé à une clé du schéma."""
+        return {
+            KEY_CF: self.entry_cf_culture,
+            KEY_VOLUME_MILIEU: self.entry_volume_culture,
+            KEY_VOLUME_MIX: self.entry_mix_volume,
+            KEY_STOCK: self.entry_stock_conc,
+        }[key]
     
-    def on_unit_change(self, event):
-        """Convertit la valeur dans 'Volume du milieu' lors du changement d'unité, sans décimales."""
+    def on_unit_change(self, unit_key):
+        """Convertit la valeur d'un champ lors du changement de son unité (sans troncature)."""
+        key, _, _, convert = self.UNIT_FIELDS[unit_key]
+        new_unit = self.units[unit_key].get()
+        old_unit = self.last_units[unit_key]
+        if new_unit == old_unit:
+            return
+        self.last_units[unit_key] = new_unit
+        
+        entry = self._entry_for(key)
         try:
-            current_value = self.entry_volume_culture.get().strip()
+            current_value = entry.get().strip()
             if current_value == "":
                 return
             value = float(current_value)
         except ValueError:
             self.logger.warning(f"Conversion d'unité: valeur non numérique '{current_value}'")
             return
-
-        new_unit = self.volume_unit.get()
-        if new_unit != self.last_unit:
-            if self.last_unit == "µL" and new_unit == "mL":
-                value = value / 1000
-            elif self.last_unit == "mL" and new_unit == "µL":
-                value = value * 1000
-            self.entry_volume_culture.delete(0, tk.END)
-            self.entry_volume_culture.insert(0, f"{value:.0f}")
-            self.last_unit = new_unit
-            self.logger.info(f"Unité changée de {self.last_unit} à {new_unit}, nouvelle valeur: {value:.0f}")
-    
-    def get_validated_inputs(self):
+        
+        value = convert(value, old_unit, new_unit)
+        entry.delete(0, tk.END)
+        entry.insert(0, format_quantity(value))
+        self.logger.info("Unité changée de %s à %s, nouvelle valeur: %s", old_unit, new_unit, format_quantity(value))
+    
+    def get_validated_inputs(self, exclude=()):
         """
         Vérifie que tous les champs sont remplis, numériques et > 0.
-        Renvoie un dictionnaire des valeurs ou un message d'erreur.
+        Les champs dont la clé figure dans exclude sont ignorés.
+        Renvoie un dictionnaire des valeurs ou les messages de toutes les erreurs (un par ligne).
+        """
+        return validate_inputs(self.get_input_values(), exclude)
+    
+    def get_series_parameters(self):
         """
-        inputs = [
-            ("Cf de siRNA désiré (nM)", self.entry_cf_culture.get()),
-            ("Volume du milieu", self.entry_volume_culture.get()),
-            ("Volume final du mix à mettre dans le milieu de culture (µL)", self.entry_mix_volume.get()),
-            ("Concentration du stock de siRNA (nM)", self.entry_stock_conc.get()),
-            ("Nombre d'échantillon(s)", self.entry_num_samples.get())
-        ]
-        
-        values = {}
-        for label_text, text in inputs:
-            if text.strip() == "":
-                return f"Erreur : le champ '{label_text}' est vide."
-            try:
-                if label_text == "Nombre d'échantillon(s)":
-                    val = int(text)
-                else:
-                    val = float(text)
-            except ValueError:
-                return f"Erreur : le champ '{label_text}' n'est pas un nombre valide."
-            if val <= 0:
-                return f"Erreur : le champ '{label_text}' doit être supérieur à 0."
-            
-            key = label_text.split(" (")[0]
-            values[key] = val
-        
-        # Ajouter l'unité de volume
-        values["volume_unit"] = self.volume_unit.get()
-        
-        return values
+        Vérifie les paramètres de la série de dilutions.
+        Renvoie un dictionnaire (dilution_factor, n_points) ou un message d'erreur.
+        """
+        try:
+            dilution_factor = float(self.entry_series_factor.get())
+        except ValueError:
+            return "Erreur : le facteur de dilution n'est pas un nombre valide."
+        if dilution_factor <= 1:
+            return "Erreur : le facteur de dilution doit être supérieur à 1."
+        try:
+            n_points = int(self.entry_series_points.get())
+        except ValueError:
+            return "Erreur : le nombre de points n'est pas un nombre entier valide."
+        if n_points <= 0:
+            return "Erreur : le nombre de points doit être supérieur à 0."
+        return {'dilution_factor': dilution_factor, 'n_points': n_points}
+    
+    def get_pipetting_parameters(self):
+        """
+        Vérifie les limites de pipetage.
+        Renvoie un dictionnaire (min_volume, max_tube_volume) ou un message d'erreur.
+        """
+        try:
+            min_volume = float(self.entry_min_volume.get())
+            max_tube_volume = float(self.entry_max_tube_volume.get())
+        except ValueError:
+            return "Erreur : les limites de pipetage ne sont pas des nombres valides."
+        if min_volume <= 0:
+            return "Erreur : le volume pipetable minimal doit être supérieur à 0."
+        if max_tube_volume < 2 * min_volume:
+            return "Erreur : le volume maximal d'un tube doit être au moins le double du volume pipetable minimal."
+        return {'min_volume': min_volume, 'max_tube_volume': max_tube_volume}
+    
+    def get_inverse_parameters(self):
+        """
+        Vérifie les paramètres du calcul inverse.
+        Renvoie un dictionnaire (target, stock_volume) ou un message d'erreur;
+        stock_volume vaut None si le champ est vide.
+        """
+        labels = {label: key for key, label in INVERSE_TARGETS.items()}
+        target = labels[self.solve_target.get()]
+        text = self.entry_stock_volume.get().strip()
+        if text == "":
+            return {'target': target, 'stock_volume': None}
+        try:
+            stock_volume = float(text)
+        except ValueError:
+            return "Erreur : le volume de stock disponible n'est pas un nombre valide."
+        if stock_volume <= 0:
+            return "Erreur : le volume de stock disponible doit être supérieur à 0."
+        return {'target': target, 'stock_volume': stock_volume}
     
     def get_input_values(self):
         """Récupère les valeurs actuelles des champs sans validation."""
@@ -160,44 +272,52 @@ class InputFrame(ttk.Frame):
             "Cf de siRNA désiré": self.entry_cf_culture.get(),
             "Volume du milieu": self.entry_volume_culture.get(),
             "volume_unit": self.volume_unit.get(),
+            KEY_CF_UNIT: self.units[KEY_CF_UNIT].get(),
+            KEY_VOLUME_MIX_UNIT: self.units[KEY_VOLUME_MIX_UNIT].get(),
+            KEY_STOCK_UNIT: self.units[KEY_STOCK_UNIT].get(),
             "Volume final du mix à mettre dans le milieu de culture": self.entry_mix_volume.get(),
             "Concentration du stock de siRNA": self.entry_stock_conc.get(),
             "Nombre d'échantillon(s)": self.entry_num_samples.get()
         }
     
     def set_input_values(self, inputs):
-        """Définit les valeurs des champs à partir d'un dictionnaire."""
-        if "Cf de siRNA désiré" in inputs:
-            self.entry_cf_culture.delete(0, tk.END)
-            self.entry_cf_culture.insert(0, inputs["Cf de siRNA désiré"])
-        
-        if "Volume du milieu" in inputs:
-            self.entry_volume_culture.delete(0, tk.END)
-            self.entry_volume_culture.insert(0, inputs["Volume du milieu"])
-        
-        if "volume_unit" in inputs:
-            self.volume_unit.set(inputs["volume_unit"])
-            self.last_unit = inputs["volume_unit"]
-        
-        if "Volume final du mix à mettre dans le milieu de culture" in inputs:
-            self.entry_mix_volume.delete(0, tk.END)
-            self.entry_mix_volume.insert(0, inputs["Volume final du mix à mettre dans le milieu de culture"])
+        """
+        Définit les valeurs des champs à partir d'un dictionnaire.
         
-        if "Concentration du stock de siRNA" in inputs:
-            self.entry_stock_conc.delete(0, tk.END)
-            self.entry_stock_conc.insert(0, inputs["Concentration du stock de siRNA"])
+        Une valeur donnée avec son unité ('cf_unit', 'volume_unit'...) est affichée telle
+        quelle. Pour la Cf, le volume du mix et le stock, une valeur donnée sans unité
+        (historique, calcul inverse, carte de faisabilité) est exprimée dans l'unité de
+        référence (nM ou µL) et convertie dans l'unité affichée.
+        """
+        for unit_key, (key, _, default_unit, convert) in self.UNIT_FIELDS.items():
+            if unit_key in inputs:
+                self.units[unit_key].set(inputs[unit_key])
+                self.last_units[unit_key] = inputs[unit_key]
+            if key not in inputs:
+                continue
+            value = inputs[key]
+            if unit_key not in inputs and key != KEY_VOLUME_MILIEU:
+                try:
+                    value = format_quantity(convert(float(value), default_unit, self.units[unit_key].get()))
+                except (TypeError, ValueError):
+                    pass
+            entry = self._entry_for(key)
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
         
         if "Nombre d'échantillon(s)" in inputs:
             self.entry_num_samples.delete(0, tk.END)
             self.entry_num_samples.insert(0, inputs["Nombre d'échantillon(s)"])
     
     def update_concentration(self, concentration):
-        """Met à jour l'affichage de la concentration."""
-        self.label_conc.update_text(f"Concentration en siRNA dans le mix : {concentration:.2f} nM", "black")
+        """Met à jour l'affichage de la concentration (reçue en nM, affichée dans l'unité du stock)."""
+        unit = self.units[KEY_STOCK_UNIT].get()
+        concentration = convert_concentration(concentration, CONCENTRATION_UNIT, unit)
+        self.label_conc.update_text(f"Concentration en siRNA dans le mix : {concentration:.2f} {unit}", "black")
     
     def update_error(self, error_message):
         """Met à jour l'affichage du message d'erreur."""
-        self.logger.warning(f"Erreur de validation: {error_message}")
+        self.logger.warning("Erreur de validation: %s", error_message)
         self.label_error.update_text(error_message, "red")
     
     def clear_error(self):
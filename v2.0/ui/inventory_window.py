@@ -0,0 +1,139 @@
+# ui/inventory_window.py - Fenêtre de l'inventaire des stocks de siRNA (lots et volumes restants)
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from ui.custom_widgets import SelectableLabel
+
+
+class InventoryWindow(tk.Toplevel):
+    """Fenêtre listant les lots de stock, leur consommation et le lot débité par les calculs."""
+
+    # Colonnes du tableau des lots: (identifiant, titre, largeur)
+    COLUMNS = (
+        ("lot", "Lot", 100),
+        ("sirna", "siRNA", 120),
+        ("c_stock", "Stock (nM)", 80),
+        ("volume", "Initial (µL)", 85),
+        ("consumed", "Consommé (µL)", 95),
+        ("remaining", "Restant (µL)", 90),
+        ("active", "Débité", 60),
+    )
+
+    # Champs du formulaire d'ajout: (identifiant, libellé, largeur)
+    FORM_FIELDS = (
+        ("lot", "Lot", 12),
+        ("sirna", "siRNA", 14),
+        ("c_stock", "Stock (nM)", 9),
+        ("volume", "Volume (µL)", 9),
+    )
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = controller.logger
+        self.inventory = controller.inventory
+
+        self.title("Inventaire des stocks")
+        self.geometry("720x440")
+        self.minsize(600, 320)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        """Crée le formulaire d'ajout, le tableau des lots et les boutons."""
+        form = ttk.Frame(self, padding="10")
+        form.grid(row=0, column=0, sticky=tk.EW)
+        self.entries = {}
+        for column, (name, label, width) in enumerate(self.FORM_FIELDS):
+            ttk.Label(form, text=label).grid(row=0, column=column, padx=3, sticky=tk.W)
+            entry = ttk.Entry(form, width=width)
+            entry.grid(row=1, column=column, padx=3, sticky=tk.EW)
+            self.entries[name] = entry
+        ttk.Button(form, text="Ajouter le lot", command=self.add_lot).grid(
+            row=1, column=len(self.FORM_FIELDS), padx=5, sticky=tk.EW)
+
+        frame = ttk.Frame(self, padding=(10, 0))
+        frame.grid(row=1, column=0, sticky=tk.NSEW)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(frame, columns=[name for name, _, _ in self.COLUMNS], show="headings",
+                                 selectmode="browse")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor="w" if name in ("lot", "sirna") else "e")
+        self.tree.tag_configure("overdrawn", foreground="#b00020")
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.label_error = SelectableLabel(self, text="")
+        self.label_error.grid(row=2, column=0, padx=10, pady=(5, 0), sticky=tk.EW)
+
+        buttons = ttk.Frame(self, padding="10")
+        buttons.grid(row=3, column=0, sticky=tk.EW)
+        for column in range(4):
+            buttons.columnconfigure(column, weight=1)
+        ttk.Button(buttons, text="Débiter les calculs de ce lot", command=self.activate_selected).grid(
+            row=0, column=0, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Ne débiter aucun lot", command=self.deactivate).grid(
+            row=0, column=1, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Retirer le lot", command=self.remove_selected).grid(
+            row=0, column=2, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Fermer", command=self.destroy).grid(row=0, column=3, padx=5, sticky=tk.EW)
+
+    def refresh(self):
+        """Réaffiche les lots à partir des totaux courants de l'inventaire."""
+        self.tree.delete(*self.tree.get_children())
+        for lot in self.inventory.lots.values():
+            self.tree.insert("", tk.END, iid=lot.lot_id, values=(
+                lot.lot_id, lot.sirna, f"{lot.c_stock:g}", f"{lot.volume:.2f}", f"{lot.consumed:.2f}",
+                f"{lot.remaining:.2f}", "oui" if lot.lot_id == self.inventory.active_lot else ""
+            ), tags=("overdrawn",) if lot.remaining < 0 else ())
+
+    def add_lot(self):
+        """Ajoute le lot saisi dans le formulaire."""
+        values = {name: entry.get() for name, entry in self.entries.items()}
+        try:
+            c_stock = float(values["c_stock"])
+            volume = float(values["volume"])
+        except ValueError:
+            self.label_error.update_text("Erreur : la concentration et le volume doivent être des nombres.", "red")
+            return
+        try:
+            self.inventory.add_lot(values["lot"], values["sirna"], c_stock, volume)
+        except ValueError as e:
+            self.label_error.update_text(f"Erreur : {str(e)}", "red")
+            return
+        for entry in self.entries.values():
+            entry.delete(0, tk.END)
+        self.label_error.update_text("")
+        self.refresh()
+
+    def activate_selected(self):
+        """Débite les calculs suivants du lot sélectionné."""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.inventory.set_active_lot(selection[0])
+        self.logger.info("Lot débité par les calculs: %s", selection[0])
+        self.refresh()
+
+    def deactivate(self):
+        """Arrête de débiter les calculs."""
+        self.inventory.set_active_lot(None)
+        self.refresh()
+
+    def remove_selected(self):
+        """Retire le lot sélectionné après confirmation."""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        if not messagebox.askyesno("Retirer le lot", f"Retirer le lot {selection[0]} de l'inventaire ?", parent=self):
+            return
+        self.inventory.remove_lot(selection[0])
+        self.refresh()
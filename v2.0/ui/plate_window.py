@@ -0,0 +1,302 @@
+# ui/plate_window.py - Fenêtre de planification d'une plaque (plusieurs siRNA et concentrations)
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from ui.custom_widgets import SelectableLabel
+from models.plate import PLATE_FORMATS, build_layout, read_layout_csv
+from models.units import VOLUME_UNITS
+from utils.worklist import WorklistExporter
+
+
+class PlateWindow(tk.Toplevel):
+    """Fenêtre calculant les master mix d'une plaque et les totaux de réactifs."""
+
+    # Colonnes du tableau des master mix: (identifiant, titre, largeur)
+    COLUMNS = (
+        ("mix", "Master mix", 160),
+        ("wells", "Puits", 60),
+        ("ci_mix", "Ci (nM)", 80),
+        ("source", "Source", 150),
+        ("v_source", "Source (µL)", 90),
+        ("v_buffer", "Tampon (µL)", 90),
+        ("v_mix", "Mix (µL)", 90),
+    )
+
+    DEFAULT_VALUES = {
+        "sirnas": "siRNA-1 ; 20000\nsiRNA-2 ; 20000\nContrôle ; 20000",
+        "concentrations": "1, 5, 10, 25",
+        "replicates": "3",
+        "volume": "100",
+        "mix_volume": "10",
+        "overage": "10",
+        "dead_volume": "0",
+    }
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = controller.logger
+
+        # Plan importé depuis un fichier CSV (prioritaire sur le plan généré)
+        self.imported_wells = None
+        self.current_plan = None
+        self.current_dilutions = None
+
+        self.title("Plan de plaque")
+        self.geometry("820x720")
+        self.minsize(600, 600)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Crée les paramètres du plan, le tableau des master mix et les boutons."""
+        params = ttk.Frame(self, padding="10")
+        params.grid(row=0, column=0, sticky=tk.EW)
+        params.columnconfigure(1, weight=1)
+
+        ttk.Label(params, text="Format de plaque :").grid(row=0, column=0, sticky=tk.W, pady=3)
+        self.plate_format = tk.StringVar(value="96")
+        ttk.Combobox(params, textvariable=self.plate_format, values=[str(n) for n in PLATE_FORMATS],
+                     width=6, state="readonly").grid(row=0, column=1, sticky=tk.W, pady=3)
+
+        ttk.Label(params, text="siRNA (nom ; stock en nM,\nun par ligne) :").grid(row=1, column=0, sticky=tk.NW, pady=3)
+        self.text_sirnas = tk.Text(params, height=4, width=40)
+        self.text_sirnas.insert("1.0", self.DEFAULT_VALUES["sirnas"])
+        self.text_sirnas.grid(row=1, column=1, columnspan=2, sticky=tk.EW, pady=3)
+
+        self.entries = {}
+        fields = (
+            ("concentrations", "Concentrations finales (nM) :"),
+            ("replicates", "Réplicats par concentration :"),
+            ("volume", "Volume du milieu par puits :"),
+            ("mix_volume", "Volume de mix par puits (µL) :"),
+            ("overage", "Surplus (%) :"),
+            ("dead_volume", "Volume mort par tube (µL) :"),
+        )
+        for row, (name, label) in enumerate(fields, start=2):
+            ttk.Label(params, text=label).grid(row=row, column=0, sticky=tk.W, pady=3)
+            entry = ttk.Entry(params)
+            entry.insert(0, self.DEFAULT_VALUES[name])
+            entry.grid(row=row, column=1, columnspan=1 if name == "volume" else 2, sticky=tk.EW, pady=3)
+            self.entries[name] = entry
+
+        self.volume_unit = tk.StringVar(value="µL")
+        ttk.Combobox(params, textvariable=self.volume_unit, values=list(VOLUME_UNITS),
+                     width=5, state="readonly").grid(row=4, column=2, padx=5, pady=3)
+
+        self.label_layout = ttk.Label(params, text="Plan généré à partir des paramètres ci-dessus")
+        self.label_layout.grid(row=8, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+
+        buttons = ttk.Frame(self, padding=(10, 0))
+        buttons.grid(row=1, column=0, sticky=tk.EW)
+        for column in range(3):
+            buttons.columnconfigure(column, weight=1)
+        ttk.Button(buttons, text="Calculer le plan", command=self.compute_plan).grid(
+            row=0, column=0, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Importer un plan (CSV)", command=self.import_layout).grid(
+            row=0, column=1, padx=5, sticky=tk.EW)
+        ttk.Button(buttons, text="Oublier le plan importé", command=self.forget_layout).grid(
+            row=0, column=2, padx=5, sticky=tk.EW)
+
+        frame = ttk.Frame(self, padding="10")
+        frame.grid(row=2, column=0, sticky=tk.NSEW)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(frame, columns=[name for name, _, _ in self.COLUMNS], show="headings")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor="w" if name == "mix" else "e")
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.label_totals = SelectableLabel(self, text="")
+        self.label_totals.grid(row=3, column=0, padx=10, sticky=tk.EW)
+        self.label_error = SelectableLabel(self, text="")
+        self.label_error.grid(row=4, column=0, padx=10, sticky=tk.EW)
+
+        bottom = ttk.Frame(self, padding="10")
+        bottom.grid(row=5, column=0, sticky=tk.EW)
+        for column in range(4):
+            bottom.columnconfigure(column, weight=1)
+        ttk.Button(bottom, text="Afficher dans le tableau du mix", command=self.show_in_table).grid(
+            row=0, column=0, padx=5, sticky=tk.EW)
+        ttk.Button(bottom, text="Exporter les transferts (CSV)", command=self.export_worklist).grid(
+            row=0, column=1, padx=5, sticky=tk.EW)
+        ttk.Button(bottom, text="Exporter le plan", command=self.export_plan).grid(
+            row=0, column=2, padx=5, sticky=tk.EW)
+        ttk.Button(bottom, text="Fermer", command=self.destroy).grid(row=0, column=3, padx=5, sticky=tk.EW)
+
+    def read_parameters(self):
+        """
+        Lit et vérifie les paramètres du plan.
+
+        Returns:
+            Dictionnaire des paramètres, ou un message d'erreur (str)
+        """
+        numbers = {}
+        for name, label in (("volume", "Volume du milieu"), ("mix_volume", "Volume de mix"),
+                            ("overage", "Surplus"), ("dead_volume", "Volume mort")):
+            try:
+                numbers[name] = float(self.entries[name].get())
+            except ValueError:
+                return f"Erreur : le champ '{label}' n'est pas un nombre valide."
+        if numbers["volume"] <= 0 or numbers["mix_volume"] <= 0:
+            return "Erreur : les volumes doivent être supérieurs à 0."
+        if numbers["overage"] < 0 or numbers["dead_volume"] < 0:
+            return "Erreur : le surplus et le volume mort ne peuvent pas être négatifs."
+
+        if self.imported_wells is not None:
+            wells = self.imported_wells
+        else:
+            wells = self._build_wells()
+            if isinstance(wells, str):
+                return wells
+
+        return {
+            'wells': wells,
+            'v_milieu': numbers["volume"],
+            'v_mix': numbers["mix_volume"],
+            'volume_unit': self.volume_unit.get(),
+            'overage': numbers["overage"] / 100,
+            'dead_volume': numbers["dead_volume"],
+        }
+
+    def _build_wells(self):
+        """Construit le plan siRNA x concentrations x réplicats, ou renvoie un message d'erreur."""
+        sirnas = []
+        for line in self.text_sirnas.get("1.0", tk.END).splitlines():
+            if not line.strip():
+                continue
+            name, _, stock = line.rpartition(";")
+            try:
+                c_stock = float(stock)
+            except ValueError:
+                return f"Erreur : ligne siRNA invalide '{line.strip()}' (attendu: nom ; stock)."
+            if not name.strip() or c_stock <= 0:
+                return f"Erreur : ligne siRNA invalide '{line.strip()}' (attendu: nom ; stock)."
+            sirnas.append((name.strip(), c_stock))
+        if not sirnas:
+            return "Erreur : aucun siRNA indiqué."
+
+        try:
+            concentrations = [float(value) for value in self.entries["concentrations"].get().split(",") if value.strip()]
+            replicates = int(self.entries["replicates"].get())
+        except ValueError:
+            return "Erreur : concentrations ou nombre de réplicats invalides."
+        if not concentrations or min(concentrations) <= 0 or replicates <= 0:
+            return "Erreur : les concentrations et le nombre de réplicats doivent être supérieurs à 0."
+
+        try:
+            return build_layout(int(self.plate_format.get()), sirnas, concentrations, replicates)
+        except ValueError as e:
+            return f"Erreur : {str(e)}"
+
+    def compute_plan(self):
+        """Calcule le plan et affiche les master mix et les totaux."""
+        params = self.read_parameters()
+        if isinstance(params, str):
+            self.label_error.update_text(params, "red")
+            return
+        limits_error = self.controller.apply_pipetting_limits()
+        if limits_error is not None:
+            self.label_error.update_text(limits_error, "red")
+            return
+
+        with self.controller.timer.span("plan_plate"):
+            result = self.controller.calculation_model.plan_plate(**params)
+        if not result['success']:
+            self.label_error.update_text(result['error'], "red")
+            return
+
+        plan = self.current_plan = result['plan']
+        dilutions = self.current_dilutions = result['dilutions']
+        self.tree.delete(*self.tree.get_children())
+        for mix, recipe in zip(plan.mixes, dilutions.recipes):
+            if recipe is None:
+                source, v_source, v_buffer = "-", "-", "-"
+            else:
+                source, v_source, v_buffer = recipe.source_label, f"{recipe.v_source:.2f}", f"{recipe.v_buffer:.2f}"
+            self.tree.insert("", tk.END, values=(
+                mix.label, len(mix.wells), f"{mix.result.ci_mix:.2f}",
+                source, v_source, v_buffer, f"{mix.v_mix_total:.2f}"
+            ))
+
+        totals = ", ".join(f"{sirna}: {total:.2f} µL" for sirna, total in dilutions.stock_totals.items())
+        self.label_totals.update_text(
+            f"{plan.n_wells} puits, {len(plan.mixes)} master mix, "
+            f"{len(dilutions.dilutions)} dilution(s) intermédiaire(s)\n"
+            f"Stocks à prévoir: {totals}\n"
+            f"Mix total: {plan.v_mix_total:.2f} µL"
+        )
+        # Stocks du plan comparés aux soldes de l'inventaire (siRNA de même nom)
+        warnings = self.controller.inventory.check_totals(dilutions.stock_totals)
+        self.label_error.update_text("\n".join(result['errors'] + warnings), "red")
+        self.logger.info("Plan de plaque calculé: %d puits, %d master mix", plan.n_wells, len(plan.mixes))
+
+    def import_layout(self):
+        """Charge un plan de plaque CSV (colonnes puits, sirna, cf, c_stock)."""
+        file_path = self.controller.file_ops.get_open_file_path("Plan de plaque CSV",
+                                                                filetypes=[("Fichier CSV", "*.csv"),
+                                                                           ("Tous les fichiers", "*.*")])
+        if not file_path:
+            return
+        try:
+            with self.controller.timer.span("read_layout_csv"):
+                self.imported_wells = read_layout_csv(file_path)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Erreur lors de l'import du plan de plaque: {str(e)}", exc_info=True)
+            messagebox.showerror("Erreur", f"Impossible d'importer le plan: {str(e)}", parent=self)
+            return
+        self.label_layout.configure(text=f"Plan importé: {len(self.imported_wells)} puits ({file_path})")
+        self.logger.info(f"Plan de plaque importé depuis {file_path}")
+
+    def forget_layout(self):
+        """Revient au plan généré à partir des paramètres."""
+        self.imported_wells = None
+        self.label_layout.configure(text="Plan généré à partir des paramètres ci-dessus")
+
+    def export_worklist(self):
+        """Écrit en arrière-plan la liste des transferts du plan pour un robot de pipetage."""
+        if self.current_plan is None:
+            self.compute_plan()
+        if self.current_plan is None:
+            return
+        output_path = self.controller.file_ops.get_save_file_path("Liste de transferts CSV",
+                                                                  filetypes=[("Fichier CSV", "*.csv"),
+                                                                             ("Tous les fichiers", "*.*")])
+        if not output_path:
+            return
+        plan, dilutions = self.current_plan, self.current_dilutions
+        
+        def work(job):
+            with self.controller.timer.span("export_worklist"):
+                return WorklistExporter(self.logger).run(plan, dilutions, output_path, progress=job.report_progress)
+        
+        def done(stats):
+            messagebox.showinfo("Liste de transferts",
+                                f"{stats['transfers']} transfert(s), {stats['tips']} pointe(s) dans {output_path}",
+                                parent=self if self.winfo_exists() else None)
+        
+        self.controller.submit_job("Liste de transferts", work, on_done=done)
+
+    def export_plan(self):
+        """Exporte le plan puits par puits (CSV, TSV, XLSX ou ODS)."""
+        if self.current_plan is None:
+            self.compute_plan()
+        if self.current_plan is None:
+            return
+        plan = self.current_plan
+        self.controller.export_table("Plan de plaque", plan.WELL_COLUMNS,
+                                     plan.well_rows(self.current_dilutions), total=plan.n_wells)
+
+    def show_in_table(self):
+        """Affiche les volumes du plan dans le tableau de la fenêtre principale."""
+        if self.current_plan is None:
+            self.compute_plan()
+        if self.current_plan is not None:
+            self.controller.table_frame.update_table(self.current_plan.table_rows(self.current_dilutions))
@@ -0,0 +1,61 @@
+# ui/progress_frame.py - Cadre de suivi des tâches en arrière-plan
+import tkinter as tk
+from tkinter import ttk
+
+
+class ProgressFrame(ttk.Frame):
+    """Cadre affichant la progression de la tâche en cours avec un bouton d'annulation."""
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, padding="10")
+        self.controller = controller
+        self.logger = controller.logger
+
+        # Tâche actuellement suivie
+        self.current_job = None
+
+        # Configuration de la grille
+        self.columnconfigure(1, weight=1)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Crée la barre de progression, le statut et le bouton d'annulation."""
+        self.label_status = ttk.Label(self, text="Aucune tâche en cours", anchor="w")
+        self.label_status.grid(row=0, column=0, padx=(0, 10), sticky=tk.W)
+
+        self.progressbar = ttk.Progressbar(self, orient="horizontal", mode="determinate", maximum=100)
+        self.progressbar.grid(row=0, column=1, sticky=tk.EW)
+
+        self.btn_cancel = ttk.Button(self, text="Annuler", command=self.cancel_current_job, state="disabled")
+        self.btn_cancel.grid(row=0, column=2, padx=(10, 0))
+
+    def start_job(self, job):
+        """Commence le suivi d'une tâche."""
+        self.current_job = job
+        self.progressbar.configure(value=0)
+        self.label_status.configure(text=f"{job.name}...")
+        self.btn_cancel.configure(state="normal")
+
+    def update_progress(self, job, done, total):
+        """Met à jour la barre de progression si la tâche est celle suivie."""
+        if job is not self.current_job or total <= 0:
+            return
+        percent = 100 * done / total
+        self.progressbar.configure(value=percent)
+        self.label_status.configure(text=f"{job.name}: {percent:.0f} %")
+
+    def finish_job(self, job, message):
+        """Termine le suivi d'une tâche avec un message de statut."""
+        if job is not self.current_job:
+            return
+        self.current_job = None
+        self.label_status.configure(text=message)
+        self.btn_cancel.configure(state="disabled")
+
+    def cancel_current_job(self):
+        """Demande l'annulation de la tâche suivie."""
+        if self.current_job is not None:
+            self.current_job.cancel()
+            self.label_status.configure(text=f"{self.current_job.name}: annulation...")
+            self.logger.info(f"Annulation demandée: {self.current_job.name}")
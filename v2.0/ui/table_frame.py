@@ -2,12 +2,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from models.units import VOLUME_UNIT, VOLUME_UNITS, convert_volume, format_volume
+
 
 class TableFrame(ttk.Frame):
     """Cadre contenant le tableau des résultats de calcul."""
 
-    # Colonnes du tableau
+    # Colonnes du tableau (les volumes sont reçus en µL et affichés dans l'unité choisie)
     COLUMNS = ("Composant", "Volume par échantillon (µL)", "Volume total (µL)")
+    HEADINGS = ("Composant", "Volume par échantillon ({unit})", "Volume total ({unit})")
 
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
@@ -18,6 +21,12 @@ class TableFrame(ttk.Frame):
         self.drag_start_index = None
         self.current_cell = None
 
+        # Modèle colonnaire: une liste de valeurs brutes par colonne (nombres non formatés)
+        self.column_data = [[] for _ in self.COLUMNS]
+        # Identifiants Treeview des lignes, réutilisés d'une mise à jour à l'autre
+        self.item_ids = []
+        self.row_of_item = {}
+
         # Configuration de la grille
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)  # Le tableau prend tout l'espace disponible
@@ -30,12 +39,22 @@ class TableFrame(ttk.Frame):
         lbl_table = ttk.Label(self, text="Tableau du mix", font=("Helvetica", 12, "bold"))
         lbl_table.grid(row=0, column=0, pady=(0, 10), sticky=tk.W)
 
+        # Unité d'affichage des volumes
+        frame_unit = ttk.Frame(self)
+        frame_unit.grid(row=0, column=0, pady=(0, 10), sticky=tk.E)
+        ttk.Label(frame_unit, text="Volumes en").grid(row=0, column=0)
+        self.display_unit = tk.StringVar(value=VOLUME_UNIT)
+        self.combobox_unit = ttk.Combobox(frame_unit, textvariable=self.display_unit, values=list(VOLUME_UNITS),
+                                          width=5, state="readonly")
+        self.combobox_unit.grid(row=0, column=1, padx=5)
+        self.combobox_unit.bind("<<ComboboxSelected>>", lambda e: self.on_display_unit_change())
+
         # Création du tableau avec Treeview
         self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=6)
 
         # Configuration des colonnes
         for i, col in enumerate(self.COLUMNS):
-            self.tree.heading(col, text=col)
+            self.tree.heading(col, text=self.HEADINGS[i].format(unit=VOLUME_UNIT))
             # Largeur proportionnelle selon le contenu attendu
             if i == 0:  # Composant
                 width = 160
@@ -55,16 +74,99 @@ class TableFrame(ttk.Frame):
         self.tree.bind("<Button-3>", self.on_tree_right_click)
 
     def update_table(self, data):
-        """Met à jour le contenu du tableau avec les nouvelles données."""
-        # Effacer les données existantes
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """
+        Met à jour le contenu du tableau avec les nouvelles données.
 
-        # Insérer les nouvelles données
+        Seules les cellules dont le texte affiché change sont modifiées dans le Treeview;
+        les lignes existantes sont réutilisées, les lignes en trop ajoutées ou supprimées.
+        """
+        new_columns = [[] for _ in self.COLUMNS]
         for row in data:
-            self.tree.insert("", tk.END, values=row)
+            for col_index, value in enumerate(row):
+                new_columns[col_index].append(self._to_raw(col_index, value))
+
+        old_count = len(self.item_ids)
+        new_count = len(data)
+        changed_cells = 0
+
+        # Réconciliation des lignes communes, cellule par cellule
+        for row_index in range(min(old_count, new_count)):
+            item_id = self.item_ids[row_index]
+            for col_index, column in enumerate(new_columns):
+                new_text = self._format_cell(col_index, column[row_index])
+                if new_text != self._format_cell(col_index, self.column_data[col_index][row_index]):
+                    self.tree.set(item_id, self.COLUMNS[col_index], new_text)
+                    changed_cells += 1
+
+        # Lignes supplémentaires
+        for row_index in range(old_count, new_count):
+            values = [self._format_cell(col_index, column[row_index])
+                      for col_index, column in enumerate(new_columns)]
+            item_id = self.tree.insert("", tk.END, values=values)
+            self.item_ids.append(item_id)
+            self.row_of_item[item_id] = row_index
+
+        # Lignes en trop
+        if new_count < old_count:
+            removed = self.item_ids[new_count:]
+            self.tree.delete(*removed)
+            for item_id in removed:
+                del self.row_of_item[item_id]
+            del self.item_ids[new_count:]
+
+        self.column_data = new_columns
+        self.logger.debug("Tableau mis à jour avec %d lignes (%d cellule(s) modifiée(s))",
+                          new_count, changed_cells)
+
+    def on_display_unit_change(self):
+        """Réaffiche en-têtes et volumes dans la nouvelle unité, à partir du modèle brut."""
+        unit = self.display_unit.get()
+        for col, heading in zip(self.COLUMNS, self.HEADINGS):
+            self.tree.heading(col, text=heading.format(unit=unit))
+        for row_index, item_id in enumerate(self.item_ids):
+            self.tree.item(item_id, values=self.get_row_values(row_index))
+        self.logger.info("Volumes du tableau affichés en %s", unit)
+
+    def get_row_values(self, row_index):
+        """Renvoie les valeurs affichées d'une ligne, lues depuis le modèle."""
+        return [self._format_cell(col_index, column[row_index])
+                for col_index, column in enumerate(self.column_data)]
+
+    def export_rows(self):
+        """
+        Renvoie l'en-tête et les lignes du tableau pour l'export, volumes non arrondis
+        dans l'unité d'affichage.
+
+        Les colonnes du modèle sont copiées: les lignes peuvent être lues hors du thread Tk.
+        """
+        unit = self.display_unit.get()
+        header = [heading.format(unit=unit) for heading in self.HEADINGS]
+        rows = [
+            tuple(convert_volume(value, VOLUME_UNIT, unit) if isinstance(value, float) else value
+                  for value in row)
+            for row in zip(*self.column_data)
+        ]
+        return header, rows
+
+    def export_table(self):
+        """Exporte le tableau dans un fichier (CSV, TSV, XLSX ou ODS)."""
+        header, rows = self.export_rows()
+        self.controller.export_table("Tableau du mix", header, rows, total=len(rows))
+
+    def _to_raw(self, col_index, value):
+        """Convertit une valeur reçue en valeur brute du modèle (nombre pour les colonnes de volume)."""
+        if col_index == 0:
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
 
-        self.logger.debug(f"Tableau mis à jour avec {len(data)} lignes")
+    def _format_cell(self, col_index, value):
+        """Formate une valeur brute du modèle pour l'affichage."""
+        if isinstance(value, float):
+            return format_volume(value, self.display_unit.get())
+        return str(value)
 
     def on_tree_button_press(self, event):
         """Gère l'événement de clic sur le tableau."""
@@ -72,7 +174,7 @@ class TableFrame(ttk.Frame):
         col = self.tree.identify_column(event.x)
 
         if rowid and col:
-            self.drag_start_index = self.tree.index(rowid)
+            self.drag_start_index = self.row_of_item[rowid]
             self.current_cell = (rowid, col)
             self.tree.selection_set(rowid)
         else:
@@ -86,8 +188,8 @@ class TableFrame(ttk.Frame):
 
         rowid = self.tree.identify_row(event.y)
         if rowid:
-            current_index = self.tree.index(rowid)
-            children = self.tree.get_children()
+            current_index = self.row_of_item[rowid]
+            children = self.item_ids
 
             # Sélectionner les lignes entre le début et la fin du glissement
             start = min(self.drag_start_index, current_index)
@@ -108,7 +210,7 @@ class TableFrame(ttk.Frame):
                 # Clic sur une cellule spécifique
                 rowid, col = self.current_cell
                 col_index = int(col.replace("#", "")) - 1
-                cell_value = self.tree.item(rowid)['values'][col_index]
+                cell_value = self.get_row_values(self.row_of_item[rowid])[col_index]
 
                 self._show_context_menu(event, "cell", cell_value)
             else:
@@ -126,7 +228,7 @@ class TableFrame(ttk.Frame):
                 if rowid and col:
                     self.current_cell = (rowid, col)
                     col_index = int(col.replace("#", "")) - 1
-                    cell_value = self.tree.item(rowid)['values'][col_index]
+                    cell_value = self.get_row_values(self.row_of_item[rowid])[col_index]
 
                     self._show_context_menu(event, "cell", cell_value)
 
@@ -138,6 +240,10 @@ class TableFrame(ttk.Frame):
                     # Ajout du menu pour la colonne
                     self._show_context_menu(event, "heading", col)
 
+            else:
+                # Clic dans une zone vide du tableau
+                self._show_context_menu(event, "table")
+
     def _show_context_menu(self, event, menu_type, value=None):
         """Affiche un menu contextuel basé sur le type de clic."""
         menu = tk.Menu(self, tearoff=0)
@@ -155,10 +261,15 @@ class TableFrame(ttk.Frame):
         elif menu_type == "heading":
             # Menu pour un en-tête de colonne
             col_index = int(value.replace("#", "")) - 1
-            col_name = self.COLUMNS[col_index]
+            col_name = self.tree.heading(self.COLUMNS[col_index], "text")
             menu.add_command(label=f"Copier tous les '{col_name}'",
                              command=lambda: self._copy_column(col_index))
 
+        # Export du tableau entier, quel que soit l'endroit du clic
+        if menu_type != "table":
+            menu.add_separator()
+        menu.add_command(label="Exporter le tableau...", command=self.export_table)
+
         # Affichage du menu
         try:
             menu.tk_popup(event.x_root, event.y_root)
@@ -170,7 +281,7 @@ class TableFrame(ttk.Frame):
         """Copie une valeur dans le presse-papier."""
         self.clipboard_clear()
         self.clipboard_append(str(value))
-        self.logger.info(f"Valeur copiée dans le presse-papier: {value}")
+        self.logger.info("Valeur copiée dans le presse-papier: %s", value)
 
     def _copy_selection(self):
         """Copie les valeurs des lignes sélectionnées dans le presse-papier."""
@@ -178,10 +289,10 @@ class TableFrame(ttk.Frame):
         if not selection:
             return
 
-        # Extraction des valeurs
+        # Extraction des valeurs depuis le modèle
         values = []
         for item in selection:
-            values.append("\t".join(str(x) for x in self.tree.item(item)['values']))
+            values.append("\t".join(self.get_row_values(self.row_of_item[item])))
 
         # Création d'un texte tabulé
         text = "\n".join(values)
@@ -189,15 +300,11 @@ class TableFrame(ttk.Frame):
         # Copie dans le presse-papier
         self.clipboard_clear()
         self.clipboard_append(text)
-        self.logger.info(f"Sélection copiée dans le presse-papier ({len(selection)} lignes)")
+        self.logger.info("Sélection copiée dans le presse-papier (%d lignes)", len(selection))
 
     def _copy_column(self, col_index):
         """Copie toutes les valeurs d'une colonne dans le presse-papier."""
-        values = []
-        for item in self.tree.get_children():
-            row_values = self.tree.item(item)['values']
-            if col_index < len(row_values):
-                values.append(str(row_values[col_index]))
+        values = [self._format_cell(col_index, value) for value in self.column_data[col_index]]
 
         # Création d'un texte
         text = "\n".join(values)
@@ -205,4 +312,4 @@ class TableFrame(ttk.Frame):
         # Copie dans le presse-papier
         self.clipboard_clear()
         self.clipboard_append(text)
-        self.logger.info(f"Colonne '{self.COLUMNS[col_index]}' copiée dans le presse-papier")
\ No newline at end of file
+        self.logger.info("Colonne '%s' copiée dans le presse-papier", self.COLUMNS[col_index])
\ No newline at end of file
@@ -0,0 +1,167 @@
+# utils/batch_processing.py - Traitement par lots sans interface graphique (CSV vers CSV)
+import csv
+import os
+
+from models.schema import FIELDS, canonical_key, get_validator
+
+
+class BatchProcessor:
+    """Calcule un fichier CSV de plans de mix en flux continu, sans Tk."""
+
+    # Colonnes ajoutées au fichier de résultats
+    RESULT_COLUMNS = ("ci_mix", "v_sirna", "v_buffer", "v_sirna_total", "v_buffer_total", "v_mix_total")
+
+    # Colonnes ajoutées au fichier de rejets
+    REJECT_COLUMNS = ("ligne", "erreur")
+
+    def __init__(self, calculation_model, logger, chunk_size=4096, fixed_point=False):
+        """
+        Initialise le traitement par lots.
+
+        Args:
+            calculation_model: instance de SiRNACalculation
+            logger: journal de l'application
+            chunk_size: nombre de lignes valides calculées ensemble par le moteur vectorisé
+            fixed_point: si vrai, calcul entier (pM, pL) et résultats écrits en décimaux
+                exacts: 3 décimales pour ci_mix (nM), 6 pour les volumes (µL)
+        """
+        self.calculation_model = calculation_model
+        self.logger = logger
+        self.chunk_size = chunk_size
+        self.fixed_point = fixed_point
+        self.validator = get_validator()
+
+    @staticmethod
+    def default_reject_path(output_path):
+        """Renvoie le chemin par défaut du fichier de rejets: <résultats>_rejets.csv."""
+        root, ext = os.path.splitext(output_path)
+        return f"{root}_rejets{ext or '.csv'}"
+
+    def run(self, input_path, output_path, reject_path, delimiter=",", progress=None):
+        """
+        Lit input_path, écrit les résultats dans output_path et les lignes invalides dans reject_path.
+
+        La mémoire utilisée ne dépend que de chunk_size, pas de la taille du fichier.
+
+        Args:
+            progress: callback optionnel progress(octets lus, taille du fichier), appelé
+                tous les chunk_size lignes; il peut lever une exception pour interrompre
+                le traitement (annulation)
+
+        Returns:
+            Dictionnaire de statistiques: 'total', 'ok', 'rejected'
+        """
+        stats = {'total': 0, 'ok': 0, 'rejected': 0}
+        total_bytes = os.path.getsize(input_path)
+
+        with open(input_path, 'r', newline='', encoding='utf-8-sig') as f_in, \
+                open(output_path, 'w', newline='', encoding='utf-8') as f_out, \
+                open(reject_path, 'w', newline='', encoding='utf-8') as f_reject:
+            reader = csv.reader(f_in, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError(f"Le fichier {input_path} est vide")
+
+            keys = [canonical_key(name) for name in header]
+            missing = [label for key, label, _ in FIELDS if key not in keys]
+            if missing:
+                raise ValueError(f"Colonne(s) manquante(s) dans {input_path}: {', '.join(missing)}")
+
+            writer = csv.writer(f_out, delimiter=delimiter)
+            writer.writerow(header + list(self.RESULT_COLUMNS))
+            reject_writer = csv.writer(f_reject, delimiter=delimiter)
+            reject_writer.writerow(header + list(self.REJECT_COLUMNS))
+
+            # Dernière colonne du fichier portant chaque clé du schéma
+            key_index = {key: index for index, key in enumerate(keys) if key is not None}
+            rows = self._parse_rows(reader)
+            for line_num, row, results, error in self._process_rows(rows, key_index):
+                stats['total'] += 1
+                if error is None:
+                    writer.writerow(row + results)
+                    stats['ok'] += 1
+                else:
+                    reject_writer.writerow(row + [line_num, error])
+                    stats['rejected'] += 1
+                if progress is not None and stats['total'] % self.chunk_size == 0:
+                    # Position approximative: le fichier texte lit par blocs d'avance
+                    progress(min(f_in.buffer.tell(), total_bytes), total_bytes)
+
+            if progress is not None:
+                progress(total_bytes, total_bytes)
+
+        self.logger.info(f"Traitement par lots terminé: {stats['ok']} ligne(s) calculée(s), "
+                         f"{stats['rejected']} rejetée(s) sur {stats['total']}")
+        return stats
+
+    def _parse_rows(self, reader):
+        """Génère (numéro de ligne, ligne brute) pour chaque ligne non vide."""
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield reader.line_num, row
+
+    def _process_rows(self, rows, key_index):
+        """
+        Regroupe les lignes par paquets, les valide colonne par colonne et calcule les
+        lignes valides avec le moteur vectorisé.
+
+        Génère (numéro de ligne, ligne brute, résultats, erreur) où erreur vaut None
+        si le calcul a réussi.
+        """
+        chunk = []
+        for line in rows:
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield from self._process_chunk(chunk, key_index)
+                chunk = []
+        if chunk:
+            yield from self._process_chunk(chunk, key_index)
+
+    def _process_chunk(self, chunk, key_index):
+        """Valide un paquet de lignes et calcule ses lignes valides; les erreurs d'une ligne sont réunies."""
+        width = max(key_index.values()) + 1
+        if all(len(row) >= width for _, row in chunk):
+            columns = {key: [row[index] for _, row in chunk] for key, index in key_index.items()}
+        else:
+            # Lignes incomplètes: les cellules manquantes sont vides
+            columns = {key: [row[index] if index < len(row) else None for _, row in chunk]
+                       for key, index in key_index.items()}
+        values, errors = self.validator.validate_columns(columns, len(chunk))
+        if errors:
+            messages = self.validator.errors_by_row(errors)
+            for index in sorted(messages):
+                line_num, row = chunk[index]
+                yield line_num, row, None, " ".join(messages[index])
+            valid = [index for index in range(len(chunk)) if index not in messages]
+            chunk = [chunk[index] for index in valid]
+            values = {key: [column[index] for index in valid] for key, column in values.items()}
+        if chunk:
+            yield from self._compute_chunk(chunk, values)
+
+    def _compute_chunk(self, chunk, columns):
+        """Calcule un paquet de lignes validées (colonnes converties) en un seul appel au modèle."""
+        result = self.calculation_model.calculate_mix_batch(columns, fixed_point=self.fixed_point)
+        if not result['success']:
+            for line_num, row in chunk:
+                yield line_num, row, None, result['error']
+            return
+
+        data = result['data']
+        if self.fixed_point:
+            # Import différé: numpy n'est chargé que par le moteur vectorisé
+            from models.fixed_point import PICOLITERS_PER_MICROLITER, PICOMOLAR_PER_NANOMOLAR, format_fixed
+
+            columns_out = [format_fixed(data[name], PICOMOLAR_PER_NANOMOLAR if name == "ci_mix"
+                                        else PICOLITERS_PER_MICROLITER)
+                           for name in self.RESULT_COLUMNS]
+        else:
+            columns_out = [data[name].tolist() for name in self.RESULT_COLUMNS]
+        feasible = result['feasible'].tolist()
+        for i, (line_num, row) in enumerate(chunk):
+            if feasible[i]:
+                yield line_num, row, [column[i] for column in columns_out], None
+            else:
+                # Le calcul simple fournit le même message d'erreur que l'interface
+                values = {key: column[i] for key, column in columns.items()}
+                yield line_num, row, None, self.calculation_model.calculate_mix(values)['error']
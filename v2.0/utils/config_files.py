@@ -0,0 +1,26 @@
+# utils/config_files.py - Lecture et écriture des fichiers de configuration JSON (sans Tk)
+import json
+
+
+def save_config_file(file_path, inputs):
+    """Écrit les valeurs des champs d'entrée dans un fichier JSON."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(inputs, f, indent=4)
+
+
+def load_config_file(file_path):
+    """
+    Lit un fichier de configuration JSON.
+
+    Returns:
+        Le dictionnaire des valeurs des champs d'entrée
+
+    Raises:
+        json.JSONDecodeError: si le fichier n'est pas un JSON valide
+        ValueError: si le contenu n'est pas un objet JSON
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        inputs = json.load(f)
+    if not isinstance(inputs, dict):
+        raise ValueError("La configuration doit être un objet JSON")
+    return inputs
@@ -0,0 +1,121 @@
+# utils/config_import.py - Import groupé d'un dossier de configurations JSON (sans Tk)
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from models.schema import canonical_key, get_validator
+from utils.config_files import load_config_file
+
+
+class ConfigImporter:
+    """
+    Lit, valide et calcule toutes les configurations JSON d'un dossier.
+
+    Les fichiers sont lus par un pool de threads (les lectures de fichiers, surtout sur
+    un partage réseau, dominent le temps d'import), validés par paquets colonne par
+    colonne (voir models.schema.InputValidator), puis chaque configuration valide est
+    calculée par le modèle. Un fichier illisible, invalide ou non
+    faisable est signalé dans le rapport sans interrompre l'import.
+    """
+
+    # Extension des fichiers de configuration importés
+    EXTENSION = ".json"
+
+    def __init__(self, calculation_model, logger, max_workers=None, chunk_size=256):
+        """
+        Initialise l'import.
+
+        Args:
+            calculation_model: instance de SiRNACalculation (sans cache hors du thread Tk)
+            logger: journal de l'application
+            max_workers: nombre de threads de lecture (par défaut: selon le nombre de processeurs)
+            chunk_size: nombre de fichiers traités entre deux signalements de progression
+        """
+        self.calculation_model = calculation_model
+        self.logger = logger
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.chunk_size = chunk_size
+        self.validator = get_validator()
+
+    @classmethod
+    def list_configs(cls, directory):
+        """Renvoie les chemins des fichiers de configuration du dossier (non récursif), triés par nom."""
+        with os.scandir(directory) as entries:
+            paths = [entry.path for entry in entries
+                     if entry.is_file() and entry.name.lower().endswith(cls.EXTENSION)]
+        return sorted(paths)
+
+    def run(self, directory, progress=None):
+        """
+        Importe toutes les configurations de directory.
+
+        Args:
+            progress: callback optionnel progress(fichiers traités, nombre de fichiers),
+                appelé tous les chunk_size fichiers; il peut lever une exception pour
+                interrompre l'import (annulation)
+
+        Returns:
+            Dictionnaire contenant:
+                - 'total': nombre de fichiers trouvés
+                - 'results': liste de tuples (nom du fichier, entrées validées, MixResult),
+                  dans l'ordre des noms de fichiers
+                - 'errors': liste de tuples (nom du fichier, message d'erreur), triée par nom
+        """
+        paths = self.list_configs(directory)
+        report = {'total': len(paths), 'results': [], 'errors': []}
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import")
+        try:
+            for start in range(0, len(paths), self.chunk_size):
+                chunk = paths[start:start + self.chunk_size]
+                self._process_chunk(chunk, list(pool.map(self._read_config, chunk)), report)
+                if progress is not None:
+                    progress(start + len(chunk), len(paths))
+        finally:
+            # En cas d'annulation, les lectures non commencées sont abandonnées
+            pool.shutdown(wait=True, cancel_futures=True)
+        report['errors'].sort()
+
+        self.logger.info("Import de %s: %d configuration(s) calculée(s), %d en erreur",
+                         directory, len(report['results']), len(report['errors']))
+        return report
+
+    def _process_chunk(self, paths, read, report):
+        """Valide un paquet de configurations lues et calcule les configurations valides."""
+        names = [os.path.basename(path) for path in paths]
+        loaded = [index for index, (_, error) in enumerate(read) if error is None]
+        for index, (_, error) in enumerate(read):
+            if error is not None:
+                report['errors'].append((names[index], error))
+
+        columns = {key: [read[index][0].get(key) for index in loaded] for key in self.validator.keys}
+        values, errors = self.validator.validate_columns(columns, len(loaded))
+        messages = self.validator.errors_by_row(errors)
+        for row, index in enumerate(loaded):
+            if row in messages:
+                report['errors'].append((names[index], " ".join(messages[row])))
+                continue
+            inputs = {key: column[row] for key, column in values.items()}
+            result = self.calculation_model.calculate_mix(inputs)
+            if result['success']:
+                report['results'].append((names[index], inputs, result['result']))
+            else:
+                report['errors'].append((names[index], result['error']))
+
+    @staticmethod
+    def _read_config(path):
+        """
+        Lit un fichier de configuration (exécuté dans un thread du pool).
+
+        Returns:
+            Tuple (valeurs brutes par clé du schéma, None) ou (None, message d'erreur)
+        """
+        try:
+            raw_values = load_config_file(path)
+        except OSError as e:
+            return None, f"Lecture impossible: {e.strerror or e}"
+        except ValueError as e:
+            # json.JSONDecodeError et UnicodeDecodeError sont des ValueError
+            return None, f"Fichier JSON invalide: {e}"
+
+        # Les noms courts des fichiers CSV sont aussi acceptés
+        return {canonical_key(str(key)) or key: value for key, value in raw_values.items()}, None
@@ -0,0 +1,301 @@
+# utils/export.py - Export en flux de tableaux vers CSV, TSV, XLSX et ODS (sans Tk)
+import csv
+import io
+import math
+import os
+import zipfile
+from xml.sax.saxutils import escape
+
+# Formats reconnus d'après l'extension du fichier
+EXPORT_FORMATS = {".csv": "csv", ".tsv": "tsv", ".xlsx": "xlsx", ".ods": "ods"}
+
+# Types de fichiers proposés par la boîte de dialogue d'enregistrement
+EXPORT_FILETYPES = [
+    ("Fichier CSV", "*.csv"),
+    ("Fichier TSV", "*.tsv"),
+    ("Classeur Excel", "*.xlsx"),
+    ("Classeur OpenDocument", "*.ods"),
+]
+
+
+def export_format(path):
+    """Renvoie le format d'export correspondant à l'extension de path."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        return EXPORT_FORMATS[extension]
+    except KeyError:
+        raise ValueError(f"Extension d'export non reconnue: '{extension}' "
+                         f"(attendu: {', '.join(EXPORT_FORMATS)})") from None
+
+
+class TableExporter:
+    """
+    Écrit un tableau (en-tête + lignes) dans un fichier, en flux continu.
+
+    Les lignes sont lues depuis un itérable (typiquement un générateur) par paquets de
+    chunk_size: la mémoire utilisée ne dépend pas du nombre de lignes. Les classeurs
+    XLSX et ODS sont écrits avec zipfile, sans bibliothèque externe.
+    """
+
+    # Nombre maximal de lignes d'une feuille de classeur (en-tête compris); au-delà,
+    # les lignes continuent sur une nouvelle feuille
+    MAX_SHEET_ROWS = 1048576
+
+    SHEET_NAME = "Feuille"
+
+    # Compression rapide: le XML des feuilles se compresse bien même au niveau 1
+    COMPRESS_LEVEL = 1
+
+    XLSX_CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '{overrides}</Types>'
+    )
+    XLSX_SHEET_TYPE = (
+        '<Override PartName="/xl/worksheets/sheet{index}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    )
+    XLSX_ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/></Relationships>'
+    )
+    XLSX_WORKBOOK = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets>{sheets}</sheets></workbook>'
+    )
+    XLSX_WORKBOOK_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '{relationships}</Relationships>'
+    )
+    XLSX_SHEET_REL = (
+        '<Relationship Id="rId{index}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet{index}.xml"/>'
+    )
+    XLSX_SHEET_START = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    )
+    XLSX_SHEET_END = '</sheetData></worksheet>'
+
+    ODS_MIMETYPE = "application/vnd.oasis.opendocument.spreadsheet"
+    ODS_MANIFEST = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+        'manifest:version="1.2">'
+        '<manifest:file-entry manifest:full-path="/" manifest:version="1.2" '
+        f'manifest:media-type="{ODS_MIMETYPE}"/>'
+        '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+        '</manifest:manifest>'
+    )
+    ODS_CONTENT_START = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+        '<office:body><office:spreadsheet>'
+    )
+    ODS_CONTENT_END = '</office:spreadsheet></office:body></office:document-content>'
+
+    def __init__(self, logger, chunk_size=4096):
+        """
+        Initialise l'export.
+
+        Args:
+            logger: journal de l'application
+            chunk_size: nombre de lignes lues et écrites à la fois
+        """
+        self.logger = logger
+        self.chunk_size = chunk_size
+
+    def run(self, output_path, header, rows, total=None, progress=None):
+        """
+        Écrit header puis rows dans output_path, au format donné par son extension.
+
+        Le fichier est d'abord écrit sous un nom temporaire puis renommé: une erreur
+        ou une annulation ne laisse pas de fichier incomplet.
+
+        Args:
+            header: noms des colonnes
+            rows: itérable de lignes (tuples de nombres ou de textes; None = cellule vide)
+            total: nombre de lignes attendu, pour la progression (facultatif)
+            progress: callback optionnel progress(lignes écrites, total), appelé après
+                chaque paquet; il peut lever une exception pour interrompre l'export
+
+        Returns:
+            Dictionnaire de statistiques: 'rows', 'format'
+        """
+        file_format = export_format(output_path)
+        writer = {
+            "csv": self._write_delimited,
+            "tsv": self._write_delimited,
+            "xlsx": self._write_xlsx,
+            "ods": self._write_ods,
+        }[file_format]
+
+        temp_path = output_path + ".part"
+        try:
+            count = writer(temp_path, file_format, list(header), self._chunks(rows, total, progress))
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.logger.info("Export %s terminé: %d ligne(s) dans %s", file_format.upper(), count, output_path)
+        return {'rows': count, 'format': file_format}
+
+    def _chunks(self, rows, total, progress):
+        """Génère les lignes par paquets de chunk_size en signalant l'avancement."""
+        done = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                done += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(done, total or 0)
+        if chunk:
+            yield chunk
+            done += len(chunk)
+        if progress is not None:
+            progress(done, total or done)
+
+    def _write_delimited(self, path, file_format, header, chunks):
+        """Écrit un fichier CSV (virgules) ou TSV (tabulations)."""
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter="\t" if file_format == "tsv" else ",")
+            writer.writerow(header)
+            for chunk in chunks:
+                writer.writerows(chunk)
+                count += len(chunk)
+        return count
+
+    def _sheets(self, chunks, header_row, format_row, open_sheet, close_sheet):
+        """
+        Écrit les lignes dans des feuilles successives de MAX_SHEET_ROWS lignes au plus.
+
+        Args:
+            open_sheet: open_sheet(numéro) -> flux texte de la nouvelle feuille, début écrit
+            close_sheet: close_sheet(flux) termine la feuille en cours
+
+        Returns:
+            Tuple (nombre de lignes écrites, nombre de feuilles)
+        """
+        count = 0
+        sheets = 0
+        stream = None
+        sheet_rows = 0
+        for chunk in chunks:
+            position = 0
+            while position < len(chunk):
+                if stream is None or sheet_rows >= self.MAX_SHEET_ROWS:
+                    if stream is not None:
+                        close_sheet(stream)
+                    sheets += 1
+                    stream = open_sheet(sheets)
+                    stream.write(header_row)
+                    sheet_rows = 1
+                part = chunk[position:position + self.MAX_SHEET_ROWS - sheet_rows]
+                stream.write("".join(format_row(row) for row in part))
+                position += len(part)
+                sheet_rows += len(part)
+                count += len(part)
+        if stream is None:
+            # Tableau vide: une feuille avec l'en-tête seul
+            sheets = 1
+            stream = open_sheet(1)
+            stream.write(header_row)
+        close_sheet(stream)
+        return count, sheets
+
+    def _write_xlsx(self, path, file_format, header, chunks):
+        """Écrit un classeur XLSX (SpreadsheetML, cellules en texte en ligne), une partie par feuille."""
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=self.COMPRESS_LEVEL) as archive:
+            def open_sheet(index):
+                stream = io.TextIOWrapper(
+                    archive.open(f"xl/worksheets/sheet{index}.xml", "w", force_zip64=True), encoding="utf-8")
+                stream.write(self.XLSX_SHEET_START)
+                return stream
+
+            def close_sheet(stream):
+                stream.write(self.XLSX_SHEET_END)
+                stream.close()
+
+            count, sheets = self._sheets(chunks, self._xlsx_row(header), self._xlsx_row, open_sheet, close_sheet)
+
+            # Les parties décrivant le classeur sont écrites en dernier: elles listent les feuilles
+            indices = range(1, sheets + 1)
+            archive.writestr("[Content_Types].xml", self.XLSX_CONTENT_TYPES.format(
+                overrides="".join(self.XLSX_SHEET_TYPE.format(index=i) for i in indices)))
+            archive.writestr("_rels/.rels", self.XLSX_ROOT_RELS)
+            archive.writestr("xl/workbook.xml", self.XLSX_WORKBOOK.format(sheets="".join(
+                f'<sheet name="{self.SHEET_NAME}{i}" sheetId="{i}" r:id="rId{i}"/>' for i in indices)))
+            archive.writestr("xl/_rels/workbook.xml.rels", self.XLSX_WORKBOOK_RELS.format(
+                relationships="".join(self.XLSX_SHEET_REL.format(index=i) for i in indices)))
+        return count
+
+    def _write_ods(self, path, file_format, header, chunks):
+        """Écrit un classeur ODS (OpenDocument): toutes les feuilles se suivent dans content.xml."""
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=self.COMPRESS_LEVEL) as archive:
+            # Le type MIME doit être la première entrée, non compressée
+            archive.writestr(zipfile.ZipInfo("mimetype"), self.ODS_MIMETYPE, compress_type=zipfile.ZIP_STORED)
+            archive.writestr("META-INF/manifest.xml", self.ODS_MANIFEST)
+            with io.TextIOWrapper(archive.open("content.xml", "w", force_zip64=True), encoding="utf-8") as content:
+                content.write(self.ODS_CONTENT_START)
+
+                def open_sheet(index):
+                    content.write(f'<table:table table:name="{self.SHEET_NAME}{index}">')
+                    return content
+
+                def close_sheet(stream):
+                    stream.write("</table:table>")
+
+                count, _ = self._sheets(chunks, self._ods_row(header), self._ods_row, open_sheet, close_sheet)
+                content.write(self.ODS_CONTENT_END)
+        return count
+
+    @staticmethod
+    def _is_number(value):
+        """Vrai pour les nombres finis (les booléens et NaN sont écrits en texte)."""
+        return (isinstance(value, (int, float)) and not isinstance(value, bool)
+                and math.isfinite(value))
+
+    def _xlsx_row(self, row):
+        """Convertit une ligne en XML SpreadsheetML."""
+        cells = []
+        for value in row:
+            if value is None:
+                cells.append("<c/>")
+            elif self._is_number(value):
+                cells.append(f"<c><v>{value!r}</v></c>")
+            else:
+                cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+        return "<row>" + "".join(cells) + "</row>"
+
+    def _ods_row(self, row):
+        """Convertit une ligne en XML OpenDocument."""
+        cells = []
+        for value in row:
+            if value is None:
+                cells.append("<table:table-cell/>")
+            elif self._is_number(value):
+                cells.append(f'<table:table-cell office:value-type="float" office:value="{value!r}">'
+                             f'<text:p>{value!r}</text:p></table:table-cell>')
+            else:
+                cells.append(f'<table:table-cell office:value-type="string">'
+                             f'<text:p>{escape(str(value))}</text:p></table:table-cell>')
+        return "<table:table-row>" + "".join(cells) + "</table:table-row>"
@@ -12,13 +12,14 @@ class FileOperations:
         self.logger = logger
         self.last_directory = os.path.expanduser("~")  # Dossier utilisateur par défaut
 
-    def get_save_file_path(self, title="Enregistrer le fichier", filetypes=None):
+    def get_save_file_path(self, title="Enregistrer le fichier", filetypes=None, defaultextension=""):
         """
         Demande à l'utilisateur de choisir un chemin pour sauvegarder un fichier.
 
         Args:
             title: Titre de la boîte de dialogue
             filetypes: Liste des types de fichiers à afficher
+            defaultextension: Extension ajoutée si l'utilisateur n'en saisit pas
 
         Returns:
             Le chemin du fichier choisi, ou None si l'utilisateur a annulé
@@ -29,7 +30,8 @@ class FileOperations:
         file_path = filedialog.asksaveasfilename(
             initialdir=self.last_directory,
             title=title,
-            filetypes=filetypes
+            filetypes=filetypes,
+            defaultextension=defaultextension
         )
 
         if file_path:
@@ -0,0 +1,292 @@
+# utils/history_store.py - Historique persistant des calculs (SQLite)
+import json
+import sqlite3
+
+from models.result import MixResult
+from models.schema import KEY_CF, KEY_SAMPLES, KEY_STOCK, KEY_VOLUME_MILIEU, KEY_VOLUME_MIX, KEY_VOLUME_UNIT
+from utils.timing import SpanTimer
+
+
+class HistoryStore:
+    """Stocke l'historique des calculs dans une base SQLite avec écritures groupées."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS calculations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            cf REAL,
+            v_milieu REAL,
+            volume_unit TEXT,
+            v_mix REAL,
+            c_stock REAL,
+            n_samples INTEGER,
+            ci_mix REAL,
+            result TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_calculations_timestamp ON calculations (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_calculations_cf ON calculations (cf);
+        CREATE INDEX IF NOT EXISTS idx_calculations_c_stock ON calculations (c_stock);
+        CREATE INDEX IF NOT EXISTS idx_calculations_n_samples ON calculations (n_samples);
+    """
+
+    # Colonnes des entrées renvoyées par query(): le résultat n'est décodé que par get()
+    SUMMARY_COLUMNS = "id, timestamp, cf, v_milieu, volume_unit, v_mix, c_stock, n_samples"
+
+    # En-tête des lignes renvoyées par export_rows()
+    EXPORT_HEADER = ("Id", "Date", "Cf (nM)", "Volume du milieu", "Unité du milieu", "Volume du mix (µL)",
+                     "Stock (nM)", "Échantillons", "Ci du mix (nM)")
+
+    def __init__(self, db_path, logger, batch_size=20, timer=None):
+        """
+        Ouvre (ou crée) la base d'historique.
+
+        Args:
+            db_path: chemin du fichier SQLite (':memory:' pour une base temporaire)
+            logger: journal de l'application
+            batch_size: nombre d'entrées accumulées avant une écriture groupée
+            timer: SpanTimer optionnel mesurant les écritures ('history_flush')
+        """
+        self.db_path = db_path
+        self.logger = logger
+        self.batch_size = batch_size
+        self.timer = timer if timer is not None else SpanTimer()
+        self.pending = []
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute("PRAGMA optimize")
+
+        # Les identifiants sont attribués dès add() pour que les entrées en attente
+        # soient adressables avant leur écriture. Ils ne sont jamais réutilisés, même
+        # après clear() (les débits de l'inventaire y font référence): la séquence
+        # AUTOINCREMENT de SQLite garde le plus grand identifiant écrit
+        self.next_id = self.connection.execute(
+            "SELECT MAX(COALESCE((SELECT MAX(id) FROM calculations), 0), "
+            "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'calculations'), 0)) + 1"
+        ).fetchone()[0]
+
+        # Nombre de lignes écrites, tenu à jour par flush() et clear(), et comptes par
+        # filtre de la dernière recherche: les pages suivantes réutilisent ces comptes
+        self.row_count = self.count()
+        self.match_counts = (None, None)
+        self.logger.info(f"Historique ouvert: {db_path} ({self.row_count} entrée(s))")
+
+    def add(self, entry):
+        """
+        Ajoute une entrée {'timestamp', 'inputs', 'result'} à l'historique, 'result'
+        étant le MixResult du calcul.
+
+        L'entrée est mise en attente et écrite avec les suivantes dès que batch_size
+        est atteint, avant toute lecture, ou à la fermeture.
+
+        Returns:
+            L'identifiant attribué à l'entrée (également enregistré dans entry['id'])
+        """
+        entry['id'] = self.next_id
+        self.next_id += 1
+        self.pending.append(entry)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return entry['id']
+
+    def flush(self):
+        """Écrit les entrées en attente en une seule transaction."""
+        if not self.pending:
+            return
+        with self.timer.span("history_flush"):
+            rows = [self._entry_to_row(entry) for entry in self.pending]
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO calculations (id, timestamp, cf, v_milieu, volume_unit, v_mix, c_stock, "
+                    "n_samples, ci_mix, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        self.logger.debug("%d entrée(s) d'historique écrite(s)", len(rows))
+        self.row_count += len(rows)
+        self.pending = []
+
+    def count(self):
+        """Renvoie le nombre total d'entrées."""
+        self.flush()
+        return self.connection.execute("SELECT COUNT(*) FROM calculations").fetchone()[0]
+
+    def get(self, entry_id):
+        """Renvoie l'entrée d'identifiant entry_id, ou None."""
+        self.flush()
+        row = self.connection.execute(
+            f"SELECT {self.SUMMARY_COLUMNS}, result FROM calculations WHERE id = ?", (entry_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = self._row_to_entry(row[:-1])
+        values = json.loads(row[-1])
+        if 'v_sirna' in values:
+            entry['result'] = MixResult.from_dict(values)
+        else:
+            # Entrée enregistrée avant l'introduction de MixResult: on recalcule
+            entry['result'] = MixResult.from_inputs(entry['inputs'])
+        return entry
+
+    def query(self, cf_range=None, stock_range=None, date_range=None, samples_range=None, limit=None, offset=0):
+        """
+        Renvoie les entrées correspondant aux filtres, les plus récentes en premier.
+
+        Les entrées renvoyées ne contiennent que 'id', 'timestamp' et 'inputs';
+        utiliser get() pour obtenir le résultat complet.
+
+        Args:
+            cf_range: tuple (min, max) sur la concentration finale (nM), bornes incluses
+            stock_range: tuple (min, max) sur la concentration du stock (nM)
+            date_range: tuple (début, fin) d'horodatages 'AAAA-MM-JJ HH:MM:SS'
+            samples_range: tuple (min, max) sur le nombre d'échantillons
+            limit: nombre maximal d'entrées renvoyées (toutes si None)
+            offset: nombre d'entrées à sauter (pagination)
+
+        Une borne à None n'est pas appliquée.
+        """
+        self.flush()
+        ranges = [(column, bounds) for column, bounds in
+                  (("cf", cf_range), ("c_stock", stock_range), ("timestamp", date_range),
+                   ("n_samples", samples_range))
+                  if bounds is not None and bounds != (None, None)]
+        filters = [self._range_clause(column, *bounds) for column, bounds in ranges]
+
+        if filters:
+            # Le préfixe '+' empêche SQLite d'utiliser l'index d'une colonne. Sans STAT4,
+            # les statistiques d'ANALYZE ne mesurent pas la sélectivité d'un intervalle:
+            # on compte les lignes de chaque filtre, une fois par recherche et par état
+            # de la table (pages suivantes, frappes qui ne changent pas les filtres)
+            key = (tuple((column, tuple(bounds)) for column, bounds in ranges), self.row_count)
+            if self.match_counts[0] != key:
+                self.match_counts = (key, self._count_matches(filters))
+            counts = self.match_counts[1]
+            best = counts.index(min(counts))
+            if limit is not None and counts[best] * counts[best] > (limit + offset) * self.row_count:
+                # Filtres peu sélectifs: parcourir par id décroissant et s'arrêter dès 'limit'
+                # lignes trouvées est plus rapide que trier toutes les lignes de l'index.
+                # Avec m lignes correspondantes sur n, le parcours lit environ limit * n / m
+                # lignes, l'index en lit m puis les trie.
+                best = None
+            # Sinon, seul l'index du filtre le plus sélectif est utilisé
+            filters = [self._range_clause(column if i == best else "+" + column, *bounds)
+                       for i, (column, bounds) in enumerate(ranges)]
+
+        sql = f"SELECT {self.SUMMARY_COLUMNS} FROM calculations"
+        params = []
+        if filters:
+            sql += " WHERE " + " AND ".join(clause for clause, _ in filters)
+            for _, values in filters:
+                params.extend(values)
+        sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        return [self._row_to_entry(row) for row in self.connection.execute(sql, params)]
+
+    def recent(self, limit=None, offset=0):
+        """Renvoie les entrées les plus récentes en premier."""
+        return self.query(limit=limit, offset=offset)
+
+    def export_rows(self, chunk_size=1000):
+        """
+        Génère toutes les entrées (colonnes de EXPORT_HEADER), les plus récentes en premier.
+
+        La lecture passe par une connexion dédiée, ouverte au premier élément: le générateur
+        peut être parcouru depuis un thread de travail. Les entrées en attente doivent avoir
+        été écrites auparavant (flush() dans le thread Tk); une base ':memory:' n'est pas lisible.
+
+        Args:
+            chunk_size: nombre de lignes lues à la fois
+        """
+        connection = sqlite3.connect(self.db_path)
+        try:
+            cursor = connection.execute(
+                f"SELECT {self.SUMMARY_COLUMNS}, ci_mix FROM calculations ORDER BY id DESC"
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            connection.close()
+
+    def clear(self):
+        """
+        Supprime tout l'historique.
+
+        Les identifiants déjà attribués ne sont pas réutilisés: les entrées en attente
+        sont écrites avant la suppression pour que la séquence AUTOINCREMENT les couvre.
+        """
+        self.flush()
+        with self.connection:
+            self.connection.execute("DELETE FROM calculations")
+        self.row_count = 0
+        self.logger.info("Historique effacé")
+
+    def close(self):
+        """
+        Écrit les entrées en attente, met à jour les statistiques des index et ferme la base.
+
+        ANALYZE (limité à un échantillon de chaque index) enregistre dans sqlite_stat1 la
+        répartition des valeurs, utilisée par le planificateur de SQLite aux ouvertures
+        suivantes.
+        """
+        self.flush()
+        self.connection.execute("PRAGMA analysis_limit=1000")
+        self.connection.execute("ANALYZE calculations")
+        self.connection.close()
+        self.logger.info(f"Historique fermé: {self.db_path}")
+
+    def _range_clause(self, column, low, high):
+        """Construit la clause SQL (et ses paramètres) d'un filtre par intervalle."""
+        clauses = []
+        params = []
+        if low is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(high)
+        return " AND ".join(clauses), params
+
+    def _count_matches(self, filters):
+        """Compte les lignes correspondant à chaque filtre (lecture des index seulement)."""
+        return [
+            self.connection.execute(f"SELECT COUNT(*) FROM calculations WHERE {clause}", values).fetchone()[0]
+            for clause, values in filters
+        ]
+
+    def _entry_to_row(self, entry):
+        """Convertit une entrée d'historique en ligne SQL."""
+        inputs = entry['inputs']
+        result = entry['result']
+        return (
+            entry['id'],
+            entry['timestamp'],
+            inputs.get(KEY_CF),
+            inputs.get(KEY_VOLUME_MILIEU),
+            inputs.get(KEY_VOLUME_UNIT),
+            inputs.get(KEY_VOLUME_MIX),
+            inputs.get(KEY_STOCK),
+            inputs.get(KEY_SAMPLES),
+            result.ci_mix,
+            json.dumps(result.to_dict(), ensure_ascii=False),
+        )
+
+    def _row_to_entry(self, row):
+        """Convertit une ligne SQL (SUMMARY_COLUMNS) en entrée d'historique."""
+        entry_id, timestamp, cf, v_milieu, volume_unit, v_mix, c_stock, n_samples = row
+        return {
+            'id': entry_id,
+            'timestamp': timestamp,
+            'inputs': {
+                KEY_CF: cf,
+                KEY_VOLUME_MILIEU: v_milieu,
+                KEY_VOLUME_UNIT: volume_unit,
+                KEY_VOLUME_MIX: v_mix,
+                KEY_STOCK: c_stock,
+                KEY_SAMPLES: n_samples
+            }
+        }
@@ -0,0 +1,248 @@
+# utils/inventory.py - Inventaire des stocks de siRNA: lots et consommation (journal compacté)
+import json
+import os
+
+
+class Lot:
+    """Lot de stock de siRNA: volume initial et volume consommé (µL)."""
+
+    __slots__ = ("lot_id", "sirna", "c_stock", "volume", "consumed")
+
+    def __init__(self, lot_id, sirna, c_stock, volume, consumed=0.0):
+        self.lot_id = lot_id
+        self.sirna = sirna
+        self.c_stock = c_stock
+        self.volume = volume
+        self.consumed = consumed
+
+    @property
+    def remaining(self):
+        """Volume restant (µL), négatif si le lot a été surconsommé."""
+        return self.volume - self.consumed
+
+    def to_record(self):
+        """Renvoie l'enregistrement du journal décrivant le lot (compaction)."""
+        return {'op': 'lot', 'lot': self.lot_id, 'sirna': self.sirna, 'c_stock': self.c_stock,
+                'volume': self.volume, 'consumed': self.consumed}
+
+
+class InventoryLedger:
+    """
+    Inventaire des lots de stock de siRNA, persistant dans un journal JSON (une opération par ligne).
+
+    Chaque prélèvement est ajouté en fin de journal et met à jour des totaux courants: les
+    soldes par lot et par siRNA sont lus en O(1), sans relire l'historique. Au-delà de
+    compact_after opérations, le journal est réécrit sous forme d'un instantané (un
+    enregistrement par lot, consommation cumulée comprise).
+    """
+
+    # Écart relatif toléré entre la concentration d'un lot et celle d'un calcul
+    C_STOCK_TOLERANCE = 1e-6
+
+    def __init__(self, log_path, logger, compact_after=1000):
+        """
+        Ouvre (ou crée) l'inventaire.
+
+        Args:
+            log_path: chemin du journal
+            logger: journal de l'application
+            compact_after: nombre d'opérations ajoutées au journal avant sa réécriture
+        """
+        self.log_path = log_path
+        self.logger = logger
+        self.compact_after = compact_after
+
+        self.lots = {}
+        # Solde courant de chaque siRNA, tous lots confondus (µL)
+        self.sirna_remaining = {}
+        # Lot débité par les calculs de la fenêtre principale (ou None)
+        self.active_lot = None
+        self.log_file = None
+
+        self.operations, damaged = self._replay()
+        if damaged or self.operations > self.compact_after:
+            # La réécriture élimine aussi une ligne tronquée, qui corromprait l'ajout suivant
+            self.compact()
+        self.log_file = open(self.log_path, 'a', encoding='utf-8')
+        self.logger.info(f"Inventaire ouvert: {log_path} ({len(self.lots)} lot(s))")
+
+    def add_lot(self, lot_id, sirna, c_stock, volume):
+        """
+        Enregistre un nouveau lot.
+
+        Args:
+            lot_id: identifiant du lot (unique)
+            sirna: nom du siRNA (rapproché des noms d'un plan de plaque)
+            c_stock: concentration du stock (nM)
+            volume: volume initial (µL)
+
+        Raises:
+            ValueError: identifiant vide ou déjà utilisé, concentration ou volume <= 0
+        """
+        lot_id = lot_id.strip()
+        if not lot_id:
+            raise ValueError("L'identifiant du lot est vide")
+        if lot_id in self.lots:
+            raise ValueError(f"Le lot '{lot_id}' existe déjà")
+        if not c_stock > 0 or not volume > 0:
+            raise ValueError("La concentration et le volume du lot doivent être supérieurs à 0")
+        lot = Lot(lot_id, sirna.strip(), c_stock, volume)
+        self._apply_lot(lot)
+        self._append(lot.to_record())
+        self.logger.info("Lot ajouté: %s (%s, %g nM, %g µL)", lot_id, lot.sirna, c_stock, volume)
+        return lot
+
+    def remove_lot(self, lot_id):
+        """Retire un lot de l'inventaire."""
+        self._apply_remove(lot_id)
+        self._append({'op': 'remove', 'lot': lot_id})
+        self.logger.info("Lot retiré: %s", lot_id)
+
+    def set_active_lot(self, lot_id):
+        """Choisit le lot débité par les calculs (None: aucun)."""
+        if lot_id is not None and lot_id not in self.lots:
+            raise KeyError(lot_id)
+        self.active_lot = lot_id
+        self._append({'op': 'active', 'lot': lot_id})
+
+    def debit(self, lot_id, volume, reference=None):
+        """
+        Débite un prélèvement d'un lot, en O(1).
+
+        Args:
+            volume: volume de stock prélevé (µL)
+            reference: identifiant facultatif du calcul (entrée d'historique)
+
+        Returns:
+            Le volume restant du lot (µL)
+        """
+        self._apply_debit(lot_id, volume)
+        record = {'op': 'debit', 'lot': lot_id, 'volume': volume}
+        if reference is not None:
+            record['ref'] = reference
+        self._append(record)
+        return self.lots[lot_id].remaining
+
+    def remaining(self, lot_id):
+        """Renvoie le volume restant d'un lot (µL)."""
+        return self.lots[lot_id].remaining
+
+    def check_debit(self, lot_id, volume, c_stock=None):
+        """
+        Vérifie un prélèvement avant de le débiter.
+
+        Returns:
+            Liste de messages d'avertissement (vide si le lot suffit)
+        """
+        lot = self.lots[lot_id]
+        warnings = []
+        if volume > lot.remaining:
+            warnings.append(f"Le lot {lot_id} ({lot.sirna}) ne contient plus que {lot.remaining:.2f} µL: "
+                            f"{volume:.2f} µL sont nécessaires.")
+        if c_stock is not None and abs(c_stock - lot.c_stock) > self.C_STOCK_TOLERANCE * lot.c_stock:
+            warnings.append(f"La concentration du lot {lot_id} ({lot.c_stock:g} nM) diffère de celle "
+                            f"du calcul ({c_stock:g} nM).")
+        return warnings
+
+    def check_totals(self, stock_totals):
+        """
+        Compare les volumes de stock d'un plan aux soldes des siRNA de l'inventaire.
+
+        Args:
+            stock_totals: dictionnaire nom du siRNA -> volume de stock nécessaire (µL);
+                les siRNA sans lot dans l'inventaire sont ignorés
+
+        Returns:
+            Liste de messages d'avertissement
+        """
+        return [f"Stock insuffisant pour {sirna}: {volume:.2f} µL nécessaires, "
+                f"{self.sirna_remaining[sirna]:.2f} µL restants dans l'inventaire."
+                for sirna, volume in stock_totals.items()
+                if sirna in self.sirna_remaining and volume > self.sirna_remaining[sirna]]
+
+    def compact(self):
+        """Réécrit le journal sous forme d'instantané (un enregistrement par lot)."""
+        reopen = self.log_file is not None
+        if reopen:
+            self.log_file.close()
+        temp_path = self.log_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for lot in self.lots.values():
+                f.write(json.dumps(lot.to_record(), ensure_ascii=False) + "\n")
+            if self.active_lot is not None:
+                f.write(json.dumps({'op': 'active', 'lot': self.active_lot}, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.log_path)
+        self.logger.debug("Journal d'inventaire compacté: %d opération(s) -> %d lot(s)",
+                          self.operations, len(self.lots))
+        self.operations = len(self.lots)
+        if reopen:
+            self.log_file = open(self.log_path, 'a', encoding='utf-8')
+
+    def close(self):
+        """Compacte et ferme le journal."""
+        self.compact()
+        self.log_file.close()
+        self.log_file = None
+        self.logger.info(f"Inventaire fermé: {self.log_path}")
+
+    def _append(self, record):
+        """Ajoute une opération en fin de journal; compacte le journal au-delà de compact_after."""
+        self.log_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.log_file.flush()
+        self.operations += 1
+        if self.operations > self.compact_after + len(self.lots):
+            self.compact()
+
+    def _replay(self):
+        """
+        Reconstruit les lots et les totaux courants à partir du journal.
+
+        Returns:
+            Tuple (nombre d'opérations lues, vrai si des lignes ont été ignorées)
+        """
+        if not os.path.exists(self.log_path):
+            return 0, False
+        count = 0
+        damaged = False
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    op = record['op']
+                    if op == 'lot':
+                        self._apply_lot(Lot(record['lot'], record['sirna'], record['c_stock'],
+                                            record['volume'], record.get('consumed', 0.0)))
+                    elif op == 'debit':
+                        self._apply_debit(record['lot'], record['volume'])
+                    elif op == 'remove':
+                        self._apply_remove(record['lot'])
+                    elif op == 'active':
+                        self.active_lot = record['lot'] if record['lot'] in self.lots else None
+                except (ValueError, KeyError, TypeError) as e:
+                    # Typiquement une dernière ligne tronquée par un arrêt brutal
+                    self.logger.warning("Journal d'inventaire %s, ligne %d ignorée: %s", self.log_path, line_num, e)
+                    damaged = True
+                    continue
+                count += 1
+        return count, damaged
+
+    def _apply_lot(self, lot):
+        self.lots[lot.lot_id] = lot
+        self.sirna_remaining[lot.sirna] = self.sirna_remaining.get(lot.sirna, 0.0) + lot.remaining
+
+    def _apply_debit(self, lot_id, volume):
+        lot = self.lots[lot_id]
+        lot.consumed += volume
+        self.sirna_remaining[lot.sirna] -= volume
+
+    def _apply_remove(self, lot_id):
+        lot = self.lots.pop(lot_id)
+        remaining = self.sirna_remaining[lot.sirna] - lot.remaining
+        if any(other.sirna == lot.sirna for other in self.lots.values()):
+            self.sirna_remaining[lot.sirna] = remaining
+        else:
+            del self.sirna_remaining[lot.sirna]
+        if self.active_lot == lot_id:
+            self.active_lot = None
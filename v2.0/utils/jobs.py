@@ -0,0 +1,159 @@
+# utils/jobs.py - Exécution de tâches longues en arrière-plan (sans Tk)
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Levée dans une tâche lorsque son annulation a été demandée."""
+
+
+class Job:
+    """Tâche soumise au JobExecutor: progression et annulation coopérative."""
+
+    def __init__(self, job_id, name, events):
+        self.job_id = job_id
+        self.name = name
+        self.events = events
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'annulation; la tâche s'arrête à son prochain point de contrôle."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        """Vrai si l'annulation a été demandée."""
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Point de contrôle: lève JobCancelled si l'annulation a été demandée."""
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def report_progress(self, done, total):
+        """Signale l'avancement (appelé depuis le thread de travail) et vérifie l'annulation."""
+        self.events.put(('progress', self, (done, total)))
+        self.check_cancelled()
+
+
+class JobExecutor:
+    """
+    Pool de threads pour les tâches longues.
+
+    Les tâches ne touchent jamais à l'interface: elles déposent leurs événements
+    (progression, résultat, erreur) dans une file que le thread principal vide avec
+    poll(), typiquement depuis root.after. Les callbacks sont donc appelés dans le
+    thread principal.
+    """
+
+    def __init__(self, logger, max_workers=2):
+        """
+        Initialise le pool.
+
+        Args:
+            logger: journal de l'application
+            max_workers: nombre maximal de tâches exécutées simultanément
+        """
+        self.logger = logger
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.events = queue.Queue()
+        self.callbacks = {}
+        self.active_jobs = {}
+        self.ids = itertools.count(1)
+
+    def submit(self, name, func, *args, on_done=None, on_error=None, on_progress=None, on_cancelled=None):
+        """
+        Soumet une tâche func(job, *args) au pool.
+
+        Args:
+            name: nom affiché de la tâche
+            func: fonction exécutée en arrière-plan, recevant le Job en premier argument
+            on_done: callback(job, résultat)
+            on_error: callback(job, exception)
+            on_progress: callback(job, fait, total)
+            on_cancelled: callback(job)
+
+        Returns:
+            Le Job créé
+        """
+        job = Job(next(self.ids), name, self.events)
+        self.callbacks[job.job_id] = {
+            'progress': on_progress,
+            'done': on_done,
+            'error': on_error,
+            'cancelled': on_cancelled,
+        }
+        self.active_jobs[job.job_id] = job
+        self.pool.submit(self._run, job, func, args)
+        self.logger.info(f"Tâche soumise: {name} (#{job.job_id})")
+        return job
+
+    def poll(self, max_events=1000):
+        """
+        Traite les événements en attente dans le thread appelant.
+
+        Returns:
+            Le nombre d'événements traités
+        """
+        processed = 0
+        latest_progress = {}
+        while processed < max_events:
+            try:
+                kind, job, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            processed += 1
+            if kind == 'progress':
+                # Seule la dernière progression de chaque tâche est utile à l'affichage
+                latest_progress[job.job_id] = (job, payload)
+                continue
+            latest_progress.pop(job.job_id, None)
+            self._dispatch(kind, job, payload)
+
+        for job, payload in latest_progress.values():
+            self._dispatch('progress', job, payload)
+        return processed
+
+    def cancel_all(self):
+        """Demande l'annulation de toutes les tâches en cours."""
+        for job in list(self.active_jobs.values()):
+            job.cancel()
+
+    def shutdown(self, cancel=True):
+        """Arrête le pool, en annulant les tâches en cours si demandé."""
+        if cancel:
+            self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, func, args):
+        """Exécute la tâche dans un thread du pool et publie son issue."""
+        try:
+            job.check_cancelled()
+            result = func(job, *args)
+        except JobCancelled:
+            self.events.put(('cancelled', job, None))
+        except Exception as e:
+            self.logger.error(f"Erreur dans la tâche {job.name}: {str(e)}", exc_info=True)
+            self.events.put(('error', job, e))
+        else:
+            self.events.put(('done', job, result))
+
+    def _dispatch(self, kind, job, payload):
+        """Appelle le callback correspondant à un événement."""
+        callbacks = self.callbacks.get(job.job_id, {})
+        if kind != 'progress':
+            self.active_jobs.pop(job.job_id, None)
+            self.callbacks.pop(job.job_id, None)
+            self.logger.info(f"Tâche terminée ({kind}): {job.name} (#{job.job_id})")
+
+        callback = callbacks.get(kind)
+        if callback is None:
+            return
+        if kind == 'progress':
+            callback(job, *payload)
+        elif kind == 'cancelled':
+            callback(job)
+        else:
+            callback(job, payload)
@@ -0,0 +1,124 @@
+# utils/timing.py - Mesure des temps d'exécution des phases critiques (sans Tk)
+import json
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    """Mesure inactive: utilisée lorsque la mesure est désactivée, ne fait rien."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Mesure d'une phase: enregistre sa durée dans le SpanTimer à la sortie du bloc."""
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class SpanTimer:
+    """
+    Chronomètre des phases critiques, avec les dernières durées gardées dans un tampon circulaire.
+
+    Usage:
+        with timer.span("calculate_mix"):
+            ...
+
+    Désactivé, span() renvoie un objet partagé qui ne fait rien: le coût se limite à
+    un appel de méthode. Les phases peuvent être mesurées depuis les tâches en arrière-plan.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, enabled=False, capacity=1024):
+        """
+        Initialise le chronomètre.
+
+        Args:
+            enabled: active la mesure dès la création
+            capacity: nombre de durées gardées par phase (les plus anciennes sont oubliées)
+        """
+        self.enabled = enabled
+        self.capacity = capacity
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        """Renvoie un gestionnaire de contexte mesurant la phase 'name'."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        """Enregistre une durée (en secondes) pour la phase 'name'."""
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.capacity)
+            samples.append(seconds)
+
+    def reset(self):
+        """Oublie toutes les durées enregistrées."""
+        with self.lock:
+            self.samples = {}
+
+    def summary(self):
+        """
+        Renvoie les statistiques de chaque phase, en millisecondes.
+
+        Returns:
+            Dictionnaire nom -> {'count', 'mean', 'p50', 'p90', 'p99', 'max'}
+        """
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+
+        summary = {}
+        for name, values in snapshot.items():
+            values.sort()
+            if not values:
+                continue
+            stats = {
+                'count': len(values),
+                'mean': sum(values) / len(values) * 1000,
+                'max': values[-1] * 1000,
+            }
+            for percentile in self.PERCENTILES:
+                # Rang le plus proche
+                rank = max(0, -(-percentile * len(values) // 100) - 1)
+                stats[f"p{percentile}"] = values[rank] * 1000
+            summary[name] = stats
+        return summary
+
+    def dump_json(self, file_path, extra=None):
+        """Écrit les statistiques dans un fichier JSON (avec des informations supplémentaires éventuelles)."""
+        report = {
+            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'enabled': self.enabled,
+            'capacity': self.capacity,
+            'spans_ms': self.summary(),
+        }
+        if extra:
+            report.update(extra)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
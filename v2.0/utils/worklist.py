@@ -0,0 +1,218 @@
+# utils/worklist.py - Liste de transferts CSV pour robot de pipetage (source, destination, volume)
+import csv
+import math
+
+from models.plate import PLATE_FORMATS
+
+
+class WorklistExporter:
+    """
+    Écrit en flux continu la liste des transferts d'un plan de plaque pour un robot de pipetage.
+
+    Règles d'ordonnancement:
+    - une pointe par liquide source: tous les transferts d'une même source sont
+      regroupés, le nombre de changements de pointe est donc minimal;
+    - les groupes respectent les dépendances: tampon dans les tubes vides, dilutions
+      intermédiaires de la moins diluée à la plus diluée, mix, puis distribution dans
+      la plaque;
+    - à l'intérieur d'un niveau, la source suivante est la plus proche de la dernière
+      destination, et les destinations d'une source suivent une tournée au plus proche
+      voisin améliorée par 2-opt (pour les petits groupes), afin de réduire les
+      déplacements sur le plateau.
+    """
+
+    # Colonnes du fichier de transferts
+    COLUMNS = ("source", "position_source", "destination", "position_destination", "volume_ul", "pointe")
+
+    # Plateau: origine (mm) et disposition de chaque support: (x, y, colonnes, pas en mm)
+    DECK = {
+        "Tampon": (0.0, 0.0, 1, 0.0),
+        "Stocks": (130.0, 0.0, 6, 18.0),
+        "Dilutions": (260.0, 0.0, 12, 9.0),
+        "Mix": (390.0, 0.0, 12, 9.0),
+        "Plaque": (0.0, 100.0, None, None),
+    }
+
+    # Taille maximale d'une tournée améliorée par 2-opt (coût quadratique)
+    TWO_OPT_MAX_POINTS = 64
+
+    # Pas d'une plaque 96 puits (mm), utilisé tant qu'aucun plan n'a été exporté
+    DEFAULT_PLATE_PITCH = 9.0
+
+    def __init__(self, logger):
+        """
+        Initialise l'export.
+
+        Args:
+            logger: journal de l'application
+        """
+        self.logger = logger
+        # Pas de la plaque (mm) pour _position(); recalculé pour chaque plan par run()
+        self.plate_pitch = self.DEFAULT_PLATE_PITCH
+
+    def run(self, plan, dilution_plan, output_path, delimiter=",", progress=None):
+        """
+        Écrit la liste des transferts de plan (PlatePlan) et dilution_plan (DilutionPlan).
+
+        Les transferts sont produits groupe par groupe et écrits au fur et à mesure.
+
+        Args:
+            progress: callback optionnel progress(groupes écrits, nombre de groupes)
+
+        Returns:
+            Dictionnaire de statistiques: 'transfers', 'tips', 'distance_mm', 'skipped_mixes'
+        """
+        stats = {'transfers': 0, 'tips': 0, 'distance_mm': 0.0, 'skipped_mixes': 0}
+        self.plate_pitch = self._plate_pitch(plan)
+        levels = self._groups(plan, dilution_plan, stats)
+        total_groups = sum(len(level) for level in levels)
+
+        with open(output_path, 'w', newline='', encoding='utf-8') as f_out:
+            writer = csv.writer(f_out, delimiter=delimiter)
+            writer.writerow(self.COLUMNS)
+
+            head = self._position(("Tampon", 1))
+            for level in levels:
+                positions = {source: self._position(source) for source in level}
+                while positions:
+                    # Source la plus proche de la position actuelle de la tête
+                    source = min(positions, key=lambda candidate: math.dist(head, positions[candidate]))
+                    source_point = positions.pop(source)
+                    stats['tips'] += 1
+                    stats['distance_mm'] += math.dist(head, source_point)
+                    head = source_point
+                    for destination, volume in self._ordered_transfers(source_point, level[source]):
+                        point = self._position(destination)
+                        stats['distance_mm'] += math.dist(head, point)
+                        head = point
+                        writer.writerow((source[0], source[1], destination[0], destination[1],
+                                         f"{volume:.3f}", stats['tips']))
+                        stats['transfers'] += 1
+                    if progress is not None:
+                        progress(stats['tips'], total_groups)
+
+        self.logger.info(f"Liste de transferts écrite dans {output_path}: {stats['transfers']} transfert(s), "
+                         f"{stats['tips']} pointe(s)")
+        return stats
+
+    def _groups(self, plan, dilution_plan, stats):
+        """
+        Construit les groupes de transferts, par niveau de dépendance puis par source.
+
+        Returns:
+            Liste de niveaux; chaque niveau est un dictionnaire source -> [(destination, volume)]
+        """
+        sirnas = list(dict.fromkeys(mix.sirna for mix in plan.mixes))
+        stock_of = {sirna: ("Stocks", index) for index, sirna in enumerate(sirnas, start=1)}
+        dilution_of = {(dilution.sirna, dilution.chain): ("Dilutions", index)
+                       for index, dilution in enumerate(dilution_plan.dilutions, start=1)}
+
+        def source_of(sirna, chain):
+            return dilution_of[(sirna, chain)] if chain else stock_of[sirna]
+
+        buffer = ("Tampon", 1)
+        depth = max((len(dilution.chain) for dilution in dilution_plan.dilutions), default=0)
+        # Niveau 0: tampon; niveaux 1..depth: dilutions; puis source des mix, puis plaque
+        levels = [{} for _ in range(depth + 3)]
+
+        for dilution in dilution_plan.dilutions:
+            destination = dilution_of[(dilution.sirna, dilution.chain)]
+            self._add(levels[0], buffer, destination, dilution.v_diluent)
+            self._add(levels[len(dilution.chain)], source_of(dilution.sirna, dilution.chain[:-1]),
+                      destination, dilution.v_source)
+
+        for index, (mix, recipe) in enumerate(zip(plan.mixes, dilution_plan.recipes), start=1):
+            if recipe is None:
+                stats['skipped_mixes'] += 1
+                continue
+            mix_tube = ("Mix", index)
+            self._add(levels[0], buffer, mix_tube, recipe.v_buffer)
+            self._add(levels[depth + 1], source_of(mix.sirna, recipe.chain), mix_tube, recipe.v_source)
+            for well in mix.wells:
+                self._add(levels[depth + 2], mix_tube, ("Plaque", well), mix.result.v_mix)
+        return levels
+
+    def _add(self, level, source, destination, volume):
+        """Ajoute un transfert (les volumes nuls sont ignorés)."""
+        if volume > 0:
+            level.setdefault(source, []).append((destination, volume))
+
+    def _ordered_transfers(self, start, transfers):
+        """Ordonne les transferts d'une source pour réduire le trajet de la tête."""
+        order = self._tour(start, [self._position(destination) for destination, _ in transfers])
+        return [transfers[i] for i in order]
+
+    def _tour(self, start, points):
+        """
+        Renvoie l'ordre de visite des points: plus proche voisin depuis start, puis
+        améliorations 2-opt tant qu'elles raccourcissent le trajet (petits groupes).
+        """
+        if len(points) <= 1:
+            return list(range(len(points)))
+
+        # Import différé: numpy n'est chargé que pour l'export
+        import numpy as np
+
+        coords = np.asarray(points, dtype=np.float64)
+        remaining = np.ones(len(points), dtype=bool)
+        order = []
+        current = np.asarray(start, dtype=np.float64)
+        for _ in range(len(points)):
+            distances = np.hypot(coords[:, 0] - current[0], coords[:, 1] - current[1])
+            distances[~remaining] = np.inf
+            nearest = int(distances.argmin())
+            order.append(nearest)
+            remaining[nearest] = False
+            current = coords[nearest]
+
+        if len(order) <= self.TWO_OPT_MAX_POINTS:
+            order = self._two_opt(start, points, order)
+        return order
+
+    def _two_opt(self, start, points, order):
+        """Inverse des segments de la tournée (chemin ouvert depuis start) tant que cela la raccourcit."""
+        path = [start] + [points[i] for i in order]
+        indices = [None] + order
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(path) - 1):
+                for j in range(i + 1, len(path)):
+                    # Remplace les arêtes (i-1, i) et (j, j+1) par (i-1, j) et (i, j+1)
+                    before = math.dist(path[i - 1], path[i])
+                    after = math.dist(path[i - 1], path[j])
+                    if j + 1 < len(path):
+                        before += math.dist(path[j], path[j + 1])
+                        after += math.dist(path[i], path[j + 1])
+                    if after < before - 1e-9:
+                        path[i:j + 1] = path[i:j + 1][::-1]
+                        indices[i:j + 1] = indices[i:j + 1][::-1]
+                        improved = True
+        return indices[1:]
+
+    def _position(self, location):
+        """Renvoie les coordonnées (mm) d'un emplacement (support, position) sur le plateau."""
+        labware, position = location
+        x, y, columns, pitch = self.DECK[labware]
+        if labware == "Plaque":
+            row, column = self._well_coordinates(position)
+            return (x + column * self.plate_pitch, y + row * self.plate_pitch)
+        row, column = divmod(position - 1, columns)
+        return (x + column * pitch, y + row * pitch)
+
+    def _well_coordinates(self, well):
+        """Convertit un nom de puits (A1, AF48, ...) en (ligne, colonne) à partir de 0."""
+        letters = well.rstrip("0123456789")
+        row = 0
+        for letter in letters.upper():
+            row = row * 26 + ord(letter) - ord("A") + 1
+        return row - 1, int(well[len(letters):]) - 1
+
+    def _plate_pitch(self, plan):
+        """Déduit le pas de la plaque (mm) du plus petit format contenant tous les puits."""
+        rows_used = 1 + max((self._well_coordinates(well)[0] for mix in plan.mixes for well in mix.wells), default=0)
+        for rows, _ in sorted(PLATE_FORMATS.values()):
+            if rows >= rows_used:
+                # Une plaque standard mesure 72 mm entre la première et la dernière ligne (+ un pas)
+                return 72.0 / rows
+        return 72.0 / rows_used